@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+HK Podravka – administracija iz komandne linije, bez Streamlita.
+
+Isti kod za uvoz, izvoz i održavanje koji koristi aplikacija (hk_core),
+ali datoteke se čitaju i pišu izravno s diska – za noćnu sinkronizaciju sa
+savezom, cron i skripte:
+
+    ./hk-admin --db hk_podravka.db import-members clanovi.xlsx --rejected odbijeni.csv
+    ./hk-admin import-results rezultati.xlsx --strict
+    ./hk-admin export results_by_year --year 2025 -f xlsx -o rezultati_2025.xlsx
+    ./hk-admin stats --year 2025
+    ./hk-admin db check
+    ./hk-admin db backup /backup/hk_podravka_$(date +%F).db
+
+(ili python -m hk_admin ...). Svaka naredba uvozi samo ono što joj treba –
+pandas tek uvoz iz Excela – pa pokretanje traje desetke milisekundi.
+"""
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Naredbe hk-admin. Izlazni kodovi: 0 u redu, 1 pronađeni problemi (odbijeni
+retci uz --strict, neispravna baza, sažeci ne odgovaraju), 2 pogrešna
+uporaba (nema baze ili datoteke).
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+from typing import List, Optional
+
+from hk_core.db import open_connection
+from hk_core.migrations import latest_version, migrate, schema_version
+
+DEFAULT_DB = os.environ.get("HK_DB", "hk_podravka.db")
+
+
+class UsageError(Exception):
+    """Pogrešan argument – ispisuje se bez tracebacka, izlazni kod 2."""
+
+
+def _open(args, create: bool = False) -> sqlite3.Connection:
+    if not create and not os.path.exists(args.db):
+        raise UsageError(f"{args.db}: baza ne postoji (./hk-admin --db {args.db} db migrate je stvara)")
+    conn = open_connection(args.db)
+    migrate(conn)
+    return conn
+
+
+def _say(args, msg: str):
+    if not args.quiet:
+        print(msg, file=sys.stderr)
+
+
+def _progress(args, label: str):
+    """progress(done, total) za read_workbook/izvoze – piše u isti redak na stderr."""
+    if args.quiet or not sys.stderr.isatty():
+        return None
+
+    def report(done: int, total: Optional[int]):
+        of = f"/{total}" if total else ""
+        print(f"\r{label}: {done}{of} redaka", end="", file=sys.stderr, flush=True)
+    return report
+
+
+def _table(rows: List[tuple], header: List[str]) -> str:
+    cells = [[("" if v is None else str(v)) for v in r] for r in [tuple(header)] + rows]
+    widths = [max(len(r[i]) for r in cells) for i in range(len(header))]
+    return "\n".join("  ".join(v.ljust(w) for v, w in zip(r, widths)).rstrip() for r in cells)
+
+
+# ==========================
+# UVOZ
+# ==========================
+def _import(args, label: str, fn_name: str) -> int:
+    # pandas/openpyxl tek ovdje – ostale naredbe ih ne trebaju
+    from hk_core import expiry, importers
+
+    if not os.path.exists(args.file):
+        raise UsageError(f"{args.file}: datoteka ne postoji")
+    t0 = time.perf_counter()
+    progress = _progress(args, f"{label} – čitanje")
+    with open(args.file, "rb") as f:
+        df = importers.read_workbook(f, progress)
+    if progress:
+        print(file=sys.stderr)
+    conn = _open(args)
+    try:
+        rep = getattr(importers, fn_name)(conn, df)
+        if fn_name == "import_members":
+            # aplikacija u drugom procesu ne vidi ovaj upis – tablicu isteka osvježavamo odmah
+            expiry.refresh(conn)
+    finally:
+        conn.close()
+    updated = f", ažurirano {rep.updated}" if fn_name == "import_members" else ""
+    print(f"{args.file}: upisano {rep.inserted}{updated}, odbijeno {len(rep.rejected)}"
+          f" ({time.perf_counter() - t0:.1f} s)")
+    if rep.unmatched_oibs:
+        print("Nepoznati OIB-i: " + ", ".join(rep.unmatched_oibs))
+    if rep.rejected:
+        if args.rejected:
+            rep.rejected_df().to_csv(args.rejected, index=False, sep=";", encoding="utf-8-sig")
+            _say(args, f"odbijeni retci → {args.rejected}")
+        else:
+            for r in rep.rejected[:20]:
+                print(f"  redak {r['redak']}: {r['oib'] or '-'} – {r['razlog']}")
+            if len(rep.rejected) > 20:
+                print(f"  … još {len(rep.rejected) - 20} (--rejected datoteka.csv za sve)")
+    return 1 if args.strict and (rep.rejected or rep.unmatched_oibs) else 0
+
+
+def cmd_import_members(args) -> int:
+    return _import(args, "članovi", "import_members")
+
+
+def cmd_import_results(args) -> int:
+    return _import(args, "rezultati", "import_results")
+
+
+# ==========================
+# IZVOZ
+# ==========================
+def _export_params(args) -> tuple:
+    from hk_core.expiry import LOOKBACK_DAYS
+
+    today = date.today()
+    start = (today - timedelta(days=LOOKBACK_DAYS)).isoformat()
+    if args.name == "results_by_year":
+        return (args.year or today.year,)
+    if args.name == "expiring_by_group":
+        return (start, (today + timedelta(days=args.days)).isoformat(), args.group)
+    if args.name == "expiring_for_competition":
+        if not args.competition:
+            raise UsageError("expiring_for_competition traži --competition ID")
+        return (start, args.competition)
+    return ()
+
+
+def cmd_export(args) -> int:
+    from hk_core.exports import EXPORTS, FORMATS, export_to_file
+
+    if args.name not in EXPORTS:
+        raise UsageError(f"nepoznat izvoz {args.name!r}; postoje: {', '.join(EXPORTS)}")
+    out = args.output or f"{args.name}.{FORMATS[args.format][0]}"
+    t0 = time.perf_counter()
+    conn = _open(args)
+    try:
+        progress = _progress(args, args.name)
+        # u privremenu datoteku pa preimenovanje – prekinut izvoz ne ostavlja polovičnu datoteku
+        tmp = out + ".part"
+        try:
+            n = export_to_file(conn, args.name, tmp, _export_params(args), args.format, progress)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        os.replace(tmp, out)
+        if progress:
+            print(file=sys.stderr)
+    finally:
+        conn.close()
+    print(f"{out}: {n} redaka ({time.perf_counter() - t0:.1f} s)")
+    return 0
+
+
+# ==========================
+# STATISTIKA
+# ==========================
+def cmd_stats(args) -> int:
+    from hk_core import queries, rollups
+
+    conn = _open(args)
+    try:
+        if args.rebuild:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                n_stats, n_members = rollups.rebuild(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            _say(args, f"stats_rollup {n_stats} redaka, member_stats_rollup {n_members} redaka")
+        if args.check:
+            diff = rollups.check(conn)
+            print("\n".join(diff) or "sažeci odgovaraju rezultatima")
+            return 1 if diff else 0
+        year = args.year or (conn.execute("SELECT MAX(year) FROM stats_rollup WHERE year > 0").fetchone()[0])
+        if year is None:
+            print("nema rezultata")
+            return 0
+        cur = conn.execute(queries.STATS_BY_YEAR, (year,))
+        rows = cur.fetchall()
+        print(f"Statistika {year}")
+        print(_table(rows, [d[0] for d in cur.description]))
+        totals = [sum(r[i] or 0 for r in rows) for i in range(3, 10)]
+        print(f"ukupno: {totals[0]} startova, {totals[1]} borbi, {totals[2]} pobjeda, {totals[3]} poraza, "
+              f"medalje {totals[4]}/{totals[5]}/{totals[6]}")
+    finally:
+        conn.close()
+    return 0
+
+
+# ==========================
+# ODRŽAVANJE BAZE
+# ==========================
+def cmd_db(args) -> int:
+    if args.action == "migrate":
+        conn = _open(args, create=True)
+        try:
+            print(f"{args.db}: shema v{schema_version(conn)} (najnovija v{latest_version()})")
+        finally:
+            conn.close()
+        return 0
+    if args.action == "backup":
+        if not args.dest:
+            raise UsageError("db backup traži odredišnu datoteku")
+        if not os.path.exists(args.db):
+            raise UsageError(f"{args.db}: baza ne postoji")
+        # backup API: dosljedna kopija žive baze, uključujući ono što je još u WAL-u
+        src, dst = sqlite3.connect(args.db), sqlite3.connect(args.dest)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+        print(f"{args.db} → {args.dest} ({os.path.getsize(args.dest) / 1e6:.1f} MB)")
+        return 0
+
+    conn = _open(args)
+    try:
+        if args.action == "info":
+            tables = [r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' "
+                "AND name NOT LIKE 'search_index_%' ORDER BY name")]
+            rows = [(t, conn.execute(f'SELECT COUNT(*) FROM "{t}"').fetchone()[0]) for t in tables]
+            size = os.path.getsize(args.db) + (os.path.getsize(args.db + "-wal") if os.path.exists(args.db + "-wal") else 0)
+            print(f"{args.db}: shema v{schema_version(conn)}, {size / 1e6:.1f} MB")
+            print(_table(rows, ["tablica", "redaka"]))
+        elif args.action == "check":
+            from hk_core import rollups
+
+            problems = [r[0] for r in conn.execute("PRAGMA integrity_check" if args.full else "PRAGMA quick_check")
+                        if r[0] != "ok"]
+            problems += [f"strani ključ: {r[0]} rowid {r[1]} → {r[2]}" for r in conn.execute("PRAGMA foreign_key_check")]
+            problems += rollups.check(conn)
+            print("\n".join(problems) or f"{args.db}: u redu")
+            return 1 if problems else 0
+        elif args.action == "optimize":
+            t0 = time.perf_counter()
+            conn.execute("ANALYZE")
+            conn.execute("PRAGMA optimize")
+            conn.commit()
+            busy, log, done = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+            print(f"ANALYZE + optimize + checkpoint ({'zauzeto, ' if busy else ''}{done}/{log} stranica) "
+                  f"{time.perf_counter() - t0:.1f} s")
+        elif args.action == "vacuum":
+            before = os.path.getsize(args.db)
+            conn.execute("VACUUM")
+            print(f"VACUUM: {before / 1e6:.1f} → {os.path.getsize(args.db) / 1e6:.1f} MB")
+        elif args.action == "rebuild":
+            from hk_core import expiry, rollups, search
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                n_search = search.rebuild(conn)
+                n_stats, n_members = rollups.rebuild(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            n_expiry = expiry.refresh(conn)
+            print(f"search_index {n_search}, stats_rollup {n_stats}, member_stats_rollup {n_members}, "
+                  f"expiring_documents {n_expiry} redaka")
+    finally:
+        conn.close()
+    return 0
+
+
+# ==========================
+# ARGUMENTI
+# ==========================
+def parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="hk-admin", description="HK Podravka – uvoz, izvoz i održavanje baze bez Streamlita.")
+    p.add_argument("--db", default=DEFAULT_DB, help=f"SQLite baza (zadano HK_DB ili {DEFAULT_DB})")
+    p.add_argument("-q", "--quiet", action="store_true", help="bez napretka i poruka na stderr")
+    sub = p.add_subparsers(dest="command", required=True, metavar="naredba")
+
+    for name, fn, what in (("import-members", cmd_import_members, "članove (upsert po OIB-u)"),
+                           ("import-results", cmd_import_results, "rezultate (po predlošku)")):
+        s = sub.add_parser(name, help=f"uvozi {what} iz Excela")
+        s.add_argument("file", help=".xlsx datoteka")
+        s.add_argument("--rejected", metavar="CSV", help="odbijene retke zapiši u CSV")
+        s.add_argument("--strict", action="store_true", help="izlazni kod 1 ako je ijedan redak odbijen")
+        s.set_defaults(func=fn)
+
+    s = sub.add_parser("export", help="izvoz tablice (members, competitions, results_by_year, expiring_*)")
+    s.add_argument("name")
+    s.add_argument("-f", "--format", choices=("xlsx", "csv", "parquet"), default="xlsx")
+    s.add_argument("-o", "--output", help="izlazna datoteka (zadano <name>.<format>)")
+    s.add_argument("--year", type=int, help="results_by_year: godina (zadano tekuća)")
+    s.add_argument("--group", help="expiring_by_group: samo ova grupa")
+    s.add_argument("--days", type=int, default=90, help="expiring_by_group: istječe u idućih N dana")
+    s.add_argument("--competition", type=int, help="expiring_for_competition: ID natjecanja")
+    s.set_defaults(func=cmd_export)
+
+    s = sub.add_parser("stats", help="statistika po godini iz sažetaka")
+    s.add_argument("--year", type=int, help="zadano zadnja godina s rezultatima")
+    s.add_argument("--rebuild", action="store_true", help="najprije obnovi sažetke iz rezultata")
+    s.add_argument("--check", action="store_true", help="samo usporedi sažetke s rezultatima")
+    s.set_defaults(func=cmd_stats)
+
+    s = sub.add_parser("db", help="održavanje: migrate, info, check, optimize, vacuum, rebuild, backup")
+    s.add_argument("action", choices=("migrate", "info", "check", "optimize", "vacuum", "rebuild", "backup"))
+    s.add_argument("dest", nargs="?", help="backup: odredišna datoteka")
+    s.add_argument("--full", action="store_true", help="check: integrity_check umjesto quick_check")
+    s.set_defaults(func=cmd_db)
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except UsageError as e:
+        print(f"hk-admin: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print("\nprekinuto", file=sys.stderr)
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
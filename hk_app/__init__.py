@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+HK Podravka – Streamlit sučelje v6 (hk_podravka_full_app.py).
+
+common    – konstante kluba, bazen konekcija, migracije, CSS, bočna traka
+ui        – zajednički elementi stranica (izvoz, upload, tablice za uređivanje)
+mail      – slanje e-maila iz stranica (red čekanja hk_core.mailer)
+sections/ – po jedna datoteka za svaki odjeljak; st.navigation izvršava
+            samo otvorenu stranicu, pa se i njezini moduli uvoze tek tada
+"""
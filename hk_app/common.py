@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Zajedničko za ulaznu skriptu i sve stranice: konstante kluba, bazen
+konekcija, migracije i pozadinske dretve (st.cache_resource – jednom po
+procesu), CSS i bočna traka. Namjerno ne uvozi pandas ni xlsxwriter/Pillow;
+to uvoze tek stranice kojima trebaju.
+"""
+
+import hmac
+import os
+import time
+from typing import Optional
+
+import streamlit as st
+
+from hk_core.db import ConnectionPool
+from hk_core.lookups import LookupCache
+from hk_core.migrations import migrate, schema_version
+from hk_core.search import search
+from hk_core.writer import DbWriter, WriteResult
+
+# ==========================
+# KONSTANTE KLUBA I STIL
+# ==========================
+PRIMARY_RED = "#c1121f"     # crvena
+GOLD = "#d4af37"            # zlatna
+WHITE = "#ffffff"
+LIGHT_BG = "#fffaf8"
+
+KLUB_NAZIV = "Hrvački klub Podravka"
+KLUB_EMAIL = "hsk-podravka@gmail.com"
+KLUB_ADRESA = "Miklinovec 6a, 48000 Koprivnica"
+KLUB_OIB = "60911784858"
+KLUB_WEB = "https://hk-podravka.com"
+KLUB_IBAN = "HR6923860021100518154"
+
+DB_PATH = "hk_podravka.db"
+# svaka sesija drži jednu konekciju dok se stranica iscrtava; uz to ih posuđuju
+# pozadinski poslovi (hk_core.jobs.JOB_WORKERS = 2) i izvozi. Pisač ima svoju.
+DB_SESSIONS = int(os.environ.get("HK_DB_SESSIONS", "20"))
+DB_POOL_SIZE = int(os.environ.get("HK_DB_POOL_SIZE", DB_SESSIONS + 4))
+WRITE_TIMEOUT = 30.0        # koliko sesija čeka da pisač spremi njezin paket
+GALLERY_PAGE_SIZE = 12
+SEARCH_PAGE_SIZE = 8
+MEMBERS_PAGE_SIZE = 50
+TRI_STATE = {"(svi)": None, "da": True, "ne": False}
+TRI_LABEL = {v: k for k, v in TRI_STATE.items()}
+UPLOAD_DIR = "uploads"
+# administratorske stranice (Performanse) traže ovaj kod; prazno = zaključane
+ADMIN_CODE = os.environ.get("HK_ADMIN_CODE", "")
+
+CSS = f"""
+<style>
+.app-header {{ background: linear-gradient(90deg, {PRIMARY_RED}, {GOLD}); color: {WHITE}; padding: 16px 20px; border-radius: 16px; margin-bottom: 16px; }}
+.card {{ background: {LIGHT_BG}; border: 1px solid #f0e6da; border-radius: 16px; padding: 16px; margin-bottom: 12px; }}
+.danger {{ color: #b00020; font-weight: 700; }}
+.ok {{ color: #0b7a0b; font-weight: 700; }}
+</style>
+"""
+
+# ==========================
+# BAZA I POZADINSKE DRETVE
+# ==========================
+@st.cache_resource
+def db_pool() -> ConnectionPool:
+    # jedan bazen po procesu – dijele ga sve sesije i svi rerunovi
+    return ConnectionPool(DB_PATH, max_size=DB_POOL_SIZE)
+
+def db_conn():
+    """Posuđuje konekciju iz bazena: `with db_conn() as conn: ...`"""
+    return db_pool().connection()
+
+@st.cache_resource
+def db_writer() -> DbWriter:
+    # svi upisi sesija idu kroz jednu dretvu (hk_core.writer) – nema natjecanja za zaključavanje
+    return DbWriter(db_pool()).start()
+
+def db_write(*statements) -> WriteResult:
+    """Sprema naredbe (sql, params) kao jedan paket i čeka commit: `db_write((sql, params), ...)`"""
+    return db_writer().execute(statements, timeout=WRITE_TIMEOUT)
+
+def db_call(fn, *args):
+    """fn(conn, *args) u dretvi pisača – za funkcije hk_core koje same vode transakciju."""
+    return db_writer().call(fn, *args).result(WRITE_TIMEOUT)
+
+@st.cache_resource
+def lookup_cache() -> LookupCache:
+    # opcije izbornika dijele sve sesije; poništavaju se commitom u izvorne tablice
+    return LookupCache(db_pool())
+
+def lookup(name: str, conn):
+    """Opcije za izbornik (vidi hk_core.lookups.LOOKUPS)."""
+    return lookup_cache().get(name, conn)
+
+@st.cache_resource
+def init_db() -> int:
+    """Migracije sheme i mapa za upload – jednom po procesu; rerunovi ne rade nikakav DDL."""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    with db_conn() as conn:
+        migrate(conn, club=dict(name=KLUB_NAZIV, email=KLUB_EMAIL, address=KLUB_ADRESA,
+                                oib=KLUB_OIB, web=KLUB_WEB, iban=KLUB_IBAN))
+        return schema_version(conn)
+
+@st.cache_resource
+def expiry_refresher():
+    # jedna pozadinska dretva po procesu; tablicu istjecanja osvježava dnevno i nakon upisa u members
+    from hk_core.expiry import ExpiryRefresher
+    init_db()
+    return ExpiryRefresher(db_pool(), db_writer()).start()
+
+@st.cache_resource
+def outbox_worker():
+    """Dretva za slanje e-maila (hk_core.mailer); None dok SMTP nije podešen (HK_SMTP_*)."""
+    from hk_core.mailer import OutboxWorker, SmtpConfig
+    config = SmtpConfig.from_env(sender=KLUB_EMAIL)
+    if not config.configured:
+        return None
+    init_db()
+    return OutboxWorker(db_pool(), config, db_writer()).start()
+
+@st.cache_resource
+def job_runner():
+    """Pozadinski poslovi – uvozi i izvozi (hk_core.jobs); preživljavaju rerun i promjenu stranice."""
+    from hk_core.jobs import JobRunner
+    init_db()
+    return JobRunner(db_pool(), db_writer()).start()
+
+# ==========================
+# IZGLED
+# ==========================
+def css_style():
+    st.markdown(CSS, unsafe_allow_html=True)
+
+def page_header(title: str, subtitle: Optional[str] = None):
+    st.markdown(f"<div class='app-header'><h2 style='margin:0'>{title}</h2>{('<div>'+subtitle+'</div>') if subtitle else ''}</div>", unsafe_allow_html=True)
+
+def require_admin() -> bool:
+    """Kod administratora (HK_ADMIN_CODE) jednom po sesiji; False = stranica se ne prikazuje."""
+    if not ADMIN_CODE:
+        st.info("Stranica je dostupna samo administratoru – postavite varijablu okoline HK_ADMIN_CODE.")
+        return False
+    if st.session_state.get("admin_ok"):
+        return True
+    code = st.text_input("Kod administratora", type="password", key="admin_code")
+    if code and hmac.compare_digest(code.encode("utf-8"), ADMIN_CODE.encode("utf-8")):
+        st.session_state["admin_ok"] = True
+        return True
+    if code:
+        st.error("Pogrešan kod.")
+    return False
+
+def sidebar_club():
+    st.markdown(f"## {KLUB_NAZIV}")
+    st.markdown(f"**E-mail:** {KLUB_EMAIL}")
+    st.markdown(f"**Adresa:** {KLUB_ADRESA}")
+    st.markdown(f"**OIB:** {KLUB_OIB}")
+    st.markdown(f"**IBAN:** {KLUB_IBAN}")
+    st.markdown(f"[Web]({KLUB_WEB})")
+
+def sidebar_search():
+    """Globalna pretraga (hk_core.search, FTS5) – rangirani rezultati po stranicama."""
+    q = st.text_input("Pretraga", key="search_q_v6", placeholder="ime, OIB, e-mail, mjesto, bilješka…")
+    if not q.strip():
+        return
+    if st.session_state.get("search_last_v6") != q:
+        st.session_state["search_last_v6"] = q
+        st.session_state["search_page_v6"] = 0
+    page = st.session_state["search_page_v6"]
+    t0 = time.perf_counter()
+    with db_conn() as conn:
+        hits, more = search(conn, q, limit=SEARCH_PAGE_SIZE, offset=page * SEARCH_PAGE_SIZE)
+    ms = (time.perf_counter() - t0) * 1000
+    if not hits:
+        st.caption("Nema rezultata.")
+        return
+    for h in hits:
+        st.markdown(f"**{h['naslov'].strip() or '-'}** · {h['vrsta']}  \n{h['isječak'].strip()}")
+    def turn(step: int):
+        st.session_state["search_page_v6"] += step
+    c1, c2 = st.columns(2)
+    c1.button("‹ Prethodna", key="search_prev_v6", disabled=page == 0, on_click=turn, args=(-1,))
+    c2.button("Sljedeća ›", key="search_next_v6", disabled=not more, on_click=turn, args=(1,))
+    st.caption(f"Stranica {page + 1} · {ms:.1f} ms")
+
+def sidebar_stats():
+    with st.expander("Baza – konekcije"):
+        s = db_pool().stats()
+        st.caption(f"Otvoreno: {s['open']} (zauzeto {s['in_use']}) · Pogoci: {s['hits']} · "
+                   f"Čekanja: {s['waits']} · Ponovljeno (locked): {s['lock_retries']}")
+        ws = db_writer().stats()
+        st.caption(f"Pisač: paketa {ws['batches']} · poziva {ws['calls']} · commitova {ws['commits']} · "
+                   f"najveća grupa {ws['max_group']} · u redu {ws['queued']} · neuspjelih {ws['failed']}")
+        ls = lookup_cache().stats()
+        st.caption(f"Izbornici (cache): pogoci {ls['hits']} · promašaji {ls['misses']} · unosa {ls['entries']}")
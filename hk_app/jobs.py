@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Pozadinski poslovi na stranicama (hk_core.jobs): predaja, napredak, otkazivanje."""
+
+from typing import Optional
+
+import streamlit as st
+
+from hk_app.common import job_runner
+from hk_core.jobs import JobStatus
+
+POLL_SECONDS = 1.0
+
+def submit_upload(key: str, kind: str, label: str, fn, uploaded):
+    """Predaje posao za upload; file_uploader zadržava datoteku na svakom rerunu – predaje se jednom po datoteci."""
+    if st.session_state.get(f"{key}_done") != uploaded.file_id:
+        st.session_state[f"{key}_job"] = job_runner().submit(kind, label, fn, uploaded.getvalue())
+        st.session_state[f"{key}_done"] = uploaded.file_id
+
+def _progress_text(job: JobStatus) -> str:
+    rows = f"{job.done_rows}" + (f" / {job.total_rows}" if job.total_rows else "")
+    return f"{job.label} · {job.phase or 'u redu čekanja'} · {rows} redaka"
+
+@st.fragment(run_every=POLL_SECONDS)
+def _poll(key: str):
+    job = job_runner().get(st.session_state.get(f"{key}_job"))
+    if job is None or not job.active:
+        # cijela stranica se iscrtava ponovno i prikazuje ishod; fragment se više ne poziva
+        st.rerun()
+    st.progress(job.progress, text=_progress_text(job))
+    st.button("Otkaži", key=f"{key}_cancel", on_click=job_runner().cancel, args=(job.id,))
+
+def job_progress(key: str) -> Optional[JobStatus]:
+    """
+    Stanje posla iz session_state[key + "_job"]. Dok traje, prikazuje traku
+    napretka koja se sama osvježava; neuspjeh i otkazivanje javlja, a gotov
+    posao vraća pozivatelju da prikaže izvještaj.
+    """
+    job = job_runner().get(st.session_state.get(f"{key}_job"))
+    if job is None:
+        return None
+    if job.active:
+        _poll(key)
+    elif job.status == "failed":
+        st.error(f"{job.label}: {job.error}")
+    elif job.status == "cancelled":
+        st.warning(f"{job.label}: otkazano – ništa nije upisano.")
+    return job
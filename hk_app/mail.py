@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Slanje obavijesti iz stranica Veterani i Komunikacija (hk_core.mailer)."""
+
+import pandas as pd
+import streamlit as st
+
+from hk_app.common import db_call, outbox_worker
+from hk_core.mailer import comm_summary, delivery_status, queue_message
+from hk_core.profiling import timed
+
+def send_email(conn, audience: pd.DataFrame, subject: str, body: str):
+    """Stavlja poruku u red za slanje; `audience` je rezultat hk_core.segments.recipients."""
+    comm_id = db_call(queue_message, subject, body, zip(audience["member_id"].tolist(), audience["email"].tolist()))
+    if comm_id is None:
+        st.warning("Nema e-mail adresa.")
+        return
+    worker = outbox_worker()
+    if worker is None:
+        st.warning("Poruka je spremljena u red, ali SMTP nije podešen (HK_SMTP_HOST, HK_SMTP_SENDER) – neće biti poslana.")
+    else:
+        worker.notify()
+        st.success(f"Poruka je u redu za slanje (#{comm_id}).")
+
+@timed()
+def outbox_panel(conn, key: str):
+    """Poslane poruke i stanje isporuke po primatelju (tablica outbox)."""
+    with st.expander("Poslane poruke i stanje isporuke"):
+        worker = outbox_worker()
+        if worker is not None and worker.last_error:
+            st.caption(f"Zadnja greška SMTP-a: {worker.last_error}")
+        summary = comm_summary(conn)
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+        if not summary.empty:
+            cid = st.selectbox("Poruka", summary["id"].tolist(), key=key,
+                               format_func=lambda i: f"#{i} – {summary.set_index('id').at[i, 'naslov']}")
+            st.dataframe(delivery_status(conn, int(cid)), use_container_width=True, hide_index=True)
+            st.button("Osvježi", key=key + "_refresh")
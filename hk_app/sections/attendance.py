@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Prisustvo" – treninzi trenera, dolasci sportaša, pripreme."""
+
+from datetime import date, datetime, timedelta
+
+import streamlit as st
+
+from hk_app.common import db_call, db_conn, db_write, lookup, page_header
+from hk_core.attendance import attendance_sheet, save_attendance, save_camp
+from hk_core.profiling import timed
+
+# ==========================
+# 8) PRISUSTVO
+# ==========================
+@timed(kind="section")
+def section_attendance():
+    page_header("Prisustvo", "Treneri + sportaši + pripreme")
+    with db_conn() as conn:
+
+        # Treneri
+        st.markdown("### Treneri – unos treninga")
+        csel = st.selectbox("Trener", options=["-"]+lookup("coaches", conn), key="att_coach_sel_v6")
+        group = st.text_input("Grupa", key="att_group_v6")
+        start = st.datetime_input("Početak", value=datetime.now().replace(minute=0, second=0, microsecond=0), key="att_start_v6")
+        end = st.datetime_input("Kraj", value=(datetime.now().replace(minute=0, second=0, microsecond=0)+timedelta(hours=1)), key="att_end_v6")
+        place = st.selectbox("Mjesto", ["DVORANA SJEVER","IGRALIŠTE ANG","IGRALIŠTE SREDNJA","Drugo (upiši)"], key="att_place_sel_v6")
+        if place=="Drugo (upiši)": place = st.text_input("Upiši mjesto", key="att_place_txt_v6")
+        if st.button("Spremi trening trenera", key="att_save_coach_v6") and csel != "-":
+            coach_id = int(csel.split(" – ")[0]); minutes = int((end-start).total_seconds()//60)
+            db_write(("""INSERT INTO attendance_coaches(coach_id,group_name,start_time,end_time,place,minutes) VALUES(?,?,?,?,?,?)""",
+                      (coach_id, group, start.isoformat(), end.isoformat(), place, minutes)))
+            st.success("Trening spremljen.")
+
+        # Članovi
+        st.markdown("### Sportaši – evidencija dolazaka")
+        gsel = st.selectbox("Grupa", options=["-"]+lookup("member_groups", conn), key="att_group_sel_v6")
+        sess_date = st.date_input("Datum", value=date.today(), key="att_date_v6")
+        if gsel != "-":
+            # cijela lista u jednoj formi – izmjene ne pokreću rerun, sprema se jednim upisom
+            day = sess_date.isoformat()
+            sheet = attendance_sheet(conn, gsel, day)
+            with st.form("att_sheet_form_v6"):
+                edited = st.data_editor(
+                    sheet, hide_index=True, num_rows="fixed", use_container_width=True,
+                    disabled=["id", "full"], key=f"att_sheet_{gsel}_{day}_v6",
+                    column_config={
+                        "id": None, "full": "Sportaš/ica",
+                        "present": st.column_config.CheckboxColumn("Prisutan"),
+                        "minutes": st.column_config.NumberColumn("Min", min_value=0, step=5),
+                        "note": "Napomena",
+                    })
+                if st.form_submit_button("Spremi prisustvo"):
+                    n = db_call(save_attendance, gsel, day, edited)
+                    st.success(f"Prisustvo spremljeno ({n} sportaša, prisutno {int(edited['present'].sum())}).")
+
+        # Pripreme reprezentacije
+        st.markdown("### Pripreme reprezentacije")
+        msel = st.selectbox("Član", options=["-"]+lookup("members", conn), key="camp_member_sel_v6")
+        if msel != "-":
+            mid = int(msel.split(" – ")[0])
+            where = st.text_input("Gdje su pripreme?", key="camp_where_v6")
+            coach = st.text_input("Voditelj priprema", key="camp_coach_v6")
+            tr = st.number_input("Broj treninga", min_value=0, step=1, key="camp_trainings_v6")
+            mins = st.number_input("Ukupno sati (minuta)", min_value=0, step=15, key="camp_minutes_v6")
+            if st.button("Spremi pripreme", key="camp_save_v6"):
+                db_call(save_camp, mid, date.today().isoformat(), mins, tr, where, coach)
+                st.success("Zabilježene pripreme.")
+
+section_attendance()
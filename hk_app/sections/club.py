@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Klub" – osnovni podaci, predsjedništvo, dokumenti kluba."""
+
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from hk_app.common import KLUB_ADRESA, KLUB_EMAIL, KLUB_IBAN, KLUB_NAZIV, KLUB_OIB, KLUB_WEB, db_conn, db_write, page_header
+from hk_app.ui import file_store, save_uploaded_file
+from hk_core.profiling import timed
+
+# ==========================
+# 1) KLUB – bez promjena
+# ==========================
+@timed(kind="section")
+def section_club():
+    page_header("Klub – osnovni podaci", KLUB_NAZIV)
+    with db_conn() as conn:
+        df = pd.read_sql_query("SELECT * FROM club_info WHERE id=1", conn)
+        if df.empty:
+            db_write(("INSERT OR REPLACE INTO club_info (id, name, email, address, oib, web, iban) VALUES (1,?,?,?,?,?,?)",
+                      (KLUB_NAZIV, KLUB_EMAIL, KLUB_ADRESA, KLUB_OIB, KLUB_WEB, KLUB_IBAN)))
+            df = pd.read_sql_query("SELECT * FROM club_info WHERE id=1", conn)
+        row = df.iloc[0]
+
+        def _df_from_json(s):
+            try:
+                d = pd.read_json(s); 
+                if isinstance(d, pd.DataFrame): return d
+            except Exception: pass
+            return pd.DataFrame(columns=["ime_prezime","telefon","email"])
+
+        board_prefill = _df_from_json(row.get("board_json","[]"))
+        superv_prefill = _df_from_json(row.get("supervisory_json","[]"))
+
+        with st.form("club_form"):
+            c1, c2 = st.columns(2)
+            name = c1.text_input("KLUB (IME)", row["name"] or "")
+            address = c1.text_input("ULICA I KUĆNI BROJ, GRAD I POŠTANSKI BROJ", row["address"] or "")
+            email = c1.text_input("E-mail", row["email"] or "")
+            web = c1.text_input("Web stranica", row["web"] or "")
+            iban = c1.text_input("IBAN račun", row["iban"] or "")
+            oib = c1.text_input("OIB", row["oib"] or "")
+
+            president = c2.text_input("Predsjednik kluba", row["president"] or "")
+            secretary = c2.text_input("Tajnik kluba", row["secretary"] or "")
+
+            st.markdown("**Članovi predsjedništva**")
+            board = st.data_editor(board_prefill if not board_prefill.empty else pd.DataFrame(columns=["ime_prezime","telefon","email"]), num_rows="dynamic", key="board_editor_v6")
+            st.markdown("**Nadzorni odbor**")
+            superv = st.data_editor(superv_prefill if not superv_prefill.empty else pd.DataFrame(columns=["ime_prezime","telefon","email"]), num_rows="dynamic", key="superv_editor_v6")
+
+            st.markdown("**Društvene mreže (linkovi)**")
+            c3, c4, c5 = st.columns(3)
+            instagram = c3.text_input("Instagram", row["instagram"] or "")
+            facebook = c4.text_input("Facebook", row["facebook"] or "")
+            tik_tok = c5.text_input("TikTok", row["tiktok"] or "")
+
+            st.markdown("**Dokumenti kluba** – upload statuta ili drugih dokumenata")
+            up_statut = st.file_uploader("Statut kluba (PDF)", type=["pdf"], key="statut_v6")
+            up_other = st.file_uploader("Drugi dokument (PDF/IMG)", type=["pdf","png","jpg","jpeg"], key="ostalo_v6")
+
+            submitted = st.form_submit_button("Spremi podatke kluba")
+
+        if submitted:
+            updates = [("""UPDATE club_info SET name=?, email=?, address=?, oib=?, web=?, iban=?, president=?, secretary=?, 
+                            board_json=?, supervisory_json=?, instagram=?, facebook=?, tiktok=? WHERE id=1""",
+                         (name,email,address,oib,web,iban,president,secretary,
+                          (pd.DataFrame(board) if isinstance(board, list) else board).to_json(),
+                          (pd.DataFrame(superv) if isinstance(superv, list) else superv).to_json(),
+                          instagram,facebook,tik_tok))]
+            if up_statut:
+                path = save_uploaded_file(conn, up_statut, "club_docs")
+                updates.append(("INSERT INTO club_docs(kind, filename, path, uploaded_at) VALUES (?,?,?,?)", ("statut", up_statut.name, path, datetime.now().isoformat())))
+            if up_other:
+                path = save_uploaded_file(conn, up_other, "club_docs")
+                updates.append(("INSERT INTO club_docs(kind, filename, path, uploaded_at) VALUES (?,?,?,?)", ("ostalo", up_other.name, path, datetime.now().isoformat())))
+            db_write(*updates); st.success("Podaci kluba spremljeni.")
+
+        docs = pd.read_sql_query("SELECT id, kind, filename, path, uploaded_at FROM club_docs ORDER BY uploaded_at DESC", conn)
+        if not docs.empty:
+            st.markdown("### Dokumenti kluba"); st.dataframe(docs.drop(columns="path"), use_container_width=True)
+            dsel = st.selectbox("Dokument", options=docs.index, format_func=lambda i: f"{docs.at[i,'filename']} ({docs.at[i,'kind']})", key="club_doc_sel_v6")
+            dpath = file_store().resolve(conn, docs.at[dsel, "path"])
+            if dpath:
+                st.download_button("Preuzmi dokument", data=lambda: open(dpath, "rb").read(), file_name=docs.at[dsel, "filename"], key="club_doc_dl_v6")
+            else:
+                st.caption("Datoteka nije pronađena na disku.")
+
+section_club()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Treneri" – unos, tablica za uređivanje, dokumenti."""
+
+import json
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from hk_app.common import db_call, db_conn, db_write, page_header
+from hk_app.ui import grid_saved, grid_snapshot, save_uploaded_file
+from hk_core.grid import COACH_GRID_COLUMNS, save_grid_changes
+from hk_core.profiling import timed
+
+# ==========================
+# 3) TRENERI
+# ==========================
+@timed(kind="section")
+def section_coaches():
+    page_header("Treneri", "Unos trenera, dokumenti i slike")
+    with db_conn() as conn:
+        with st.form("coach_form_v6"):
+            c1, c2, c3 = st.columns(3)
+            first_name = c1.text_input("Ime")
+            last_name  = c2.text_input("Prezime")
+            dob        = c3.date_input("Datum rođenja", value=date(1990,1,1), key="coach_dob_v6")
+            oib        = c1.text_input("OIB")
+            email      = c2.text_input("E-mail")
+            iban       = c3.text_input("IBAN broj računa")
+            group_name = st.text_input("Grupa koju trenira")
+            contract   = st.file_uploader("Ugovor s klubom (PDF)", type=["pdf"], key="coach_contract_v6")
+            other_docs = st.file_uploader("Drugi dokumenti (više datoteka)", type=["pdf","png","jpg","jpeg"], accept_multiple_files=True, key="coach_docs_v6")
+            photo      = st.file_uploader("Slika trenera", type=["png","jpg","jpeg"], key="coach_photo_v6")
+            submit     = st.form_submit_button("Spremi trenera")
+
+        if submit:
+            cpath = save_uploaded_file(conn, contract, "coaches/contracts") if contract else ""
+            other_paths = [save_uploaded_file(conn, f, "coaches/docs") for f in (other_docs or [])]
+            ppath = save_uploaded_file(conn, photo, "coaches/photos") if photo else ""
+            db_write(("""INSERT INTO coaches(first_name,last_name,dob,oib,email,iban,group_name,contract_path,other_docs_json,photo_path)
+                         VALUES(?,?,?,?,?,?,?,?,?,?)""",
+                      (first_name,last_name,dob.isoformat(),oib,email,iban,group_name,cpath,json.dumps(other_paths),ppath)))
+            st.success("Trener spremljen.")
+
+        st.markdown("---")
+        st.markdown("### Popis trenera")
+        coaches_df, grid_key = grid_snapshot("coaches_grid_v6", lambda: pd.read_sql_query(
+            "SELECT id, first_name, last_name, dob, oib, email, iban, group_name, row_version FROM coaches ORDER BY last_name, first_name", conn))
+        if not coaches_df.empty:
+            st.data_editor(coaches_df, num_rows="dynamic", use_container_width=True, key=grid_key,
+                                    disabled=["id"], column_config={"row_version": None})
+            c1, c2 = st.columns(2)
+            if c1.button("Spremi izmjene (treneri)"):
+                rep = db_call(save_grid_changes, "coaches", coaches_df, st.session_state.get(grid_key), COACH_GRID_COLUMNS)
+                grid_saved("coaches_grid_v6", rep)
+            del_id = c2.number_input("ID trenera za brisanje", min_value=0, step=1, value=0, key="del_coach_v6")
+            if st.button("Obriši trenera") and del_id>0:
+                db_write(("DELETE FROM coaches WHERE id=?", (int(del_id),))); st.success("Trener obrisan."); st.rerun()
+
+section_coaches()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Komunikacija" – segmenti primatelja i slanje e-maila."""
+
+import streamlit as st
+
+from hk_app.common import TRI_LABEL, TRI_STATE, db_call, db_conn, lookup, page_header
+from hk_app.mail import outbox_panel, send_email
+from hk_app.ui import excel_bytes_from_df
+from hk_core.profiling import timed
+from hk_core.segments import AGE_CATS, AUDIENCES, Segment, delete_segment, load_segments, recipients, save_segment
+
+# ==========================
+# 9) KOMUNIKACIJA (masovni mailovi)
+# ==========================
+@timed(kind="section")
+def section_communication():
+    page_header("Komunikacija", "Masovni e-mail prema članovima / roditeljima")
+    with db_conn() as conn:
+        segments = load_segments(conn)
+        groups, members = lookup("member_groups", conn), lookup("members", conn)
+
+        def apply_segment():
+            seg = segments.get(st.session_state["seg_pick_v6"])
+            if seg is None:
+                return
+            labels = {int(m.split(" – ")[0]): m for m in members}
+            st.session_state.update({
+                "seg_groups_v6": [g for g in seg.groups if g in groups],
+                "seg_ages_v6": [a for a in seg.age_cats if a in AGE_CATS],
+                "seg_active_v6": TRI_LABEL[seg.active], "seg_veteran_v6": TRI_LABEL[seg.veteran],
+                "seg_fee_v6": TRI_LABEL[seg.pays_fee], "seg_medical_v6": TRI_LABEL[seg.medical_valid],
+                "seg_year_v6": seg.competed_in,
+                "seg_members_v6": [labels[i] for i in (seg.member_ids or []) if i in labels],
+                "seg_audience_v6": seg.audience,
+                "seg_name_v6": st.session_state["seg_pick_v6"],
+            })
+
+        st.selectbox("Spremljeni segment", ["-"] + list(segments), key="seg_pick_v6", on_change=apply_segment)
+        c1, c2 = st.columns(2)
+        seg_groups = c1.multiselect("Grupe", groups, key="seg_groups_v6")
+        seg_ages = c2.multiselect("Uzrast (prema godini rođenja)", list(AGE_CATS), key="seg_ages_v6")
+        t1, t2, t3, t4, t5 = st.columns(5)
+        segment = Segment(
+            groups=seg_groups, age_cats=seg_ages,
+            active=TRI_STATE[t1.selectbox("Aktivni", list(TRI_STATE), key="seg_active_v6")],
+            veteran=TRI_STATE[t2.selectbox("Veteran", list(TRI_STATE), key="seg_veteran_v6")],
+            pays_fee=TRI_STATE[t3.selectbox("Plaća članarinu", list(TRI_STATE), key="seg_fee_v6")],
+            medical_valid=TRI_STATE[t4.selectbox("Liječnička vrijedi", list(TRI_STATE), key="seg_medical_v6")],
+            competed_in=t5.number_input("Nastupio u godini", min_value=2000, max_value=2100, value=None, step=1,
+                                        key="seg_year_v6"),
+            # ništa odabrano = bez filtra (None), ne "nitko"
+            member_ids=[int(m.split(" – ")[0]) for m in st.multiselect("Samo ovi članovi", members, key="seg_members_v6")] or None,
+            audience=st.radio("Primatelji", list(AUDIENCES), horizontal=True, key="seg_audience_v6",
+                              format_func={"both": "sportaš i roditelj", "athlete": "sportaš", "parent": "roditelj"}.get),
+        )
+        audience = recipients(conn, segment)
+        st.caption(f"{len(audience)} adresa (bez duplikata)" + (" – prikazano prvih 500" if len(audience) > 500 else ""))
+        st.dataframe(audience.head(500), use_container_width=True, hide_index=True)
+
+        def store_segment(delete: bool = False):
+            # callback se izvršava prije skripte, pa popis segmenata na ovom rerunu već je ažuran
+            name = st.session_state["seg_name_v6"].strip()
+            db_call(delete_segment, name) if delete else db_call(save_segment, name, segment)
+
+        n1, n2, n3 = st.columns([2, 1, 1])
+        seg_name = n1.text_input("Naziv segmenta", key="seg_name_v6", label_visibility="collapsed", placeholder="Naziv segmenta")
+        n2.button("Spremi segment", key="seg_save_v6", disabled=not seg_name.strip(), on_click=store_segment)
+        n3.button("Obriši segment", key="seg_delete_v6", disabled=seg_name.strip() not in segments,
+                  on_click=store_segment, args=(True,))
+
+        subject = st.text_input("Naslov", key="comm_subject_v6")
+        body = st.text_area("Poruka", key="comm_body_v6")
+        if st.button("Pošalji e-mail", key="comm_make_v6", disabled=audience.empty):
+            send_email(conn, audience, subject, body)
+        st.download_button("Skini adrese segmenta (Excel)", data=lambda: excel_bytes_from_df(audience, "Primatelji"), file_name="primatelji_v6.xlsx")
+        outbox_panel(conn, "comm_outbox_v6")
+
+section_communication()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Natjecanja i rezultati" – unos natjecanja i rezultata, uvoz, galerija."""
+
+import json
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from hk_app.common import GALLERY_PAGE_SIZE, db_conn, db_write, lookup, page_header
+from hk_app.jobs import job_progress, submit_upload
+from hk_app.ui import excel_bytes_from_df, export_button, image_pipeline, save_uploaded_file
+from hk_core.importers import ImportReport
+from hk_core.jobs import import_results_job
+from hk_core.profiling import timed
+
+# ==========================
+# 4) NATJECANJA I REZULTATI
+# ==========================
+def results_template_df() -> pd.DataFrame:
+    cols = ["competition_id","member_oib","kategorija","stil(GR/FS/WW/BW/MODIFICIRANO)","borbi","pobjeda","poraza","plasman(1-100)","pobjede_detalji(ime;klub | ...)","porazi_detalji(ime;klub | ... )","napomena"]
+    return pd.DataFrame(columns=cols)
+
+@timed(kind="section")
+def section_competitions():
+    page_header("Natjecanja i rezultati", "Unos natjecanja + uvoz/ručni unos rezultata + galerija")
+    with db_conn() as conn:
+        export_button("Skini natjecanja", "competitions", "natjecanja_export_v6", key="comp_export_v6",
+                      disabled=not lookup("competitions", conn))
+
+        kind = st.selectbox("Vrsta natjecanja", ["PRVENSTVO HRVATSKE","MEĐUNARODNI TURNIR","REPREZENTATIVNI NASTUP","HRVAČKA LIGA ZA SENIORE","MEĐUNARODNA HRVAČKA LIGA ZA KADETE","REGIONALNO PRVENSTVO","LIGA ZA DJEVOJČICE","OSTALO"], key="kind_v6")
+        kind_other = st.text_input("Ako je OSTALO – upiši vrstu", key="kind_other_v6") if kind=="OSTALO" else ""
+
+        name = st.text_input("Ime natjecanja (ako postoji)", key="comp_name_v6")
+        c1,c2,c3 = st.columns(3)
+        date_from = c1.date_input("Datum od", value=date.today(), key="comp_from_v6")
+        date_to = c2.date_input("Datum do (ako 1 dan, ostavi isti)", value=date.today(), key="comp_to_v6")
+        place = c3.text_input("Mjesto natjecanja", key="comp_place_v6")
+
+        style = st.selectbox("Hrvački stil", ["GR","FS","WW","BW","MODIFICIRANO"], key="comp_style_v6")
+        age = st.selectbox("Uzrast", ["POČETNICI","U11","U13","U15","U17","U20","U23","SENIORI"], key="comp_age_v6")
+
+        ctry1, ctry2 = st.columns(2)
+        country = ctry1.text_input("Država (naziv)", key="comp_country_v6")
+        iso3 = ctry2.text_input("Država ISO-3 (npr. HRV)", key="comp_iso3_v6")
+
+        c4,c5,c6,c7,c8 = st.columns(5)
+        team_rank = c4.number_input("Ekipni poredak", min_value=0, step=1, key="team_rank_v6")
+        club_n = c5.number_input("Broj natjecatelja iz kluba", min_value=0, step=1, key="club_n_v6")
+        total_n = c6.number_input("Ukupan broj natjecatelja", min_value=0, step=1, key="total_n_v6")
+        clubs_n = c7.number_input("Broj klubova", min_value=0, step=1, key="clubs_n_v6")
+        countries_n = c8.number_input("Broj zemalja", min_value=0, step=1, key="countries_n_v6")
+
+        coach_names = st.multiselect("Trener(i) koji su vodili", options=lookup("coach_names", conn), key="coach_names_v6")
+
+        notes = st.text_area("Kratko zapažanje trenera (za objave)", key="comp_notes_v6")
+        gallery = st.file_uploader("Upload slika s natjecanja", type=["png","jpg","jpeg"], accept_multiple_files=True, key="comp_gallery_v6")
+        bulletin_url = st.text_input("Poveznica na rezultate / bilten", key="comp_bulletin_v6")
+        website_link = st.text_input("Poveznica na objavu na webu kluba", key="comp_site_v6")
+
+        if st.button("Spremi natjecanje", key="save_comp_v6"):
+            gallery_paths = [save_uploaded_file(conn, f, "competitions/gallery") for f in (gallery or [])]
+            db_write(("""INSERT INTO competitions(kind,kind_other,name,date_from,date_to,place,style,age_cat,country,country_iso3,
+                         team_rank,club_competitors,total_competitors,clubs_count,countries_count,coaches_json,notes,bulletin_url,gallery_paths_json,website_link)
+                         VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
+                      (kind,kind_other,name,date_from.isoformat(),date_to.isoformat(),place,style,age,country,iso3,
+                       int(team_rank),int(club_n),int(total_n),int(clubs_n),int(countries_n),
+                       json.dumps(coach_names),notes,bulletin_url,json.dumps(gallery_paths),website_link)))
+            st.success("Natjecanje spremljeno.")
+
+        st.markdown("---")
+        st.markdown("### Rezultati – ručni unos ili Excel")
+        # Excel predložak za rezultate
+        st.download_button("Skini predložak rezultata (Excel)", data=lambda: excel_bytes_from_df(results_template_df(), "RezultatiPredlozak"), file_name="predlozak_rezultati_v6.xlsx")
+
+        comp_map = lookup("competitions", conn)
+        comp_label = st.selectbox("Odaberi natjecanje", options=["-"]+list(comp_map.keys()), key="res_comp_sel_v6")
+        if comp_label != "-":
+            comp_id = comp_map[comp_label]
+            msel = st.selectbox("Član (iz baze)", options=["-"]+lookup("members", conn), key="res_member_sel_v6")
+            if msel != "-":
+                mid = int(msel.split(" – ")[0])
+                c1,c2,c3 = st.columns(3)
+                cat = c1.text_input("Kategorija / težina", key="res_cat_v6")
+                stl = c2.selectbox("Stil", ["GR","FS","WW","BW","MODIFICIRANO"], key="res_style_v6")
+                fights = c3.number_input("Ukupno borbi", min_value=0, step=1, key="res_fights_v6")
+                w = c1.number_input("Pobjede", min_value=0, step=1, key="res_wins_v6")
+                l = c2.number_input("Porazi", min_value=0, step=1, key="res_losses_v6")
+                place = c3.number_input("Plasman (1–100)", min_value=0, max_value=100, step=1, key="res_place_v6")
+                wins_d = st.text_area("Pobjede – 'ime;klub' | 'ime;klub'", key="res_winsd_v6")
+                losses_d = st.text_area("Porazi – 'ime;klub' | 'ime;klub'", key="res_lossesd_v6")
+                note = st.text_area("Napomena trenera", key="res_note_v6")
+                if st.button("Spremi rezultat", key="save_res_v6"):
+                    db_write(("""INSERT INTO results(competition_id,member_id,category,style,fights_total,wins,losses,placement,wins_detail_json,losses_detail_json,note)
+                                 VALUES(?,?,?,?,?,?,?,?,?,?,?)""",
+                              (comp_id,mid,cat,stl,int(fights),int(w),int(l),int(place),json.dumps([x.strip() for x in wins_d.split('|') if x.strip()]),json.dumps([x.strip() for x in losses_d.split('|') if x.strip()]),note)))
+                    st.success("Rezultat spremljen.")
+
+        st.markdown("#### Uvoz rezultata iz Excela")
+        up_res = st.file_uploader("Upload Excel rezultata (po predlošku)", type=["xlsx"], key="res_excel_v6")
+        if up_res is not None:
+            submit_upload("res_excel_v6", "import_results", f"Uvoz rezultata – {up_res.name}", import_results_job, up_res)
+        job = job_progress("res_excel_v6")
+        if job is not None and job.status == "done":
+            rep = ImportReport(**job.report)
+            st.success(f"Rezultati uvezeni – upisano redaka: {rep.inserted}, odbijeno: {len(rep.rejected)}.")
+            if rep.unmatched_oibs:
+                st.warning("Nepoznati OIB-i (nema ih među članovima): " + ", ".join(rep.unmatched_oibs))
+            if rep.rejected:
+                st.dataframe(rep.rejected_df(), use_container_width=True)
+
+        st.markdown("---")
+        st.markdown("### Galerija natjecanja")
+        g_map = lookup("competitions", conn)
+        g_label = st.selectbox("Natjecanje", options=["-"]+list(g_map.keys()), key="gal_comp_sel_v6")
+        if g_label != "-":
+            row = conn.execute("SELECT gallery_paths_json FROM competitions WHERE id=?", (g_map[g_label],)).fetchone()
+            stored = json.loads((row and row[0]) or "[]")
+            # v6.3 sprema pd.Series(...).to_json() – objekt {"0": ...} umjesto liste
+            refs = [r for r in (stored.values() if isinstance(stored, dict) else stored) if r]
+            if not refs:
+                st.info("Nema slika za ovo natjecanje.")
+            else:
+                pages = (len(refs) - 1) // GALLERY_PAGE_SIZE + 1
+                page = st.number_input(f"Stranica (od {pages})", min_value=1, max_value=pages, value=1, step=1, key="gal_page_v6")
+                page_refs = refs[(page-1)*GALLERY_PAGE_SIZE : page*GALLERY_PAGE_SIZE]
+                # samo umanjene slike trenutne stranice – izvornici se ne šalju pregledniku
+                thumbs = image_pipeline().ensure(conn, page_refs, "thumb")
+                cols = st.columns(4)
+                for i, t in enumerate(thumbs):
+                    if t: cols[i % 4].image(t, use_container_width=True)
+                    else: cols[i % 4].caption("Slika nije dostupna.")
+                big = st.selectbox("Prikaži veću", options=["-"]+list(range(1, len(page_refs)+1)), key="gal_big_v6")
+                if big != "-":
+                    web = image_pipeline().ensure(conn, [page_refs[big-1]], "web")[0]
+                    if web: st.image(web)
+
+section_competitions()
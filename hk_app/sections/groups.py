@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Grupe" – grupe i raspored članova."""
+
+import sqlite3
+
+import pandas as pd
+import streamlit as st
+
+from hk_app.common import db_conn, db_write, lookup, page_header
+from hk_core.profiling import timed
+
+# ==========================
+# 6) GRUPE
+# ==========================
+@timed(kind="section")
+def section_groups():
+    page_header("Grupe", "Dodavanje/brisanje grupa i premještaj članova")
+    with db_conn() as conn:
+        with st.form("group_add_v6"):
+            new_g = st.text_input("Nova grupa")
+            add = st.form_submit_button("Dodaj")
+        if add and new_g:
+            try: db_write(("INSERT INTO groups(name) VALUES(?)",(new_g,))); st.success("Grupa dodana.")
+            except sqlite3.IntegrityError: st.warning("Grupa već postoji.")
+        groups_df = pd.read_sql_query("SELECT * FROM groups ORDER BY name", conn); st.dataframe(groups_df, use_container_width=True)
+        mems = lookup("members_with_group", conn)
+        if mems:
+            msel = st.selectbox("Član", options=["-"]+mems, key="grp_member_sel_v6")
+            gsel = st.selectbox("Grupa", options=["-"]+lookup("groups", conn), key="grp_sel_v6")
+            if st.button("Spremi pripadnost", key="grp_save_v6") and msel!="- ":
+                if msel != "-" and gsel != "-":
+                    mid = int(msel.split(" – ")[0]); db_write(("UPDATE members SET group_name=? WHERE id=?", (gsel, mid))); st.success("Ažurirano.")
+
+section_groups()
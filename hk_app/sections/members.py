@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Članovi" – popis po stranicama, unos, uvoz/izvoz, liječničke i istek dokumenata."""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from hk_app.common import MEMBERS_PAGE_SIZE, TRI_STATE, db_call, db_conn, db_write, expiry_refresher, lookup, page_header
+from hk_app.jobs import job_progress, submit_upload
+from hk_app.ui import excel_bytes_from_df, export_button, grid_saved, grid_snapshot, mailto_link, reset_grid, save_uploaded_file, whatsapp_link
+from hk_core import queries
+from hk_core.expiry import DOCS, EXPIRING_SUMMARY, HORIZON_DAYS, LOOKBACK_DAYS, expiring_soon, last_refresh
+from hk_core.grid import MEMBER_GRID_COLUMNS, has_changes, save_grid_changes
+from hk_core.importers import ImportReport
+from hk_core.jobs import import_members_job
+from hk_core.members import MemberFilter, count_members, members_page
+from hk_core.profiling import timed
+
+# ==========================
+# 2) ČLANOVI
+# ==========================
+def members_grid_cursor(name: str, filters: MemberFilter):
+    """
+    Ključ (keyset) trenutne stranice popisa. Stog ključeva prethodnih stranica
+    čuva se u session_state; promjena filtra vraća popis na prvu stranicu.
+    """
+    if st.session_state.get(name + "_filters") != filters:
+        st.session_state[name + "_filters"] = filters
+        st.session_state[name + "_pages"] = [None]
+        reset_grid(name)
+    return st.session_state[name + "_pages"][-1]
+
+def members_grid_pager(name: str, total: int, shown: int):
+    pages = st.session_state[name + "_pages"]
+    nxt = st.session_state.get(name + "_next")
+    # nespremljene izmjene vrijede samo za prikazanu stranicu
+    locked = has_changes(st.session_state.get(f"{name}_{st.session_state.get(name + '_gen', 0)}"))
+    def turn(step: int):
+        if step > 0:
+            pages.append(nxt)
+        else:
+            pages.pop()
+        reset_grid(name)
+    c1, c2, c3 = st.columns([1, 1, 4])
+    c1.button("‹ Prethodna", key=name + "_prev", disabled=locked or len(pages) == 1, on_click=turn, args=(-1,))
+    c2.button("Sljedeća ›", key=name + "_next_btn", disabled=locked or nxt is None, on_click=turn, args=(1,))
+    c3.caption(f"Stranica {len(pages)} · prikazano {shown} od {total} članova")
+
+def members_template_df() -> pd.DataFrame:
+    cols = ["ime","prezime","datum_rodenja(YYYY-MM-DD)","spol(M/Ž)","oib",
+            "ulica_i_broj","grad","postanski_broj",
+            "email_sportasa","email_roditelja",
+            "br_osobne","osobna_vrijedi_do(YYYY-MM-DD)","osobna_izdavatelj",
+            "br_putovnice","putovnica_vrijedi_do(YYYY-MM-DD)","putovnica_izdavatelj",
+            "aktivni_natjecatelj(0/1)","veteran(0/1)","ostalo(0/1)",
+            "placa_clanarinu(0/1)","iznos_clanarine(EUR)","grupa"]
+    return pd.DataFrame(columns=cols)
+
+@timed(kind="section")
+def section_members():
+    page_header("Članovi", "Excel upload/download + djelomičan unos + dokumenti + grupe + članarina")
+    with db_conn() as conn:
+
+        # Predložak
+        st.download_button("Skini predložak (Excel)", data=lambda: excel_bytes_from_df(members_template_df(), "ClanoviPredlozak"), file_name="predlozak_clanovi_v6.xlsx")
+
+        # Export
+        export_button("Skini članove", "members", "clanovi_export_v6", key="members_export_v6",
+                      disabled=not lookup("members", conn))
+
+        # Import
+        st.markdown("#### Učitaj članove iz Excel tablice")
+        up_excel = st.file_uploader("Upload Excel", type=["xlsx"], key="members_xlsx_v6")
+        if up_excel is not None:
+            # uvoz je pozadinski posao (hk_core.jobs) – stranica se ne blokira, a odlazak s nje ga ne prekida
+            submit_upload("members_xlsx_v6", "import_members", f"Uvoz članova – {up_excel.name}", import_members_job, up_excel)
+        job = job_progress("members_xlsx_v6")
+        if job is not None and job.status == "done":
+            rep = ImportReport(**job.report)
+            st.success(f"Članovi uvezeni/ažurirani: {rep.inserted} novih, {rep.updated} ažuriranih, {len(rep.rejected)} odbijenih.")
+            if rep.rejected:
+                st.dataframe(rep.rejected_df(), use_container_width=True)
+
+        st.markdown("---")
+        st.markdown("### Unos novog člana (djelomičan unos moguć)")
+        groups = lookup("groups", conn)
+
+        with st.form("member_form_v6"):
+            c1, c2, c3 = st.columns(3)
+            first_name = c1.text_input("Ime")
+            last_name  = c2.text_input("Prezime")
+            dob        = c3.date_input("Datum rođenja", value=date(2010,1,1), key="dob_v6")
+            gender     = c1.selectbox("Spol", ["","M","Ž"], key="gender_v6")
+            oib        = c2.text_input("OIB")
+
+            st.markdown("**Adresa**")
+            a1, a2, a3 = st.columns(3)
+            street = a1.text_input("Ulica i kućni broj")
+            city   = a2.text_input("Grad / mjesto")
+            postal = a3.text_input("Poštanski broj")
+
+            e1, e2 = st.columns(2)
+            email_s = e1.text_input("E-mail sportaša")
+            email_p = e2.text_input("E-mail roditelja")
+
+            st.markdown("**Osobna iskaznica**")
+            id1, id2, id3 = st.columns(3)
+            id_no     = id1.text_input("Broj osobne")
+            id_until  = id2.date_input("Osobna vrijedi do", value=date.today(), key="id_until_v6")
+            id_issuer = id3.text_input("Izdavatelj osobne")
+
+            st.markdown("**Putovnica**")
+            p1, p2, p3 = st.columns(3)
+            pass_no     = p1.text_input("Broj putovnice")
+            pass_until  = p2.date_input("Putovnica vrijedi do", value=date.today(), key="pass_until_v6")
+            pass_issuer = p3.text_input("Izdavatelj putovnice")
+
+            st.markdown("**Status**")
+            s1, s2, s3 = st.columns(3)
+            active = s1.checkbox("Aktivni natjecatelj/ica", value=False)
+            veteran= s2.checkbox("Veteran", value=False)
+            other  = s3.checkbox("Ostalo", value=False)
+
+            pays_fee = st.checkbox("Plaća članarinu", value=active, key="pays_fee_v6")
+            fee_amt  = st.number_input("Iznos članarine (EUR)", value=30.0, step=1.0)
+            group_name = st.selectbox("Grupa", options=[""]+groups, key="group_v6")
+
+            photo   = st.file_uploader("Slika člana", type=["png","jpg","jpeg"], key="photo_v6")
+            app_pdf = st.file_uploader("Pristupnica (PDF)", type=["pdf"], key="app_pdf_v6")
+            con_pdf = st.file_uploader("Privola (PDF)", type=["pdf"], key="con_pdf_v6")
+
+            submit_member = st.form_submit_button("Spremi člana")
+
+        if submit_member:
+            db_write(("""
+                INSERT INTO members(first_name,last_name,dob,gender,oib,street,city,postal_code,
+                    athlete_email,parent_email,id_card_number,id_card_issuer,id_card_valid_until,
+                    passport_number,passport_issuer,passport_valid_until,
+                    active_competitor,veteran,other_flag,pays_fee,fee_amount,group_name,photo_path,application_path,consent_path)
+                VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                ON CONFLICT(oib) DO UPDATE SET
+                    first_name=excluded.first_name,last_name=excluded.last_name,dob=excluded.dob,gender=excluded.gender,
+                    street=excluded.street,city=excluded.city,postal_code=excluded.postal_code,
+                    athlete_email=excluded.athlete_email,parent_email=excluded.parent_email,
+                    id_card_number=excluded.id_card_number,id_card_issuer=excluded.id_card_issuer,id_card_valid_until=excluded.id_card_valid_until,
+                    passport_number=excluded.passport_number,passport_issuer=excluded.passport_issuer,passport_valid_until=excluded.passport_valid_until,
+                    active_competitor=excluded.active_competitor,veteran=excluded.veteran,other_flag=excluded.other_flag,
+                    pays_fee=excluded.pays_fee,fee_amount=excluded.fee_amount,group_name=excluded.group_name,
+                    photo_path=COALESCE(excluded.photo_path, photo_path),
+                    application_path=COALESCE(excluded.application_path, application_path),
+                    consent_path=COALESCE(excluded.consent_path, consent_path)
+            """, (first_name,last_name,dob.isoformat(),gender,oib,street,city,postal,email_s,email_p,id_no,id_issuer,id_until.isoformat(),
+                  pass_no,pass_issuer,pass_until.isoformat(),int(active),int(veteran),int(other),int(pays_fee),float(fee_amt),group_name,
+                  save_uploaded_file(conn, photo, "members/photos") if photo else "",
+                  save_uploaded_file(conn, app_pdf, "members/forms") if app_pdf else "",
+                  save_uploaded_file(conn, con_pdf, "members/forms") if con_pdf else "")))
+            st.success("Član spremljen.")
+
+        st.markdown("---")
+        st.markdown("### Popis članova, izmjene, e-mail/WhatsApp, brisanje, liječnički rok")
+        f1, f2, f3, f4, f5 = st.columns(5)
+        filters = MemberFilter(
+            group=f1.selectbox("Grupa", ["(sve)"] + lookup("member_groups", conn), key="mf_group_v6"),
+            active=TRI_STATE[f2.selectbox("Aktivni", list(TRI_STATE), key="mf_active_v6")],
+            veteran=TRI_STATE[f3.selectbox("Veteran", list(TRI_STATE), key="mf_veteran_v6")],
+            pays_fee=TRI_STATE[f4.selectbox("Plaća članarinu", list(TRI_STATE), key="mf_fee_v6")],
+            medical_within=f5.number_input("Liječnička ističe za ≤ N dana", min_value=0, step=1, value=None,
+                                           key="mf_medical_v6"),
+        )
+        if filters.group == "(sve)":
+            filters.group = None
+        after = members_grid_cursor("members_grid_v6", filters)
+
+        def load_members():
+            df, nxt = members_page(conn, filters, after, MEMBERS_PAGE_SIZE)
+            st.session_state["members_grid_v6_next"] = nxt
+            return df
+
+        members_df, grid_key = grid_snapshot("members_grid_v6", load_members)
+        members_grid_pager("members_grid_v6", count_members(conn, filters), len(members_df))
+        if not members_df.empty:
+            edited = st.data_editor(members_df, num_rows="dynamic", use_container_width=True, key=grid_key,
+                                    disabled=["id", "oib", "dana_do_ljecnicke"], column_config={"row_version": None})
+            c1, c2, c3, c4 = st.columns(4)
+            if c1.button("Spremi izmjene"):
+                try:
+                    rep = db_call(save_grid_changes, "members", members_df, st.session_state.get(grid_key), MEMBER_GRID_COLUMNS)
+                    grid_saved("members_grid_v6", rep)
+                except Exception as e:
+                    st.error(f"Greška: {e}")
+
+            # Akcije nad članom
+            sel = c2.selectbox("Odaberi ID člana", options=[0]+edited["id"].tolist())
+            if sel and sel>0:
+                m = pd.read_sql_query("SELECT * FROM members WHERE id=?", conn, params=(int(sel),)).iloc[0]
+                if m["athlete_email"]: c3.link_button("E-mail sportašu", url=mailto_link(m["athlete_email"], "Obavijest kluba"))
+                if m["parent_email"]:  c4.link_button("E-mail roditelju", url=mailto_link(m["parent_email"], "Obavijest kluba"))
+                st.markdown(f"[WhatsApp link (ručno unesite broj)]({whatsapp_link('38591XXXXXXX','Pozdrav iz HK Podravka!')})")
+
+                # Rezultati tog člana
+                st.markdown("#### Rezultati člana")
+                st.dataframe(pd.read_sql_query(queries.MEMBER_RESULTS, conn, params=(int(sel),)), use_container_width=True)
+
+            del_id = c4.number_input("ID za brisanje", min_value=0, step=1, value=0, key="del_id_v6")
+            if st.button("Obriši člana po ID-u") and del_id>0:
+                db_write(("DELETE FROM members WHERE id=?", (int(del_id),))); st.success("Član obrisan."); st.rerun()
+
+        # Upload liječničke potvrde + praćenje roka
+        st.markdown("#### Liječnička potvrda – upload i rok valjanosti")
+        msel = st.selectbox("Član", options=["-"]+lookup("members", conn), key="med_sel_v6")
+        if msel != "-":
+            mid = int(msel.split(" – ")[0])
+            up_med = st.file_uploader("Liječnička potvrda (PDF/JPG/PNG)", type=["pdf","jpg","jpeg","png"], key="med_up_v6")
+            valid_to = st.date_input("Vrijedi do", value=date.today(), key="med_valid_to_v6")
+            if st.button("Spremi liječničku potvrdu"):
+                path = save_uploaded_file(conn, up_med, "members/medical") if up_med else ""
+                db_write(("UPDATE members SET medical_path=?, medical_valid_until=? WHERE id=?", (path, valid_to.isoformat(), mid)))
+                st.success("Liječnička potvrda spremljena.")
+
+        st.markdown("---")
+        expiry_panel(conn)
+
+@timed()
+def expiry_panel(conn):
+    """Pregled dokumenata koji su istekli ili uskoro istječu (hk_core.expiry) + izvozi."""
+    st.markdown("#### Istek dokumenata (liječnička, osobna, putovnica)")
+    refresher = expiry_refresher()
+    refresher.wake()    # vlastite upise u members dretva obradi odmah, ne tek za `interval`
+    c1, c2, c3 = st.columns([1, 1, 2])
+    within = c1.number_input("Istječe za ≤ N dana", min_value=0, max_value=HORIZON_DAYS, value=30, step=1,
+                             key="exp_within_v6")
+    group = c2.selectbox("Grupa", ["(sve)"] + lookup("member_groups", conn), key="exp_group_v6")
+    group = None if group == "(sve)" else group
+    info = last_refresh(conn)
+    c3.caption(f"Osvježeno: {info['refreshed_at'] if info else '-'}" +
+               (" · osvježavanje u tijeku" if refresher.pending else "") +
+               (f" · greška: {refresher.last_error}" if refresher.last_error else ""))
+    c3.button("Osvježi sada", key="exp_refresh_v6", on_click=refresher.wake, kwargs={"force": True})
+
+    df = expiring_soon(conn, int(within), group)
+    expired = int((df["dana"] < 0).sum())
+    m1, m2 = st.columns(2)
+    m1.metric("Isteklo (zadnjih godinu dana)", expired)
+    m2.metric(f"Istječe u idućih {int(within)} dana", len(df) - expired)
+    st.dataframe(df.drop(columns=["member_id"]), use_container_width=True, hide_index=True)
+    with st.expander("Sažetak po grupama"):
+        summary = pd.read_sql_query(EXPIRING_SUMMARY, conn)
+        summary["doc"] = summary["doc"].map(lambda d: DOCS[d][0])
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+
+    start = (date.today() - timedelta(days=LOOKBACK_DAYS)).isoformat()
+    stop = (date.today() + timedelta(days=int(within))).isoformat()
+    export_button(f"Skini popis ({group or 'sve grupe'})", "expiring_by_group", "istek_dokumenata",
+                  key="exp_export_group_v6", params=(start, stop, group))
+    upcoming = lookup("upcoming_competitions", conn)
+    comp = st.selectbox("Nadolazeće natjecanje", ["-"] + list(upcoming), key="exp_comp_v6")
+    if comp != "-":
+        export_button("Skini dokumente koji ne vrijede do kraja natjecanja", "expiring_for_competition",
+                      f"istek_dokumenata_natjecanje_{upcoming[comp]}", key="exp_export_comp_v6",
+                      params=(start, upcoming[comp]))
+
+section_members()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Roditeljski pristup" – upload dokumenata preko e-maila i OIB-a."""
+
+from datetime import date
+
+import streamlit as st
+
+from hk_app.common import KLUB_EMAIL, db_conn, db_write, page_header
+from hk_app.ui import save_uploaded_file
+from hk_core.profiling import timed
+
+# ==========================
+# 10) RODITELJSKI PRISTUP (e-mail + OIB)
+# ==========================
+@timed(kind="section")
+def section_parent_portal():
+    page_header("Roditeljski/pristup sportaša", "Upload pristupnice/privole/liječnička preko e-mail + OIB")
+    with db_conn() as conn:
+        e = st.text_input("E-mail", key="pp_email_v6")
+        o = st.text_input("OIB člana", key="pp_oib_v6")
+        if st.button("Prijava", key="pp_login_v6"):
+            row = conn.execute("SELECT * FROM members WHERE (athlete_email=? OR parent_email=?) AND oib=?", (e,e,o)).fetchone()
+            if not row:
+                st.error("Nema člana s tim podatcima."); return
+            st.session_state["pp_mid"] = row[0]; st.success("Prijava uspješna.")
+        mid = st.session_state.get("pp_mid")
+        if mid:
+            st.markdown("**Upload dokumenata**")
+            app_pdf = st.file_uploader("Pristupnica (PDF)", type=["pdf"], key="pp_app_v6")
+            con_pdf = st.file_uploader("Privola (PDF)", type=["pdf"], key="pp_con_v6")
+            med = st.file_uploader("Liječnička potvrda (PDF/JPG/PNG)", type=["pdf","jpg","jpeg","png"], key="pp_med_v6")
+            med_until = st.date_input("Liječnička vrijedi do", value=date.today(), key="pp_med_until_v6")
+            if st.button("Spremi dokumente", key="pp_save_v6"):
+                updates = []
+                if app_pdf: updates.append(("UPDATE members SET application_path=? WHERE id=?", (save_uploaded_file(conn, app_pdf, "members/forms"), mid)))
+                if con_pdf: updates.append(("UPDATE members SET consent_path=? WHERE id=?", (save_uploaded_file(conn, con_pdf, "members/forms"), mid)))
+                if med: updates.append(("UPDATE members SET medical_path=?, medical_valid_until=? WHERE id=?", (save_uploaded_file(conn, med, "members/medical"), med_until.isoformat(), mid)))
+                db_write(*updates); st.success("Dokumenti spremljeni.")
+                st.info(f"Obavijestite klub: {KLUB_EMAIL}")
+
+section_parent_portal()
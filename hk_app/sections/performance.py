@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Performanse" (samo administrator) – profil reruna, percentili, spori upiti."""
+
+from dataclasses import asdict
+
+import pandas as pd
+import streamlit as st
+
+from hk_app.common import page_header, require_admin
+from hk_core.profiling import PROFILER, timed
+
+PAGE_TITLE = "Performanse"
+SQL_CHARS = 160
+
+# ==========================
+# 11) PERFORMANSE (hk_core.profiling)
+# ==========================
+def _toggle():
+    PROFILER.configure(enabled=st.session_state["prof_on"])
+
+def _threshold():
+    PROFILER.configure(slow_ms=st.session_state["prof_slow_ms"])
+
+def _queries_df(records) -> pd.DataFrame:
+    df = pd.DataFrame([asdict(r) for r in records], columns=["sql", "params", "rows", "ms", "span", "at"])
+    df["sql"] = df["sql"].str.slice(0, SQL_CHARS)
+    df["ms"] = df["ms"].round(2)
+    return df
+
+@timed(kind="section")
+def section_performance():
+    page_header(PAGE_TITLE, "Kamo odlazi vrijeme reruna: odjeljci, blokovi i SQL upiti")
+    if not require_admin():
+        return
+    # stanje dijele sve sesije – widgeti se svaki put poravnaju s PROFILER-om
+    st.session_state["prof_on"] = PROFILER.enabled
+    st.session_state["prof_slow_ms"] = float(PROFILER.slow_ms)
+    c1, c2, c3 = st.columns([1, 1, 1])
+    c1.toggle("Profiliranje uključeno", key="prof_on", on_change=_toggle)
+    c2.number_input("Prag sporog upita (ms)", min_value=1.0, step=10.0, key="prof_slow_ms", on_change=_threshold)
+    c3.button("Obriši mjerenja", key="prof_reset", on_click=PROFILER.reset)
+    if not PROFILER.enabled:
+        st.info("Profiliranje je isključeno (bez mjerenja i bez troška). Uključite ga ovdje ili s HK_PROFILE=1.")
+
+    st.markdown("#### Zadnji rerun")
+    traces = [t for t in PROFILER.recent_traces() if t.name != PAGE_TITLE]
+    if not traces:
+        st.caption("Još nema izmjerenih rerunova – otvorite neku stranicu dok je profiliranje uključeno.")
+    else:
+        labels = {f"{t.at} · {t.name} · {t.ms:.0f} ms": t for t in traces}
+        trace = labels[st.selectbox("Rerun", list(labels), key="prof_trace")]
+        st.dataframe(pd.DataFrame(trace.flatten()), hide_index=True, use_container_width=True)
+        queries = sorted(trace.all_queries(), key=lambda q: q.ms, reverse=True)
+        st.caption(f"{len(queries)} upita · SQL {sum(q.ms for q in queries):.1f} ms od {trace.ms:.1f} ms")
+        st.dataframe(_queries_df(queries).drop(columns=["at"]), hide_index=True, use_container_width=True)
+
+    st.markdown("#### Percentili po odjeljku i bloku")
+    blocks = [r for r in PROFILER.stats() if r["vrsta"] != "query"]
+    st.dataframe(pd.DataFrame(blocks), hide_index=True, use_container_width=True)
+
+    st.markdown("#### Percentili po upitu")
+    per_query = pd.DataFrame(PROFILER.stats("query"))
+    if not per_query.empty:
+        per_query["ime"] = per_query["ime"].str.slice(0, SQL_CHARS)
+    st.dataframe(per_query, hide_index=True, use_container_width=True)
+
+    st.markdown(f"#### Spori upiti (≥ {PROFILER.slow_ms:.0f} ms)")
+    st.dataframe(_queries_df(reversed(PROFILER.slow)), hide_index=True, use_container_width=True)
+
+section_performance()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Statistika" – godišnji sažeci, međusobni susreti, izvoz rezultata."""
+
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from hk_app.common import KLUB_NAZIV, db_conn, lookup, page_header
+from hk_app.ui import export_button
+from hk_core import queries
+from hk_core.profiling import timed
+
+# ==========================
+# 5) STATISTIKA
+# ==========================
+@timed(kind="section")
+def section_stats():
+    page_header("Statistika", "Po godini/uzrastu/stilu i po sportašu")
+    with db_conn() as conn:
+        year = st.number_input("Godina", min_value=2000, max_value=2100, value=datetime.now().year, step=1, key="stat_year_v6")
+        st.dataframe(pd.read_sql_query(queries.STATS_BY_YEAR, conn, params=(int(year),)), use_container_width=True)
+        export_button(f"Skini rezultate {int(year)}", "results_by_year", f"rezultati_{int(year)}_v6",
+                      key="results_export_v6", params=(int(year),))
+
+        st.markdown("#### Pojedinačno – sportaš/ica")
+        sel = st.selectbox("Sportaš/ica", options=["-"]+lookup("members", conn), key="stat_member_sel_v6")
+        if sel != "-":
+            mid = int(sel.split(" – ")[0])
+            tot = conn.execute(queries.MEMBER_STATS_BY_YEAR, (mid, int(year))).fetchone() or (0,)*7
+            m = st.columns(7)
+            for col, label, v in zip(m, ["Startova","Borbi","Pobjede","Porazi","Zlato","Srebro","Bronca"], tot):
+                col.metric(label, v)
+            st.dataframe(pd.read_sql_query(queries.MEMBER_RESULTS_BY_YEAR, conn, params=(mid,int(year))), use_container_width=True)
+
+        st.markdown("#### Međusobni omjeri")
+        c1, c2 = st.columns(2)
+        opp = c1.selectbox("Protivnik", options=["-"]+lookup("opponents", conn), key="h2h_opp_v6")
+        club = c2.selectbox("Klub protivnika", options=["-"]+lookup("opponent_clubs", conn), key="h2h_club_v6")
+        if opp != "-":
+            st.dataframe(pd.read_sql_query(queries.HEAD_TO_HEAD, conn, params=(opp,)), use_container_width=True)
+        if club != "-":
+            cvc = pd.read_sql_query(queries.CLUB_VS_CLUB, conn, params=(club,))
+            st.caption(f"{KLUB_NAZIV} protiv kluba {club}: {int(cvc['pobjede'].sum())} pobjeda, "
+                       f"{int(cvc['porazi'].sum())} poraza u {int(cvc['borbi'].sum())} borbi.")
+            st.dataframe(cvc, use_container_width=True)
+
+section_stats()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Stranica "Veterani" – popis i obavijesti veteranima."""
+
+import pandas as pd
+import streamlit as st
+
+from hk_app.common import db_conn, page_header
+from hk_app.mail import outbox_panel, send_email
+from hk_core import queries
+from hk_core.profiling import timed
+from hk_core.segments import Segment, recipients
+
+# ==========================
+# 7) VETERANI
+# ==========================
+@timed(kind="section")
+def section_veterans():
+    page_header("Veterani", "Popis + e-mail poruke + brisanje/izmjena")
+    with db_conn() as conn:
+        vets = pd.read_sql_query(queries.VETERANS, conn)
+        st.dataframe(vets, use_container_width=True)
+        if not vets.empty:
+            sel = st.multiselect("Odaberi veterane", options=[f"{r.id} – {r.full}" for r in vets.itertuples()], key="vet_sel_v6")
+            subject = st.text_input("Naslov poruke", key="vet_subject_v6")
+            body = st.text_area("Tekst poruke", key="vet_body_v6")
+            if st.button("Pošalji e-mail", key="vet_mail_v6"):
+                if sel:
+                    ids = [int(x.split(" – ")[0]) for x in sel]
+                    send_email(conn, recipients(conn, Segment(veteran=True, member_ids=ids)), subject, body)
+                else:
+                    st.warning("Nema e-mail adresa za odabrane.")
+        outbox_panel(conn, "vet_outbox_v6")
+
+section_veterans()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Elementi koje dijeli više stranica: izvoz, spremanje uploada, tablice za
+uređivanje s diff-spremanjem i linkovi za e-mail/WhatsApp. xlsxwriter
+(hk_core.exports) i Pillow (hk_core.images) uvoze se tek pri prvom izvozu
+odnosno obradi slike.
+"""
+
+import io
+import urllib.parse as up
+
+import pandas as pd
+import streamlit as st
+
+from hk_app.common import UPLOAD_DIR, db_call, db_pool, job_runner
+from hk_core.grid import SaveReport, has_changes
+from hk_core.profiling import timed
+from hk_core.storage import FileStore
+
+@st.cache_resource
+def export_cache():
+    from hk_core.exports import ExportCache
+    return ExportCache(db_pool())
+
+def _read_file(path: str):
+    def read() -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+    return read
+
+def _start_export(key: str, label: str, name: str, params: tuple, fmt: str):
+    from hk_core.jobs import export_job
+    st.session_state[key + "_job"] = job_runner().submit("export", label, export_job, export_cache(), name, params, fmt)
+    st.session_state[key + "_job_spec"] = (name, params, fmt)
+
+def export_button(label: str, name: str, file_stem: str, key: str, params: tuple = (), disabled: bool = False):
+    """
+    Izvoz iz hk_core.exports.EXPORTS s izborom formata. Datoteku priprema
+    pozadinski posao (hk_core.jobs) uz traku napretka; gotova i još važeća
+    datoteka poslužuje se s diska (ExportCache).
+    """
+    from hk_app.jobs import job_progress
+    from hk_core.exports import FORMATS
+    c1, c2 = st.columns([1, 4])
+    fmt = c1.selectbox("Format", list(FORMATS), key=key + "_fmt", label_visibility="collapsed")
+    ext, mime = FORMATS[fmt]
+    params = tuple(params)
+    path = export_cache().cached(name, params, fmt)
+    if path:
+        c2.download_button(label, data=_read_file(path), file_name=f"{file_stem}.{ext}", mime=mime,
+                           key=key, disabled=disabled)
+        return
+    with c2:
+        # posao za drugi format ili druge parametre ne prikazuje se ovdje
+        if st.session_state.get(key + "_job_spec") == (name, params, fmt):
+            job = job_progress(key)
+            if job is not None and job.active:
+                return
+        st.button(f"{label} (pripremi)", key=key + "_prepare", disabled=disabled,
+                  on_click=_start_export, args=(key, label, name, params, fmt))
+
+@st.cache_resource
+def file_store() -> FileStore:
+    return FileStore(UPLOAD_DIR)
+
+@st.cache_resource
+def image_pipeline():
+    from hk_core.images import ImagePipeline
+    return ImagePipeline(file_store())
+
+def save_uploaded_file(conn, uploaded, subdir: str) -> str:
+    """Sprema upload u spremište (hk_core.storage) i vraća referencu "file:<id>" za *_path stupce."""
+    if not uploaded: return ""
+    store = file_store()
+    # hash i pisanje na disk u ovoj dretvi – pisaču ide samo redak u files (commit odmah)
+    sha, size, created = store.write_blob(uploaded)
+    try:
+        ref = db_call(store.add, sha, size, uploaded.name, subdir, uploaded.type)
+    except Exception:
+        if created:
+            store.discard(conn, sha)
+        raise
+    if (uploaded.type or "").startswith("image/"):
+        # umanjene verzije nastaju u pozadinskim procesima
+        image_pipeline().submit(conn, [ref])
+    return ref
+
+@timed(kind="export")
+def excel_bytes_from_df(df: pd.DataFrame, sheet_name: str = "Sheet1") -> bytes:
+    out = io.BytesIO()
+    with pd.ExcelWriter(out, engine="xlsxwriter") as w:
+        df.to_excel(w, index=False, sheet_name=sheet_name)
+    return out.getvalue()
+
+def grid_snapshot(name: str, load):
+    """
+    Podaci za st.data_editor s diff-spremanjem. Dok korisnik ima nespremljene
+    izmjene, vraća isti snapshot (pozicije redaka i row_version moraju odgovarati
+    onome što je vidio); inače ponovno učitava iz baze. Vraća (df, ključ editora).
+    """
+    key = f"{name}_{st.session_state.get(name + '_gen', 0)}"
+    snap = st.session_state.get(name + "_snapshot")
+    if snap is None or not has_changes(st.session_state.get(key)):
+        snap = load()
+        st.session_state[name + "_snapshot"] = snap
+    return snap, key
+
+def reset_grid(name: str):
+    # novi ključ editora = prazno stanje izmjena i svježi podaci na sljedećem rerunu
+    st.session_state[name + "_gen"] = st.session_state.get(name + "_gen", 0) + 1
+    st.session_state.pop(name + "_snapshot", None)
+
+def grid_saved(name: str, report: SaveReport):
+    reset_grid(name)
+    if report.changed or not report.conflicts:
+        st.success(f"Izmjene spremljene (izmijenjeno {report.updated}, dodano {report.inserted}, obrisano {report.deleted}).")
+    if report.conflicts:
+        st.warning("Retke s ID-em " + ", ".join(map(str, report.conflicts)) +
+                   " je u međuvremenu mijenjao netko drugi – izmjene nisu spremljene, ponovite ih na osvježenim podacima.")
+    for e in report.errors:
+        st.error(e)
+
+def mailto_link(to: str, subject: str = "", body: str = "") -> str:
+    q = {}
+    if subject: q["subject"] = subject
+    if body: q["body"] = body
+    qp = up.urlencode(q)
+    return f"mailto:{to}?{qp}" if qp else f"mailto:{to}"
+
+def whatsapp_link(phone: str, text: str = "") -> str:
+    return f"https://wa.me/{''.join(filter(str.isdigit, phone))}?text={up.quote(text)}"
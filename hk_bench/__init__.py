@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""
+HK Podravka – mjerenje brzine na sintetičkim podacima.
+
+    synth  – puni praznu hk_podravka.db izmišljenim, ali uvjerljivim podacima
+             (hrvatska imena, ispravni OIB-i, kalendar natjecanja po sezonama,
+             rezultati s borbama, prisustvo na treninzima)
+    cases  – mjeri iste funkcije i upite koje pozivaju odjeljci aplikacije
+    ui     – mjeri stranice kroz streamlit.testing (AppTest)
+    report – izvještaj u JSON/CSV i usporedba s prethodnim izvještajem
+
+    python -m hk_bench.synth bench/hk_podravka.db
+    python -m hk_bench bench/hk_podravka.db --out bench/v7 --baseline bench/v6.json
+
+Mjerenje radi nad kopijom baze, pa izvorna baza ostaje netaknuta.
+"""
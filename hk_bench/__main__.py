@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Mjerenje nad kopijom baze i izvještaj u JSON/CSV.
+
+    python -m hk_bench bench/hk_podravka.db --out bench/v7
+    python -m hk_bench bench/hk_podravka.db --out bench/v8 --baseline bench/v7.json
+
+Izlazni kod 1 znači da je barem jedan slučaj sporiji nego u --baseline.
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from typing import List, Optional
+
+from hk_bench import report
+from hk_bench.cases import prepare, run_cases
+from hk_bench.synth import table_counts
+from hk_core.db import open_connection
+from hk_core.migrations import migrate, schema_version
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _copy(src: str, dst: str):
+    # backup API uključuje i ono što je još u WAL datoteci
+    s, d = sqlite3.connect(src), sqlite3.connect(dst)
+    try:
+        s.backup(d)
+    finally:
+        d.close()
+        s.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m hk_bench", description="Mjerenje brzine odjeljaka aplikacije.")
+    p.add_argument("db", help="baza s podacima (vidi python -m hk_bench.synth)")
+    p.add_argument("--out", default="hk_bench_report", help="putanja izvještaja bez nastavka (.json i .csv)")
+    p.add_argument("--baseline", help="JSON izvještaj prethodne verzije za usporedbu")
+    p.add_argument("--repeat", type=int, default=5, help="broj izvršavanja po slučaju")
+    p.add_argument("--only", help="samo slučajevi čije ime sadrži ovaj tekst")
+    p.add_argument("--no-ui", action="store_true", help="bez mjerenja stranica kroz AppTest")
+    p.add_argument("--tolerance", type=float, default=report.TOLERANCE)
+    args = p.parse_args(argv)
+    if not os.path.exists(args.db):
+        print(f"{args.db}: ne postoji", file=sys.stderr)
+        return 2
+
+    workdir = tempfile.mkdtemp(prefix="hk_bench_")
+    try:
+        path = os.path.join(workdir, "hk_podravka.db")
+        _copy(args.db, path)
+        conn = open_connection(path)
+        try:
+            migrate(conn)
+            counts, schema = table_counts(conn), schema_version(conn)
+            env = prepare(conn, workdir)
+            cases = run_cases(conn, env, args.repeat, args.only)
+        finally:
+            conn.close()
+        if not args.no_ui:
+            from hk_bench.ui import run_ui
+
+            cases += run_ui(workdir, env, args.repeat, args.only)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {"meta": report.meta(ROOT, os.path.abspath(args.db), counts, schema, args.repeat), "cases": cases}
+    print(report.format_table(cases))
+    for out in report.write(result, args.out):
+        print(f"→ {out}")
+    if args.baseline:
+        slower = report.compare(result, report.load(args.baseline), args.tolerance)
+        for r in slower:
+            print(f"SPORIJE: {r['case']}: {r['before_ms']:.1f} → {r['now_ms']:.1f} ms (×{r['ratio']})")
+        if slower:
+            return 1
+        print(f"nema regresija u odnosu na {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Mjerni slučajevi: iste funkcije i upiti koje pozivaju odjeljci aplikacije,
+bez Streamlita. Slučaj se registrira dekoratorom @case (kao migracije) i
+vraća broj obrađenih redaka; `reset` (ne mjeri se) vraća bazu u stanje
+prije slučaja kad slučaj dodaje retke.
+
+Parametri (godina, grupa, sportaš, protivnik …) biraju se iz same baze u
+prepare(), pa isti slučajevi rade na bazi bilo koje veličine.
+"""
+
+import io
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from hk_core import expiry, queries
+from hk_core.attendance import attendance_sheet, save_attendance
+from hk_core.exports import export_to_file
+from hk_core.importers import MEMBER_COLUMNS, RESULT_COLUMNS, import_members, import_results
+from hk_core.members import MemberFilter, count_members, members_page
+from hk_core.search import search
+from hk_core.segments import Segment, recipients
+
+IMPORT_RESULTS_ROWS = 1000
+
+
+@dataclass
+class Env:
+    workdir: str
+    year: int = 0
+    group: str = ""
+    day: str = ""
+    member_id: int = 0
+    opponent: str = ""
+    club: str = ""
+    members_xlsx: bytes = b""
+    results_xlsx: bytes = b""
+    sheet: Optional[pd.DataFrame] = None
+    marks: dict = field(default_factory=dict)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+
+@dataclass
+class Case:
+    name: str
+    section: str
+    fn: Callable[..., int]
+    reset: Optional[Callable] = None
+
+
+CASES: List[Case] = []
+
+
+def case(name: str, section: str, reset: Optional[Callable] = None):
+    """Dekorator koji registrira mjerni slučaj."""
+    def deco(fn):
+        CASES.append(Case(name, section, fn, reset))
+        return fn
+    return deco
+
+
+def _xlsx(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_excel(buf, index=False, engine="xlsxwriter")
+    return buf.getvalue()
+
+
+def prepare(conn, workdir: str) -> Env:
+    """Parametri slučajeva i ulazne Excel datoteke (ne mjeri se)."""
+    env = Env(workdir)
+    env.year = conn.execute("""SELECT COALESCE(MAX(c.year), 0) FROM competitions c
+                               WHERE EXISTS (SELECT 1 FROM results r WHERE r.competition_id = c.id)""").fetchone()[0]
+    env.group = (conn.execute("""SELECT group_name FROM members WHERE COALESCE(group_name, '') <> ''
+                                 GROUP BY group_name ORDER BY COUNT(*) DESC LIMIT 1""").fetchone() or ("",))[0]
+    # novi trening: prvo spremanje upisuje, ponovljena spremanja ažuriraju
+    env.day = date.today().isoformat()
+    env.member_id = (conn.execute("""SELECT member_id FROM results WHERE member_id IS NOT NULL
+                                     GROUP BY member_id ORDER BY COUNT(*) DESC LIMIT 1""").fetchone() or (0,))[0]
+    env.opponent, env.club = conn.execute(
+        """SELECT (SELECT opponent_name FROM bouts GROUP BY opponent_name ORDER BY COUNT(*) DESC LIMIT 1),
+                  (SELECT opponent_club FROM bouts GROUP BY opponent_club ORDER BY COUNT(*) DESC LIMIT 1)"""
+    ).fetchone()
+
+    # uvoz članova: cijela tablica u obliku predloška (upsert postojećih po OIB-u)
+    cols = ", ".join(f'{db} AS "{xl}"' for xl, db, _ in MEMBER_COLUMNS)
+    env.members_xlsx = _xlsx(pd.read_sql_query(f"SELECT {cols} FROM members ORDER BY id", conn))
+    # uvoz rezultata: postojeći rezultati ponovno, reset ih briše
+    cols = ", ".join(f'r.{db} AS "{xl}"' for xl, db, kind in RESULT_COLUMNS if kind != "details")
+    env.results_xlsx = _xlsx(pd.read_sql_query(
+        f"""SELECT r.competition_id, m.oib AS member_oib, {cols}
+            FROM results r JOIN members m ON m.id = r.member_id
+            ORDER BY r.id DESC LIMIT ?""", conn, params=(IMPORT_RESULTS_ROWS,)))
+    env.marks["results"] = conn.execute("SELECT COALESCE(MAX(id), 0) FROM results").fetchone()[0]
+
+    sheet = attendance_sheet(conn, env.group, env.day)
+    sheet["present"] = True
+    env.sheet = sheet
+    return env
+
+
+# ==========================
+# ČLANOVI
+# ==========================
+@case("members_page_first", "Članovi")
+def _members_page_first(conn, env: Env) -> int:
+    return len(members_page(conn, MemberFilter(), None, 50)[0])
+
+
+@case("members_page_filtered", "Članovi")
+def _members_page_filtered(conn, env: Env) -> int:
+    df, after = members_page(conn, MemberFilter(group=env.group, active=True), None, 50)
+    if after is not None:
+        df, _ = members_page(conn, MemberFilter(group=env.group, active=True), after, 50)
+    return len(df)
+
+
+@case("members_count", "Članovi")
+def _members_count(conn, env: Env) -> int:
+    return count_members(conn, MemberFilter(medical_within=30))
+
+
+@case("members_export_xlsx", "Članovi")
+def _members_export_xlsx(conn, env: Env) -> int:
+    return export_to_file(conn, "members", env.path("members.xlsx"), fmt="xlsx")
+
+
+@case("members_export_csv", "Članovi")
+def _members_export_csv(conn, env: Env) -> int:
+    return export_to_file(conn, "members", env.path("members.csv"), fmt="csv")
+
+
+@case("members_import_xlsx", "Članovi")
+def _members_import_xlsx(conn, env: Env) -> int:
+    report = import_members(conn, pd.read_excel(io.BytesIO(env.members_xlsx)))
+    return report.inserted + report.updated
+
+
+@case("expiry_refresh", "Članovi")
+def _expiry_refresh(conn, env: Env) -> int:
+    return expiry.refresh(conn)
+
+
+@case("expiring_soon", "Članovi")
+def _expiring_soon(conn, env: Env) -> int:
+    return len(expiry.expiring_soon(conn, 30))
+
+
+# ==========================
+# NATJECANJA I STATISTIKA
+# ==========================
+def _drop_imported_results(conn, env: Env):
+    conn.execute("DELETE FROM results WHERE id > ?", (env.marks["results"],))
+    conn.commit()
+
+
+@case("results_import_xlsx", "Natjecanja", reset=_drop_imported_results)
+def _results_import_xlsx(conn, env: Env) -> int:
+    return import_results(conn, pd.read_excel(io.BytesIO(env.results_xlsx))).inserted
+
+
+@case("competitions_export_xlsx", "Natjecanja")
+def _competitions_export_xlsx(conn, env: Env) -> int:
+    return export_to_file(conn, "competitions", env.path("competitions.xlsx"), fmt="xlsx")
+
+
+@case("stats_by_year_all", "Statistika")
+def _stats_by_year_all(conn, env: Env) -> int:
+    years = [r[0] for r in conn.execute("SELECT DISTINCT year FROM stats_rollup")]
+    return sum(len(pd.read_sql_query(queries.STATS_BY_YEAR, conn, params=(y,))) for y in years)
+
+
+@case("member_stats", "Statistika")
+def _member_stats(conn, env: Env) -> int:
+    conn.execute(queries.MEMBER_STATS_BY_YEAR, (env.member_id, env.year)).fetchone()
+    return len(pd.read_sql_query(queries.MEMBER_RESULTS_BY_YEAR, conn, params=(env.member_id, env.year)))
+
+
+@case("results_by_year", "Statistika")
+def _results_by_year(conn, env: Env) -> int:
+    return len(pd.read_sql_query(queries.RESULTS_BY_YEAR, conn, params=(env.year,)))
+
+
+@case("results_export_xlsx", "Statistika")
+def _results_export_xlsx(conn, env: Env) -> int:
+    return export_to_file(conn, "results_by_year", env.path("results.xlsx"), (env.year,), fmt="xlsx")
+
+
+@case("head_to_head", "Statistika")
+def _head_to_head(conn, env: Env) -> int:
+    return (len(pd.read_sql_query(queries.HEAD_TO_HEAD, conn, params=(env.opponent,))) +
+            len(pd.read_sql_query(queries.CLUB_VS_CLUB, conn, params=(env.club,))))
+
+
+# ==========================
+# PRISUSTVO, KOMUNIKACIJA, PRETRAGA
+# ==========================
+@case("attendance_sheet", "Prisustvo")
+def _attendance_sheet(conn, env: Env) -> int:
+    return len(attendance_sheet(conn, env.group, env.day))
+
+
+@case("attendance_save", "Prisustvo")
+def _attendance_save(conn, env: Env) -> int:
+    return save_attendance(conn, env.group, env.day, env.sheet)
+
+
+@case("segment_recipients", "Komunikacija")
+def _segment_recipients(conn, env: Env) -> int:
+    return (len(recipients(conn, Segment(age_cats=["U15"], audience="parent"))) +
+            len(recipients(conn, Segment(active=True))))
+
+
+@case("search", "Pretraga")
+def _search(conn, env: Env) -> int:
+    return len(search(conn, "horvat", limit=20)[0]) + len(search(conn, "kovač iv", limit=20)[0])
+
+
+# ==========================
+# MJERENJE
+# ==========================
+def timing(name: str, section: str, kind: str, times: List[float], rows: int) -> dict:
+    """Redak izvještaja: prvo izvršavanje posebno, ostala kao medijan/min/max (ms)."""
+    ms = [t * 1000 for t in times]
+    rest = ms[1:] or ms
+    return {"case": name, "section": section, "kind": kind, "rows": rows, "runs": len(ms),
+            "first_ms": round(ms[0], 2), "median_ms": round(statistics.median(rest), 2),
+            "min_ms": round(min(rest), 2), "max_ms": round(max(rest), 2)}
+
+
+def run_cases(conn, env: Env, repeat: int = 5, only: Optional[str] = None) -> List[dict]:
+    out = []
+    for c in CASES:
+        if only and only not in c.name:
+            continue
+        times, rows = [], 0
+        for _ in range(repeat):
+            t = time.perf_counter()
+            rows = c.fn(conn, env)
+            times.append(time.perf_counter() - t)
+            if c.reset:
+                c.reset(conn, env)
+        out.append(timing(c.name, c.section, "data", times, rows))
+    return out
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Izvještaj mjerenja: JSON (meta + slučajevi) i CSV (slučajevi), te usporedba
+s izvještajem prethodne verzije. Regresija je slučaj čiji je medijan sporiji
+od prethodnog za više od `tolerance` (udio) i više od `floor_ms` – ispod
+nekoliko milisekundi razlike su šum.
+"""
+
+import csv
+import json
+import platform
+import sqlite3
+import subprocess
+from datetime import datetime
+from typing import Dict, List
+
+COLUMNS = ["case", "section", "kind", "rows", "runs", "first_ms", "median_ms", "min_ms", "max_ms"]
+TOLERANCE = 0.25
+FLOOR_MS = 5.0
+
+
+def _git_revision(root: str) -> str:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=root, capture_output=True,
+                              text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def meta(root: str, db: str, counts: Dict[str, int], schema: int, repeat: int) -> dict:
+    import pandas as pd
+
+    try:
+        import streamlit
+        st_version = streamlit.__version__
+    except ImportError:
+        st_version = ""
+    return {"created": datetime.now().isoformat(timespec="seconds"), "revision": _git_revision(root),
+            "db": db, "schema_version": schema, "rows": counts, "repeat": repeat,
+            "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+            "pandas": pd.__version__, "streamlit": st_version, "platform": platform.platform()}
+
+
+def write(report: dict, base: str) -> List[str]:
+    """Piše `base`.json i `base`.csv; vraća putanje."""
+    paths = [base + ".json", base + ".csv"]
+    with open(paths[0], "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    with open(paths[1], "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+        w.writeheader()
+        w.writerows(report["cases"])
+    return paths
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current: dict, baseline: dict, tolerance: float = TOLERANCE, floor_ms: float = FLOOR_MS) -> List[dict]:
+    """Slučajevi sporiji nego u `baseline` (samo oni koji postoje u oba izvještaja)."""
+    before = {c["case"]: c for c in baseline.get("cases", [])}
+    out = []
+    for c in current["cases"]:
+        b = before.get(c["case"])
+        if b is None:
+            continue
+        diff = c["median_ms"] - b["median_ms"]
+        if diff > floor_ms and c["median_ms"] > b["median_ms"] * (1 + tolerance):
+            out.append({"case": c["case"], "before_ms": b["median_ms"], "now_ms": c["median_ms"],
+                        "ratio": round(c["median_ms"] / b["median_ms"], 2) if b["median_ms"] else None})
+    return out
+
+
+def format_table(cases: List[dict]) -> str:
+    lines = [f"{'slučaj':<28} {'odjeljak':<22} {'redaka':>8} {'prvi ms':>10} {'medijan ms':>11}"]
+    for c in cases:
+        lines.append(f"{c['case']:<28} {c['section']:<22} {c['rows']:>8} {c['first_ms']:>10.1f} {c['median_ms']:>11.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Mjerenje stranica kroz streamlit.testing (AppTest): prvo iscrtavanje
+aplikacije, otvaranje svake stranice i ponovljeni rerun, te nekoliko
+tipičnih radnji (promjena godine statistike, sljedeća stranica članova,
+spremanje prisustva). AppTest izvršava skriptu kao pravi poslužitelj,
+uključujući st.cache_resource, pa se mjeri isto što čeka korisnik.
+
+Aplikacija čita hk_podravka.db iz radnog direktorija, zato se mjeri iz
+direktorija s kopijom baze.
+"""
+
+import os
+import sys
+import time
+from typing import Callable, List, Optional
+
+from hk_bench.cases import Env, timing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "hk_podravka_full_app.py")
+TIMEOUT = 300
+
+
+def _page(file: str) -> str:
+    return f"hk_app/sections/{file}"
+
+
+def _scenarios(env: Env) -> List[tuple]:
+    """(ime, stranica, radnja nad AppTest-om)."""
+    def stats_year(at):
+        at.number_input(key="stat_year_v6").set_value(env.year)
+
+    def members_next(at):
+        at.button(key="members_grid_v6_next_btn").click()
+
+    def attendance_save(at):
+        at.selectbox(key="att_group_sel_v6").set_value(env.group).run()
+        next(b for b in at.button if b.label == "Spremi prisustvo").click()
+
+    return [("stats_year", "stats.py", stats_year),
+            ("members_next_page", "members.py", members_next),
+            ("attendance_save", "attendance.py", attendance_save)]
+
+
+def run_ui(workdir: str, env: Env, repeat: int = 5, only: Optional[str] = None) -> List[dict]:
+    from streamlit.testing.v1 import AppTest
+
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from hk_podravka_full_app import PAGES
+
+    out = []
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        at = AppTest.from_file(APP, default_timeout=TIMEOUT)
+
+        def measure(name: str, section: str, first: Callable):
+            if only and only not in name:
+                return
+            t = time.perf_counter()
+            first()
+            times = [time.perf_counter() - t]
+            _check(at, name)
+            for _ in range(repeat - 1):
+                t = time.perf_counter()
+                at.run()
+                times.append(time.perf_counter() - t)
+            out.append(timing(name, section, "ui", times, 0))
+
+        measure("ui_app_start", "Klub", at.run)
+        for file, title, _ in PAGES:
+            measure(f"ui_page_{file[:-3]}", title, lambda: at.switch_page(_page(file)).run())
+        titles = {f: t for f, t, _ in PAGES}
+        for name, file, action in _scenarios(env):
+            if only and only not in f"ui_{name}":
+                continue
+            at.switch_page(_page(file)).run()
+            measure(f"ui_{name}", titles[file], lambda: (action(at), at.run()))
+    finally:
+        os.chdir(cwd)
+    return out
+
+
+def _check(at, name: str):
+    if at.exception:
+        raise RuntimeError(f"{name}: {at.exception[0].value}")
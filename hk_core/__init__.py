@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""
+HK Podravka – zajednički podatkovni sloj (bez ovisnosti o Streamlitu).
+
+Moduli u ovom paketu koriste Streamlit aplikacije (hk_podravka_*.py),
+ali se mogu koristiti i samostalno (skripte, konzola).
+"""
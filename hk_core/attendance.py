@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Evidencija dolazaka sportaša za jedan trening (grupa + datum).
+
+Cijela lista grupe sprema se odjednom: jedan executemany u jednoj transakciji.
+Redak je jedinstven po (member_id, date, group_name) (migracija 5), pa
+ponovljeno spremanje istog treninga ažurira postojeće retke umjesto da
+dodaje nove.
+"""
+
+import pandas as pd
+
+from hk_core import queries
+
+UPSERT_ATTENDANCE = """
+    INSERT INTO attendance_members(member_id, date, group_name, present, minutes, note)
+    VALUES(?,?,?,?,?,?)
+    ON CONFLICT(member_id, date, group_name) DO UPDATE SET
+        present=excluded.present, minutes=excluded.minutes, note=excluded.note
+"""
+
+UPSERT_CAMP = """
+    INSERT INTO attendance_members(member_id, date, group_name, present, minutes, note, camp_flag, camp_where, camp_coach)
+    VALUES(?,?,'',1,?,?,1,?,?)
+    ON CONFLICT(member_id, date, group_name) DO UPDATE SET
+        minutes=excluded.minutes, note=excluded.note, camp_where=excluded.camp_where, camp_coach=excluded.camp_coach
+"""
+
+
+def attendance_sheet(conn, group: str, day: str) -> pd.DataFrame:
+    """Članovi grupe s već upisanim dolaskom za `day` (ili zadanim vrijednostima)."""
+    df = pd.read_sql_query(queries.ATTENDANCE_SHEET, conn, params=(day, group, group))
+    df["present"] = df["present"].astype(bool)
+    return df
+
+
+def save_attendance(conn, group: str, day: str, sheet: pd.DataFrame) -> int:
+    """Upisuje/ažurira cijelu listu u jednoj transakciji; vraća broj redaka."""
+    minutes = pd.to_numeric(sheet["minutes"], errors="coerce").fillna(0).astype(int)
+    rows = list(zip(sheet["id"].astype(int).tolist(), [day] * len(sheet), [group] * len(sheet),
+                    sheet["present"].fillna(False).astype(int).tolist(), minutes.tolist(),
+                    sheet["note"].fillna("").astype(str).tolist()))
+    if not rows:
+        return 0
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(UPSERT_ATTENDANCE, rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(rows)
+
+
+def save_camp(conn, member_id: int, day: str, minutes: int, trainings: int, where: str, coach: str):
+    conn.execute(UPSERT_CAMP, (member_id, day, int(minutes), f"Pripreme – {trainings} treninga", where, coach))
+    conn.commit()
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Bazen (pool) SQLite konekcija.
+
+Umjesto otvaranja nove konekcije pri svakom iscrtavanju odjeljka, aplikacija
+drži jedan ConnectionPool po procesu (st.cache_resource) i posuđuje konekcije
+kroz context manager:
+
+    with pool.connection() as conn:
+        conn.execute(...)
+
+PRAGMA postavke (foreign_keys, WAL, busy_timeout) izvršavaju se samo jednom,
+kad se konekcija stvori. Greške "database is locked" ponavljaju se s
+eksponencijalnim čekanjem, a broj ponavljanja vidi se u pool.stats().
+Dok je profiliranje uključeno (hk_core.profiling), konekcije vraćaju
+kursore koji bilježe svaki upit.
+
+Bazen vodi i brojač generacija po tablici: svaki commit koji je mijenjao
+tablicu (INSERT/UPDATE/DELETE) povećava njezinu generaciju. Priručne
+memorije (hk_core.lookups) po tome znaju kad su im podaci zastarjeli.
+Upise iz drugih procesa (hk-admin, stare v6.3 aplikacije) ti brojači ne
+vide; za njih služi external_generation(), koja raste kad se datoteka baze
+ili njezin -wal promijene, a promjenu nije napravio commit iz ovog bazena.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from hk_core.profiling import PROFILER, ProfiledCursor
+
+BUSY_TIMEOUT_MS = 5000
+LOCK_RETRIES = 5
+LOCK_RETRY_DELAY = 0.05
+
+_WRITE_RE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"\[`]?(\w+)",
+    re.IGNORECASE)
+
+
+class PoolTimeout(RuntimeError):
+    """Nijedna konekcija nije se oslobodila unutar zadanog vremena."""
+
+
+def _is_locked(exc: Exception) -> bool:
+    msg = str(exc).lower()
+    return "locked" in msg or "busy" in msg
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection koja ponavlja execute/commit kad je baza zaključana."""
+
+    pool: Optional["ConnectionPool"] = None
+
+    def _track(self, sql: str):
+        # tablice mijenjane u tekućoj transakciji – generacija raste tek na commit
+        m = _WRITE_RE.match(sql)
+        if m:
+            self.__dict__.setdefault("_dirty", set()).add(m.group(1).lower())
+
+    def _retry(self, fn, *args):
+        delay = LOCK_RETRY_DELAY
+        for attempt in range(LOCK_RETRIES + 1):
+            try:
+                return fn(*args)
+            except sqlite3.OperationalError as e:
+                if not _is_locked(e) or attempt == LOCK_RETRIES:
+                    raise
+                if self.pool is not None:
+                    self.pool._count("lock_retries")
+                time.sleep(delay)
+                delay *= 2
+
+    def cursor(self, factory=None):
+        # pd.read_sql_query ide preko cursor(), ne execute()
+        if factory is None and PROFILER.enabled:
+            factory = ProfiledCursor
+        return super().cursor(factory) if factory is not None else super().cursor()
+
+    def execute(self, sql, params=()):
+        if PROFILER.enabled:
+            cur = self.cursor()
+            self._retry(cur.execute, sql, params)
+        else:
+            cur = self._retry(super().execute, sql, params)
+        self._track(sql)
+        return cur
+
+    def executemany(self, sql, seq_of_params):
+        # generator se može potrošiti samo jednom – za ponavljanje treba lista
+        if not isinstance(seq_of_params, (list, tuple)):
+            seq_of_params = list(seq_of_params)
+        if PROFILER.enabled:
+            cur = self.cursor()
+            self._retry(cur.executemany, sql, seq_of_params)
+        else:
+            cur = self._retry(super().executemany, sql, seq_of_params)
+        self._track(sql)
+        return cur
+
+    def commit(self):
+        self._retry(super().commit)
+        dirty = self.__dict__.pop("_dirty", None)
+        if dirty and self.pool is not None:
+            self.pool.bump(*dirty)
+            self.pool._own_write()
+
+    def rollback(self):
+        super().rollback()
+        self.__dict__.pop("_dirty", None)
+
+
+def open_connection(path: str, busy_timeout_ms: int = BUSY_TIMEOUT_MS) -> PooledConnection:
+    """Otvara konekciju i jednokratno postavlja PRAGMA postavke."""
+    conn = sqlite3.connect(path, check_same_thread=False, factory=PooledConnection,
+                           timeout=busy_timeout_ms / 1000.0)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+class ConnectionPool:
+    """Ograničeni, thread-safe bazen konekcija prema jednoj SQLite datoteci."""
+
+    def __init__(self, path: str, max_size: int = 5, timeout: float = 10.0,
+                 busy_timeout_ms: int = BUSY_TIMEOUT_MS):
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self._idle: List[PooledConnection] = []
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {"hits": 0, "misses": 0, "waits": 0, "lock_retries": 0}
+        self._generations: Dict[str, int] = {}
+        self._stamp: Optional[tuple] = None
+        self._external = 0
+
+    def _count(self, key: str, n: int = 1):
+        with self._cond:
+            self._stats[key] += n
+
+    def _new_connection(self) -> PooledConnection:
+        conn = open_connection(self.path, self.busy_timeout_ms)
+        conn.pool = self
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ConnectionPool je zatvoren")
+            if self._idle:
+                self._stats["hits"] += 1
+                return self._idle.pop()
+            if self._created >= self.max_size:
+                self._stats["waits"] += 1
+                deadline = time.monotonic() + self.timeout
+                while not self._idle:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(f"Nema slobodne konekcije nakon {self.timeout:.0f} s "
+                                          f"(bazen: {self.max_size})")
+                    self._cond.wait(remaining)
+                return self._idle.pop()
+            self._created += 1
+            self._stats["misses"] += 1
+        try:
+            return self._new_connection()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn: PooledConnection):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # pokvarena konekcija – odbaci je i oslobodi mjesto u bazenu
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            if self._closed:
+                self._created -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def bump(self, *tables: str):
+        """Označava tablice promijenjenima (i za upise izvan bazena)."""
+        with self._cond:
+            for t in tables:
+                t = t.lower()
+                self._generations[t] = self._generations.get(t, 0) + 1
+
+    def generation(self, table: str) -> int:
+        return self._generations.get(table.lower(), 0)
+
+    def _file_stamp(self) -> tuple:
+        out = []
+        for p in (self.path, self.path + "-wal"):
+            try:
+                st = os.stat(p)
+                out.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                out.append(None)
+        return tuple(out)
+
+    def _own_write(self):
+        # stanje datoteka nakon vlastitog commita – to nije vanjska promjena
+        stamp = self._file_stamp()
+        with self._cond:
+            self._stamp = stamp
+
+    def external_generation(self) -> int:
+        """Raste kad je bazu mijenjao netko izvan ovog bazena (drugi proces)."""
+        stamp = self._file_stamp()
+        with self._cond:
+            if self._stamp is not None and stamp != self._stamp:
+                self._external += 1
+            self._stamp = stamp
+            return self._external
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            s = dict(self._stats)
+            s["open"] = self._created
+            s["idle"] = len(self._idle)
+            s["in_use"] = self._created - len(self._idle)
+            return s
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().close()
+                self._created -= 1
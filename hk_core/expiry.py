@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Istek dokumenata članova: liječnička potvrda, osobna iskaznica, putovnica.
+
+Svaki datum ima pokrivajući indeks (datum, grupa) iz migracije 11, pa je
+upit "sve što istječe između A i B" tri pretrage raspona po indeksu, bez
+čitanja cijele tablice members. Tablicu expiring_documents (sve što je
+isteklo u zadnjih `lookback_days` ili istječe u idućih `horizon_days`
+dana) puni refresh(); ExpiryRefresher je poziva iz pozadinske dretve
+jednom dnevno i nakon svakog upisa u members, pa je pregled na ekranu
+čitanje gotove tablice.
+
+    python -m hk_core.expiry hk_podravka.db
+"""
+
+import sys
+import threading
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas   # uvozi se tek u expiring_soon – izvozi i hk_admin rade bez pandasa
+
+HORIZON_DAYS = 90
+LOOKBACK_DAYS = 365
+
+# oznaka -> (naziv, stupac u members)
+DOCS: Dict[str, Tuple[str, str]] = {
+    "medical": ("Liječnička potvrda", "medical_valid_until"),
+    "id_card": ("Osobna iskaznica", "id_card_valid_until"),
+    "passport": ("Putovnica", "passport_valid_until"),
+}
+
+# prozor w(start, stop, grp) dolazi iz CTE-a pozivatelja; grp NULL = sve grupe
+_WINDOW = "\n    UNION ALL\n".join(
+    f"""    SELECT '{doc}' AS doc, '{label}' AS document, m.id AS member_id, m.{column} AS valid_until,
+           COALESCE(m.group_name, '') AS group_name
+    FROM w JOIN members m ON m.{column} BETWEEN w.start AND w.stop
+    WHERE w.grp IS NULL OR m.group_name = w.grp"""
+    for doc, (label, column) in DOCS.items())
+
+_DAYS_LEFT = "CAST(julianday(d.valid_until) - julianday(date('now', 'localtime')) AS INTEGER)"
+
+EXPIRING_WINDOW = f"WITH w(start, stop, grp) AS (SELECT ?, ?, ?)\n{_WINDOW}"
+
+_EXPORT_SELECT = f"""
+    SELECT m.last_name AS prezime, m.first_name AS ime, d.group_name AS grupa, d.document AS dokument,
+           d.valid_until AS vrijedi_do, {_DAYS_LEFT} AS dana_do_isteka,
+           m.athlete_email AS email_sportasa, m.parent_email AS email_roditelja
+    FROM d JOIN members m ON m.id = d.member_id
+    ORDER BY d.valid_until, m.last_name, m.first_name
+"""
+
+# parametri: (od, do, grupa ili None)
+EXPIRING_EXPORT = f"WITH w(start, stop, grp) AS (SELECT ?, ?, ?), d AS (\n{_WINDOW}\n){_EXPORT_SELECT}"
+
+# parametri: (od, id natjecanja) – sve što ne vrijedi do zadnjeg dana natjecanja
+EXPIRING_FOR_COMPETITION = f"""WITH w(start, stop, grp) AS (
+        SELECT ?, COALESCE(NULLIF(date_to, ''), date_from), NULL FROM competitions WHERE id = ?),
+    d AS (
+{_WINDOW}
+){_EXPORT_SELECT}"""
+
+EXPIRING_SOON = f"""
+    SELECT d.doc, d.valid_until, {_DAYS_LEFT} AS dana, d.group_name AS grupa,
+           m.first_name || ' ' || m.last_name AS clan, d.member_id
+    FROM expiring_documents d CROSS JOIN members m    -- CROSS JOIN: planer uvijek kreće od gotove tablice
+    WHERE m.id = d.member_id AND d.valid_until <= ? AND (? IS NULL OR d.group_name = ?)
+    ORDER BY d.valid_until, m.last_name, m.first_name
+"""
+
+EXPIRING_SUMMARY = """
+    SELECT group_name AS grupa, doc,
+           SUM(valid_until < date('now', 'localtime')) AS isteklo,
+           SUM(valid_until >= date('now', 'localtime')) AS istjece
+    FROM expiring_documents
+    GROUP BY group_name, doc ORDER BY group_name, doc
+"""
+
+
+def refresh(conn, today: Optional[str] = None, horizon_days: int = HORIZON_DAYS,
+            lookback_days: int = LOOKBACK_DAYS) -> int:
+    """Ponovno puni expiring_documents u jednoj transakciji; vraća broj redaka."""
+    day = date.fromisoformat(today) if today else date.today()
+    start = (day - timedelta(days=lookback_days)).isoformat()
+    stop = (day + timedelta(days=horizon_days)).isoformat()
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM expiring_documents")
+        conn.execute(f"""INSERT INTO expiring_documents(doc, member_id, valid_until, group_name)
+                         SELECT doc, member_id, valid_until, group_name FROM ({EXPIRING_WINDOW})""",
+                     (start, stop, None))
+        n = conn.execute("SELECT COUNT(*) FROM expiring_documents").fetchone()[0]
+        conn.execute("""INSERT INTO expiry_refresh(id, day, refreshed_at, horizon_days, rows) VALUES(1,?,?,?,?)
+                        ON CONFLICT(id) DO UPDATE SET day=excluded.day, refreshed_at=excluded.refreshed_at,
+                            horizon_days=excluded.horizon_days, rows=excluded.rows""",
+                     (day.isoformat(), datetime.now().isoformat(timespec="seconds"), horizon_days, n))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return n
+
+
+def expiring_soon(conn, within_days: int = 30, group: Optional[str] = None) -> "pandas.DataFrame":
+    """Dokumenti iz gotove tablice koji su istekli ili istječu u idućih `within_days` dana."""
+    import pandas as pd
+
+    stop = (date.today() + timedelta(days=within_days)).isoformat()
+    df = pd.read_sql_query(EXPIRING_SOON, conn, params=(stop, group, group))
+    df.insert(0, "dokument", df.pop("doc").map(lambda d: DOCS[d][0]))
+    return df
+
+
+def last_refresh(conn) -> Optional[dict]:
+    row = conn.execute("SELECT day, refreshed_at, horizon_days, rows FROM expiry_refresh WHERE id=1").fetchone()
+    return dict(zip(("day", "refreshed_at", "horizon_days", "rows"), row)) if row else None
+
+
+class ExpiryRefresher:
+    """
+    Pozadinska dretva koja osvježava expiring_documents kad se promijeni dan
+    ili generacija tablice members u bazenu. Upisi iz drugih procesa vide se
+    najkasnije idući dan (ili na wake(force=True)).
+
+    Stranice same ne osvježavaju – wake() samo budi dretvu, pa iscrtavanje
+    nikad ne čeka na zaključavanje baze. Uz `writer` (hk_core.writer) upis
+    ide kroz pisača kao i svi ostali upisi.
+    """
+
+    def __init__(self, pool, writer=None, horizon_days: int = HORIZON_DAYS, interval: float = 60.0):
+        self.pool = pool
+        self.writer = writer
+        self.horizon_days = horizon_days
+        self.interval = interval
+        self.last_error: Optional[str] = None
+        self._seen: Optional[tuple] = None
+        self._force = False
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ExpiryRefresher":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="hk-expiry-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self, force: bool = False):
+        """Budi dretvu: provjeri dan i generaciju members (uz force osvježi svakako)."""
+        if force:
+            self._force = True
+        self._wake.set()
+
+    @property
+    def pending(self) -> bool:
+        """Osvježavanje je zatraženo ili je u tijeku."""
+        return self._wake.is_set() or self._lock.locked()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # buđenje za vrijeme tick() ne propada – dretva odmah ide u još jedan krug
+            self._wake.clear()
+            force, self._force = self._force, False
+            self.tick(force)
+            self._wake.wait(self.interval)
+
+    def tick(self, force: bool = False) -> bool:
+        """Osvježava ako je potrebno; vraća True ako je osvježeno."""
+        with self._lock:
+            # generacija se čita prije upita – upis između dva koraka izaziva još jedno osvježavanje
+            state = (date.today().isoformat(), self.pool.generation("members"))
+            if state == self._seen and not force:
+                return False
+            try:
+                if self.writer is not None:
+                    self.writer.call(refresh, state[0], self.horizon_days).result()
+                else:
+                    with self.pool.connection() as conn:
+                        refresh(conn, state[0], self.horizon_days)
+                self._seen, self.last_error = state, None
+                return True
+            except Exception as e:
+                # dretva mora preživjeti npr. zaključanu bazu – pokušava opet za `interval`
+                self.last_error = str(e)
+                return False
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    from hk_core.db import open_connection
+    from hk_core.migrations import migrate
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "hk_podravka.db"
+    c = open_connection(path)
+    try:
+        migrate(c)
+        print(f"{path}: expiring_documents {refresh(c)} redaka")
+        print(pd.read_sql_query(EXPIRING_SUMMARY, c).to_string(index=False))
+    finally:
+        c.close()
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Izvoz tablica u Excel / CSV / Parquet bez učitavanja cijele tablice u memoriju.
+
+Redci se čitaju iz SQLite kursora u komadima (fetchmany) i odmah pišu u
+privremenu datoteku; Excel koristi xlsxwriter u constant_memory načinu
+(svaki redak se zapisuje na disk čim je gotov). Datoteka se stvara tek kad
+je korisnik zatraži – st.download_button prima funkciju umjesto bajtova –
+a ExportCache je čuva dok se izvorne tablice ne promijene (generacije iz
+ConnectionPool, a za upise iz drugih procesa external_generation()), pa
+ponovljeni klik ne generira isti izvoz iznova.
+Pozadinski poslovi (hk_core.jobs) predaju `progress(zapisano, ukupno)` koji
+se zove nakon svakog komada i smije dići iznimku (otkazivanje).
+"""
+
+import csv
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import xlsxwriter
+
+from hk_core import expiry, queries
+from hk_core.profiling import timed
+
+CHUNK_ROWS = 2000
+
+MEMBERS_EXPORT = """
+    SELECT first_name AS ime, last_name AS prezime, dob AS datum_rodenja, gender AS spol, oib,
+           street AS ulica_i_broj, city AS grad, postal_code AS postanski_broj,
+           athlete_email AS email_sportasa, parent_email AS email_roditelja,
+           id_card_number AS br_osobne, id_card_valid_until AS osobna_vrijedi_do, id_card_issuer AS osobna_izdavatelj,
+           passport_number AS br_putovnice, passport_valid_until AS putovnica_vrijedi_do, passport_issuer AS putovnica_izdavatelj,
+           active_competitor AS aktivni_natjecatelj, veteran, other_flag AS ostalo,
+           pays_fee AS placa_clanarinu, fee_amount AS iznos_clanarine, group_name AS grupa
+    FROM members ORDER BY last_name, first_name
+"""
+
+COMPETITIONS_EXPORT = """
+    SELECT id, kind, kind_other, name, date_from, date_to, place, style, age_cat, country, country_iso3,
+           team_rank, club_competitors, total_competitors, clubs_count, countries_count,
+           notes, bulletin_url, website_link
+    FROM competitions ORDER BY date_from DESC
+"""
+
+# ime -> (sql, tablice o kojima ovisi, naziv lista)
+EXPORTS: Dict[str, Tuple[str, Tuple[str, ...], str]] = {
+    "members": (MEMBERS_EXPORT, ("members",), "Clanovi"),
+    "competitions": (COMPETITIONS_EXPORT, ("competitions",), "Natjecanja"),
+    "results_by_year": (queries.RESULTS_BY_YEAR, ("results", "competitions", "members"), "Rezultati"),
+    # parametri počinju današnjim datumom, pa se izvoz ne prenosi u idući dan
+    "expiring_by_group": (expiry.EXPIRING_EXPORT, ("members",), "Istek dokumenata"),
+    "expiring_for_competition": (expiry.EXPIRING_FOR_COMPETITION, ("members", "competitions"), "Istek dokumenata"),
+}
+
+# format -> (nastavak, MIME)
+FORMATS: Dict[str, Tuple[str, str]] = {
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("csv", "text/csv"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+Progress = Optional[Callable[[int, Optional[int]], None]]
+
+
+def _chunks(cursor, size: int, progress: Progress = None, total: Optional[int] = None):
+    n = 0
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
+        n += len(rows)
+        if progress is not None:
+            progress(n, total)
+
+
+def write_xlsx(cursor, path: str, sheet_name: str = "Sheet1", chunk_size: int = CHUNK_ROWS,
+               progress: Progress = None, total: Optional[int] = None) -> int:
+    wb = xlsxwriter.Workbook(path, {"constant_memory": True, "tmpdir": os.path.dirname(path)})
+    try:
+        ws = wb.add_worksheet(sheet_name[:31])
+        bold = wb.add_format({"bold": True})
+        ws.write_row(0, 0, [d[0] for d in cursor.description], bold)
+        n = 0
+        for rows in _chunks(cursor, chunk_size, progress, total):
+            for row in rows:
+                n += 1
+                ws.write_row(n, 0, row)
+    finally:
+        wb.close()
+    return n
+
+
+def write_csv(cursor, path: str, sheet_name: str = "", chunk_size: int = CHUNK_ROWS,
+              progress: Progress = None, total: Optional[int] = None) -> int:
+    # utf-8-sig: Excel ispravno prikazuje č/ć/š/ž kad otvori CSV
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        w = csv.writer(f, delimiter=";")
+        w.writerow([d[0] for d in cursor.description])
+        for rows in _chunks(cursor, chunk_size, progress, total):
+            w.writerows(rows)
+            n += len(rows)
+    return n
+
+
+def write_parquet(cursor, path: str, sheet_name: str = "", chunk_size: int = CHUNK_ROWS,
+                  progress: Progress = None, total: Optional[int] = None) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet izvoz traži paket pyarrow (pip install pyarrow)")
+    names = [d[0] for d in cursor.description]
+    writer, schema, n = None, None, 0
+    try:
+        for rows in _chunks(cursor, chunk_size, progress, total):
+            table = pa.Table.from_pylist([dict(zip(names, r)) for r in rows])
+            if schema is None:
+                # stupac bez ijedne vrijednosti u prvom komadu tretira se kao tekst
+                schema = pa.schema([pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                                    for f in table.schema])
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(table.cast(schema))
+            n += len(rows)
+        if writer is None:
+            pq.write_table(pa.table({c: pa.array([], pa.string()) for c in names}), path)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n
+
+
+WRITERS: Dict[str, Callable[..., int]] = {"xlsx": write_xlsx, "csv": write_csv, "parquet": write_parquet}
+
+
+@timed(kind="export")
+def export_to_file(conn, name: str, path: str, params: tuple = (), fmt: str = "xlsx",
+                   progress: Progress = None) -> int:
+    """Piše izvoz `name` u `path`; vraća broj redaka."""
+    sql, _, sheet = EXPORTS[name]
+    total = None
+    if progress is not None:
+        # ukupan broj redaka samo kad ga netko prati – inače je to suvišan upit
+        total = conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+        progress(0, total)
+    return WRITERS[fmt](conn.execute(sql, params), path, sheet, progress=progress, total=total)
+
+
+def export_bytes(conn, name: str, params: tuple = (), fmt: str = "xlsx") -> bytes:
+    """Izvoz bez priručne memorije (za aplikacije bez bazena konekcija)."""
+    tmp = tempfile.mkdtemp(prefix="hk_export_")
+    try:
+        path = os.path.join(tmp, f"{name}.{FORMATS[fmt][0]}")
+        export_to_file(conn, name, path, params, fmt)
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+class ExportCache:
+    """Gotovi izvozi na disku, po (ime, parametri, format) i generaciji izvornih tablica."""
+
+    def __init__(self, pool, directory: str = None):
+        self.pool = pool
+        self.directory = directory or tempfile.mkdtemp(prefix="hk_exports_")
+        os.makedirs(self.directory, exist_ok=True)
+        self._files: Dict[tuple, Tuple[tuple, str]] = {}
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _generation(self, name: str) -> tuple:
+        # upis iz drugog procesa (npr. noćni hk-admin import-members) poništava sve izvoze
+        return tuple(self.pool.generation(t) for t in EXPORTS[name][1]) + (self.pool.external_generation(),)
+
+    def cached(self, name: str, params: tuple = (), fmt: str = "xlsx") -> Optional[str]:
+        """Putanja gotovog i još važećeg izvoza ili None – ne generira ništa."""
+        cached = self._files.get((name, tuple(params), fmt))
+        if cached and cached[0] == self._generation(name) and os.path.exists(cached[1]):
+            return cached[1]
+        return None
+
+    def path(self, name: str, params: tuple = (), fmt: str = "xlsx", progress: Progress = None) -> str:
+        key = (name, tuple(params), fmt)
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        # isti izvoz generira samo jedna dretva; ostale čekaju njezin rezultat
+        with key_lock:
+            gen = self._generation(name)
+            cached = self._files.get(key)
+            if cached and cached[0] == gen and os.path.exists(cached[1]):
+                return cached[1]
+            digest = hashlib.sha1(repr((key, gen)).encode("utf-8")).hexdigest()[:16]
+            path = os.path.join(self.directory, f"{name}_{digest}.{FORMATS[fmt][0]}")
+            tmp = path + ".part"
+            try:
+                with self.pool.connection() as conn:
+                    export_to_file(conn, name, tmp, params, fmt, progress)
+            except BaseException:
+                # otkazan ili neuspio izvoz ne ostavlja poluzapisanu datoteku
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+            os.replace(tmp, path)
+            if cached and cached[1] != path:
+                try:
+                    os.remove(cached[1])
+                except OSError:
+                    pass
+            self._files[key] = (gen, path)
+            return path
+
+    def data(self, name: str, params: tuple = (), fmt: str = "xlsx") -> Callable[[], bytes]:
+        """Funkcija za st.download_button(data=...) – izvoz nastaje tek na klik."""
+        def build() -> bytes:
+            with open(self.path(name, params, fmt), "rb") as f:
+                return f.read()
+        return build
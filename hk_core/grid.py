@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Spremanje izmjena iz tablice (st.data_editor) samo za promijenjene retke i
+stupce, uz optimističko zaključavanje preko stupca row_version.
+
+st.data_editor u st.session_state[key] drži stanje izmjena:
+    {"edited_rows": {pozicija: {stupac: vrijednost}},
+     "added_rows": [{stupac: vrijednost}], "deleted_rows": [pozicija]}
+Pozicije se odnose na DataFrame koji je bio prikazan (snapshot), pa se iz
+njega čitaju id i row_version retka. Ako je redak u međuvremenu promijenio
+netko drugi, row_version se ne poklapa i redak se prijavljuje kao sukob
+umjesto da se tuđa izmjena prepiše.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+
+def _blank(v) -> bool:
+    return v is None or (isinstance(v, float) and pd.isna(v)) or v is pd.NaT
+
+
+def as_text(v) -> str:
+    return "" if _blank(v) else str(v).strip()
+
+
+def as_date(v) -> Optional[str]:
+    return None if _blank(v) or str(v).strip() == "" else str(v)[:10]
+
+
+def as_int(v) -> int:
+    return 0 if _blank(v) or v == "" else int(v)
+
+
+def as_float(v) -> float:
+    return 0.0 if _blank(v) or v == "" else float(v)
+
+
+# stupci koje je dopušteno mijenjati iz tablice -> pretvorba vrijednosti
+MEMBER_GRID_COLUMNS: Dict[str, Callable[[Any], Any]] = {
+    "first_name": as_text, "last_name": as_text, "gender": as_text, "dob": as_date,
+    "street": as_text, "city": as_text, "postal_code": as_text,
+    "athlete_email": as_text, "parent_email": as_text,
+    "active_competitor": as_int, "veteran": as_int, "other_flag": as_int,
+    "pays_fee": as_int, "fee_amount": as_float, "group_name": as_text,
+    "medical_valid_until": as_date,
+}
+
+COACH_GRID_COLUMNS: Dict[str, Callable[[Any], Any]] = {
+    "first_name": as_text, "last_name": as_text, "dob": as_date, "oib": as_text,
+    "email": as_text, "iban": as_text, "group_name": as_text,
+}
+
+
+@dataclass
+class SaveReport:
+    updated: int = 0
+    inserted: int = 0
+    deleted: int = 0
+    conflicts: List[int] = field(default_factory=list)   # id-evi redaka koje je netko drugi mijenjao
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> int:
+        return self.updated + self.inserted + self.deleted
+
+
+def has_changes(state: Optional[dict]) -> bool:
+    return bool(state) and any(state.get(k) for k in ("edited_rows", "added_rows", "deleted_rows"))
+
+
+def frame_changes(loaded: pd.DataFrame, edited: pd.DataFrame, columns, key: str = "id") -> dict:
+    """
+    Rezervni put kad stanje editora nije dostupno: usporedba po hashu retka.
+    Vraća isti oblik kao st.data_editor ("edited_rows", "added_rows", "deleted_rows").
+    """
+    cols = [c for c in columns if c in loaded.columns and c in edited.columns]
+    old = loaded.set_index(key)[cols]
+    new = edited[edited[key].notna()].set_index(key)[cols]
+    old_h = pd.util.hash_pandas_object(old.astype(str), index=False)
+    new_h = pd.util.hash_pandas_object(new.astype(str), index=False)
+    old_h.index, new_h.index = old.index, new.index
+    pos = {k: i for i, k in enumerate(loaded[key])}
+    edited_rows = {}
+    for k in new_h.index.intersection(old_h.index):
+        if new_h[k] != old_h[k]:
+            diff = old.loc[k].astype(str) != new.loc[k].astype(str)
+            edited_rows[pos[k]] = {c: new.at[k, c] for c in diff[diff].index}
+    return {
+        "edited_rows": edited_rows,
+        "added_rows": edited[edited[key].isna()][cols].to_dict("records"),
+        "deleted_rows": [pos[k] for k in old_h.index.difference(new_h.index)],
+    }
+
+
+def save_grid_changes(conn, table: str, loaded: pd.DataFrame, changes: dict,
+                      columns: Dict[str, Callable[[Any], Any]],
+                      key: str = "id", version: str = "row_version") -> SaveReport:
+    """Upisuje samo promijenjene retke/stupce u jednoj transakciji."""
+    report = SaveReport()
+    if not has_changes(changes):
+        return report
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for pos, row_changes in (changes.get("edited_rows") or {}).items():
+            vals = {c: columns[c](v) for c, v in row_changes.items() if c in columns}
+            if not vals:
+                continue
+            row = loaded.iloc[int(pos)]
+            sets = ", ".join(f"{c}=?" for c in vals)
+            cur = conn.execute(f"UPDATE {table} SET {sets} WHERE {key}=? AND {version}=?",
+                               (*vals.values(), int(row[key]), int(row[version])))
+            if cur.rowcount:
+                report.updated += 1
+            else:
+                report.conflicts.append(int(row[key]))
+
+        for new_row in changes.get("added_rows") or []:
+            vals = {c: columns[c](v) for c, v in new_row.items() if c in columns}
+            if not any(v not in ("", None, 0, 0.0) for v in vals.values()):
+                continue
+            try:
+                conn.execute(f"INSERT INTO {table}({','.join(vals)}) VALUES({','.join('?' * len(vals))})",
+                             tuple(vals.values()))
+                report.inserted += 1
+            except Exception as e:
+                report.errors.append(f"Novi redak nije dodan: {e}")
+
+        for pos in changes.get("deleted_rows") or []:
+            row = loaded.iloc[int(pos)]
+            cur = conn.execute(f"DELETE FROM {table} WHERE {key}=? AND {version}=?",
+                               (int(row[key]), int(row[version])))
+            if cur.rowcount:
+                report.deleted += 1
+            else:
+                report.conflicts.append(int(row[key]))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return report
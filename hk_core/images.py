@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Umanjene slike (thumbnail i web veličina) za fotografije članova/trenera i
+galerije natjecanja.
+
+Izvedenice se spremaju na disk pod hashom izvornika:
+
+    uploads/derived/thumb/ab/ab12...ef.jpg
+    uploads/derived/web/ab/ab12...ef.jpg
+
+pa se isti izvornik obrađuje samo jednom. Orijentacija iz EXIF-a se
+primijeni, a sami EXIF podaci (GPS, uređaj...) ne prenose se u izvedenicu.
+Obrada se radi u zasebnim procesima (ProcessPoolExecutor): submit() odmah
+nakon uploada ne blokira skriptu, a ensure() pri prikazu dovrši samo ono
+što još nedostaje.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from PIL import Image, ImageOps
+
+from hk_core.storage import FileStore
+
+SIZES: Dict[str, int] = {"thumb": 320, "web": 1600}
+JPEG_QUALITY = 85
+
+
+def make_derivative(src: str, dst: str, max_px: int) -> str:
+    """Umanjuje `src` na najviše max_px po duljoj stranici i sprema JPEG bez EXIF-a."""
+    if os.path.exists(dst):
+        return dst
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    with Image.open(src) as im:
+        im.draft("RGB", (max_px, max_px))      # JPEG: dekodiranje odmah u manjoj rezoluciji
+        im = ImageOps.exif_transpose(im)
+        if im.mode != "RGB":
+            im = im.convert("RGB")
+        im.thumbnail((max_px, max_px), Image.LANCZOS)
+        tmp = f"{dst}.{os.getpid()}.part"
+        im.save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    os.replace(tmp, dst)
+    return dst
+
+
+class ImagePipeline:
+    def __init__(self, store: FileStore, workers: int = 2):
+        self.store = store
+        self.workers = workers
+        self.derived_dir = os.path.join(store.root, "derived")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: fork procesa s aktivnim dretvama (Streamlit) nije siguran
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _key(self, conn, ref: str) -> Optional[tuple]:
+        """(izvorna putanja, ključ izvedenice) ili None ako datoteke nema."""
+        src = self.store.resolve(conn, ref)
+        if src is None:
+            return None
+        info = self.store.info(conn, ref)
+        if info:
+            return src, info["sha256"]
+        # stara putanja izvan spremišta – ključ iz putanje, veličine i vremena izmjene
+        st = os.stat(src)
+        return src, hashlib.sha256(f"{os.path.abspath(src)}|{st.st_size}|{st.st_mtime_ns}".encode()).hexdigest()
+
+    def derivative_path(self, key: str, size: str) -> str:
+        return os.path.join(self.derived_dir, size, key[:2], key + ".jpg")
+
+    def _jobs(self, conn, refs: Iterable[str], sizes: Iterable[str]):
+        for ref in refs:
+            k = self._key(conn, ref) if ref else None
+            for size in sizes:
+                if k is None:
+                    yield ref, size, None, None
+                else:
+                    yield ref, size, k[0], self.derivative_path(k[1], size)
+
+    def submit(self, conn, refs: Iterable[str], sizes: Iterable[str] = tuple(SIZES)):
+        """Pokreće izradu izvedenica u pozadini (npr. odmah nakon uploada galerije)."""
+        for _, size, src, dst in self._jobs(conn, refs, sizes):
+            if src and not os.path.exists(dst):
+                self._executor().submit(make_derivative, src, dst, SIZES[size])
+
+    def ensure(self, conn, refs: List[str], size: str = "thumb") -> List[Optional[str]]:
+        """Putanje izvedenica za `refs` (redom); one koje nedostaju izrađuju se paralelno."""
+        out, pending = [], {}
+        for i, (_, _, src, dst) in enumerate(self._jobs(conn, refs, (size,))):
+            out.append(dst if src else None)
+            if src and not os.path.exists(dst):
+                pending[i] = self._executor().submit(make_derivative, src, dst, SIZES[size])
+        for i, fut in pending.items():
+            try:
+                fut.result()
+            except Exception:
+                out[i] = None    # oštećena ili nepodržana slika
+        return out
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+Skupni (bulk) uvoz iz Excel tablica.
+
+Stupci se normaliziraju vektorski u pandasu, neispravni retci izdvajaju se u
+izvještaj, a ispravni se upisuju u jednoj transakciji: executemany u
+privremenu (TEMP) tablicu pa jedan INSERT … SELECT … ON CONFLICT upsert.
+read_workbook() čita datoteku red po red i javlja napredak (za pozadinske
+poslove iz hk_core.jobs).
+"""
+
+import io
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# (stupac u Excel predlošku, stupac u tablici members, vrsta)
+MEMBER_COLUMNS = [
+    ("ime", "first_name", "text"),
+    ("prezime", "last_name", "text"),
+    ("datum_rodenja(YYYY-MM-DD)", "dob", "date"),
+    ("spol(M/Ž)", "gender", "text"),
+    ("oib", "oib", "text"),
+    ("ulica_i_broj", "street", "text"),
+    ("grad", "city", "text"),
+    ("postanski_broj", "postal_code", "text"),
+    ("email_sportasa", "athlete_email", "text"),
+    ("email_roditelja", "parent_email", "text"),
+    ("br_osobne", "id_card_number", "text"),
+    ("osobna_izdavatelj", "id_card_issuer", "text"),
+    ("osobna_vrijedi_do(YYYY-MM-DD)", "id_card_valid_until", "date"),
+    ("br_putovnice", "passport_number", "text"),
+    ("putovnica_izdavatelj", "passport_issuer", "text"),
+    ("putovnica_vrijedi_do(YYYY-MM-DD)", "passport_valid_until", "date"),
+    ("aktivni_natjecatelj(0/1)", "active_competitor", "flag"),
+    ("veteran(0/1)", "veteran", "flag"),
+    ("ostalo(0/1)", "other_flag", "flag"),
+    ("placa_clanarinu(0/1)", "pays_fee", "flag"),
+    ("iznos_clanarine(EUR)", "fee_amount", "fee"),
+    ("grupa", "group_name", "text"),
+]
+
+# (stupac u Excel predlošku rezultata, stupac u tablici results, vrsta)
+RESULT_COLUMNS = [
+    ("kategorija", "category", "text"),
+    ("stil(GR/FS/WW/BW/MODIFICIRANO)", "style", "text"),
+    ("borbi", "fights_total", "count"),
+    ("pobjeda", "wins", "count"),
+    ("poraza", "losses", "count"),
+    ("plasman(1-100)", "placement", "count"),
+    ("pobjede_detalji(ime;klub | ...)", "wins_detail_json", "details"),
+    ("porazi_detalji(ime;klub | ... )", "losses_detail_json", "details"),
+    ("napomena", "note", "text"),
+]
+
+DEFAULT_FEE = 30.0
+READ_CHUNK_ROWS = 1000
+_DATE_RE = r"^\d{4}-\d{2}-\d{2}$"
+
+
+@dataclass
+class ImportReport:
+    inserted: int = 0
+    updated: int = 0
+    rejected: List[Dict] = field(default_factory=list)   # {"redak", "oib", "razlog"}
+    unmatched_oibs: List[str] = field(default_factory=list)
+
+    def rejected_df(self) -> pd.DataFrame:
+        return pd.DataFrame(self.rejected, columns=["redak", "oib", "razlog"])
+
+
+def oib_valid(oib: str) -> bool:
+    """Provjera kontrolne znamenke OIB-a (ISO 7064, MOD 11,10)."""
+    if not re.fullmatch(r"\d{11}", oib or ""):
+        return False
+    a = 10
+    for ch in oib[:10]:
+        a = (a + int(ch)) % 10 or 10
+        a = (a * 2) % 11
+    return (11 - a) % 10 == int(oib[10])
+
+
+# ==========================
+# NORMALIZACIJA STUPACA
+# ==========================
+def _text(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        # Excel brojeve (OIB, poštanski broj) čita kao float – bez ".0"
+        out = s.astype(object).where(s.notna(), "")
+        whole = s.notna() & (s % 1 == 0)
+        out[whole] = s[whole].astype("int64").astype(str)
+        return out.astype(str).str.strip()
+    return s.astype(object).where(s.notna(), "").astype(str).str.strip()
+
+
+def _date(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s.dt.strftime("%Y-%m-%d").fillna("")
+    return _text(s).str[:10]
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def _oib(df: pd.DataFrame, name: str) -> pd.Series:
+    raw = _column(df, name)
+    out = _text(raw)
+    if pd.api.types.is_numeric_dtype(raw):
+        # brojčana ćelija gubi vodeće nule (OIB može početi s 0)
+        out = out.where(out == "", out.str.zfill(11))
+    return out
+
+
+def _collect_rejected(report: ImportReport, oib: pd.Series, reason: pd.Series, offset: int):
+    for pos in (reason != "").to_numpy().nonzero()[0]:
+        report.rejected.append({"redak": int(pos) + offset, "oib": oib.iat[pos], "razlog": reason.iat[pos]})
+
+
+def normalize_members(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Vraća (normalizirani DataFrame sa stupcima tablice members, razlog
+    odbijanja po retku – prazan string znači da je redak ispravan).
+    """
+    out = pd.DataFrame(index=df.index)
+    reason = pd.Series("", index=df.index, dtype=object)
+
+    def reject(mask, msg):
+        mask = mask & (reason == "")
+        reason[mask] = msg
+
+    for xl_col, db_col, kind in MEMBER_COLUMNS:
+        raw = _column(df, xl_col)
+        if db_col == "oib":
+            out[db_col] = _oib(df, xl_col)
+        elif kind == "text":
+            out[db_col] = _text(raw)
+        elif kind == "date":
+            out[db_col] = _date(raw)
+            bad = (out[db_col] != "") & (
+                ~out[db_col].str.match(_DATE_RE)
+                | pd.to_datetime(out[db_col], format="%Y-%m-%d", errors="coerce").isna())
+            reject(bad, f"neispravan datum u stupcu '{xl_col}'")
+        elif kind == "flag":
+            num = pd.to_numeric(raw, errors="coerce")
+            reject(raw.notna() & ~num.isin([0, 1]), f"'{xl_col}' mora biti 0 ili 1")
+            out[db_col] = num.fillna(0).where(num.isin([0, 1]), 0).astype(int)
+        elif kind == "fee":
+            num = pd.to_numeric(raw, errors="coerce")
+            reject(raw.notna() & num.isna(), f"'{xl_col}' nije broj")
+            out[db_col] = num.fillna(DEFAULT_FEE).astype(float)
+
+    oib = out["oib"]
+    reject(oib == "", "nedostaje OIB")
+    reject(~oib.map(oib_valid), "neispravan OIB (11 znamenki + kontrolna)")
+    reject((out["first_name"] == "") & (out["last_name"] == ""), "nedostaje ime i prezime")
+    # ista osoba dvaput u datoteci – vrijedi zadnji redak
+    dup = oib.duplicated(keep="last") & (reason == "")
+    reject(dup, "OIB se ponavlja u datoteci (vrijedi zadnji redak)")
+    return out, reason
+
+
+def _cell(v):
+    # kao pd.read_excel: prazna ćelija je NaN, cijeli float je int
+    if v is None or v == "":
+        return None
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+def read_workbook(data, progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                  chunk_rows: int = READ_CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Prvi list Excel datoteke (bajtovi ili datoteka) kao DataFrame, isto kao
+    pd.read_excel, ali red po red (openpyxl read-only) uz progress(pročitano,
+    ukupno) svakih `chunk_rows` redaka. progress smije dići iznimku (otkazivanje).
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(io.BytesIO(data) if isinstance(data, bytes) else data,
+                                read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        total = ws.max_row - 1 if ws.max_row else None
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        out = []
+        for row in rows:
+            out.append([_cell(v) for v in row])
+            if progress is not None and len(out) % chunk_rows == 0:
+                progress(len(out), total)
+    finally:
+        wb.close()
+    # oblikovani, ali prazni retci na kraju lista nisu podaci
+    while out and all(v is None for v in out[-1]):
+        out.pop()
+    if progress is not None:
+        progress(len(out), len(out))
+    columns = [h if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+    return pd.DataFrame(out, columns=columns).infer_objects()
+
+
+# ==========================
+# UVOZ ČLANOVA
+# ==========================
+def import_members(conn, df: pd.DataFrame, excel_row_offset: int = 2) -> ImportReport:
+    """Upsert članova po OIB-u u jednoj transakciji; vraća ImportReport."""
+    report = ImportReport()
+    norm, reason = normalize_members(df)
+
+    bad = reason != ""
+    _collect_rejected(report, norm["oib"], reason, excel_row_offset)
+    good = norm[~bad]
+    if good.empty:
+        return report
+
+    cols = [c for _, c, _ in MEMBER_COLUMNS]
+    col_list = ",".join(cols)
+    updates = ", ".join(f"{c}=excluded.{c}" for c in cols if c != "oib")
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS _import_members AS SELECT {col_list} FROM members WHERE 0")
+        conn.execute("DELETE FROM _import_members")
+        conn.executemany(f"INSERT INTO _import_members({col_list}) VALUES({','.join('?' * len(cols))})",
+                         list(good[cols].itertuples(index=False, name=None)))
+        report.updated = conn.execute(
+            "SELECT COUNT(*) FROM _import_members s JOIN members m ON m.oib = s.oib").fetchone()[0]
+        report.inserted = len(good) - report.updated
+        # "WHERE true" razrješava dvosmislenost INSERT … SELECT … ON CONFLICT
+        conn.execute(f"""INSERT INTO members({col_list})
+                         SELECT {col_list} FROM _import_members WHERE true
+                         ON CONFLICT(oib) DO UPDATE SET {updates}""")
+        conn.execute("DELETE FROM _import_members")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return report
+
+
+# ==========================
+# UVOZ REZULTATA
+# ==========================
+def _details_json(s: pd.Series) -> pd.Series:
+    # 'ime;klub | ime;klub' -> JSON lista bez praznih elemenata
+    parts = _text(s).str.split("|")
+    return parts.map(lambda xs: json.dumps([x.strip() for x in xs if x.strip()], ensure_ascii=False))
+
+
+def import_results(conn, df: pd.DataFrame, excel_row_offset: int = 2) -> ImportReport:
+    """
+    Uvoz rezultata po predlošku: svi member_oib razriješe se jednim JOIN-om
+    na members, competition_id se provjeri unaprijed, a ispravni retci
+    upisuju se jednim executemany u jednoj transakciji. Neispravni retci i
+    nepoznati OIB-i vraćaju se u izvještaju (ništa se ne preskače tiho).
+    """
+    report = ImportReport()
+    reason = pd.Series("", index=df.index, dtype=object)
+
+    def reject(mask, msg):
+        mask = mask & (reason == "")
+        reason[mask] = msg
+
+    out = pd.DataFrame(index=df.index)
+    oib = _oib(df, "member_oib")
+    comp = pd.to_numeric(_column(df, "competition_id"), errors="coerce")
+    reject(comp.isna() | (comp % 1 != 0), "nedostaje ili neispravan competition_id")
+    reject(oib == "", "nedostaje member_oib")
+    for xl_col, db_col, kind in RESULT_COLUMNS:
+        raw = _column(df, xl_col)
+        if kind == "text":
+            out[db_col] = _text(raw)
+        elif kind == "details":
+            out[db_col] = _details_json(raw)
+        else:
+            num = pd.to_numeric(raw, errors="coerce")
+            reject((raw.notna() & num.isna()) | (num < 0) | (num % 1 > 0), f"'{xl_col}' mora biti cijeli broj ≥ 0")
+            out[db_col] = num.fillna(0).where(num >= 0, 0).round().astype(int)
+    reject(out["placement"] > 100, "plasman mora biti između 0 i 100")
+
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # natjecanja – jedan upit za sve različite ID-eve iz datoteke
+        ids = sorted({int(x) for x in comp[reason == ""].dropna()})
+        known = set()
+        if ids:
+            q = f"SELECT id FROM competitions WHERE id IN ({','.join('?' * len(ids))})"
+            known = {r[0] for r in conn.execute(q, ids).fetchall()}
+        reject(~comp.isin(list(known)), "natjecanje (competition_id) ne postoji")
+
+        # članovi – svi OIB-i u TEMP tablicu pa jedan JOIN
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _import_oibs (oib TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM _import_oibs")
+        conn.executemany("INSERT OR IGNORE INTO _import_oibs(oib) VALUES(?)",
+                         [(o,) for o in oib[oib != ""].unique()])
+        member_ids = dict(conn.execute(
+            "SELECT m.oib, m.id FROM _import_oibs t JOIN members m ON m.oib = t.oib").fetchall())
+        conn.execute("DELETE FROM _import_oibs")
+        mid = oib.map(member_ids)
+        unmatched = (reason == "") & mid.isna()
+        report.unmatched_oibs = sorted(oib[unmatched].unique().tolist())
+        reject(mid.isna(), "član s tim OIB-om ne postoji")
+
+        good = reason == ""
+        out["competition_id"] = comp.where(good, 0).astype(int)
+        out["member_id"] = mid.where(good, 0).astype(int)
+        cols = ["competition_id", "member_id"] + [c for _, c, _ in RESULT_COLUMNS]
+        rows = list(out.loc[good, cols].itertuples(index=False, name=None))
+        if rows:
+            conn.executemany(f"INSERT INTO results({','.join(cols)}) VALUES({','.join('?' * len(cols))})", rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    report.inserted = len(rows)
+    _collect_rejected(report, oib, reason, excel_row_offset)
+    return report
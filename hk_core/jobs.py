@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+Pozadinski poslovi: uvoz iz Excela i izvozi, s napretkom i otkazivanjem.
+
+Uvoz velike tablice ili izvoz svih rezultata više se ne izvršava u dretvi
+Streamlit skripte. Stranica preda posao JobRunneru i odmah nastavi;
+JobRunner ga izvrši u bazenu dretvi, a stanje vodi u tablici jobs
+(migracija 14): status, faza, napredak, broj redaka, izvještaj (JSON),
+putanja gotove datoteke i greška. Posao ne ovisi o sesiji – preživi rerun
+i odlazak na drugu stranicu – a stranica samo prati get(job_id).
+
+Napredak se drži u memoriji (čitanje je besplatno), a u tablicu se upisuje
+najviše svakih PROGRESS_EVERY sekundi i na promjeni statusa. cancel()
+posao u redu odmah otkazuje, a posao koji se izvršava prekida na idućoj
+dojavi napretka. Upis uvoza ide kroz pisača (hk_core.writer) jednim
+pozivom u jednoj transakciji, pa otkazan ili neuspio uvoz ne ostavlja
+polovične podatke.
+
+Poslovi su obične funkcije fn(ctx, *args) -> dict (izvještaj); vidi
+import_members_job, import_results_job i export_job.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from hk_core.importers import import_members, import_results, read_workbook
+
+JOB_WORKERS = 2
+PROGRESS_EVERY = 2.0
+KEEP_IN_MEMORY = 100
+ACTIVE = ("queued", "running")
+
+JOB_COLUMNS = ("id, kind, label, status, phase, progress, done_rows, total_rows, report_json, "
+               "result_path, error, created_at, started_at, finished_at")
+
+
+class JobCancelled(Exception):
+    """Posao je otkazan (cancel()) – diže se iz dojave napretka."""
+
+
+@dataclass
+class JobStatus:
+    id: int
+    kind: str
+    label: str = ""
+    status: str = "queued"
+    phase: str = ""
+    progress: float = 0.0
+    done_rows: int = 0
+    total_rows: Optional[int] = None
+    report: Dict[str, Any] = field(default_factory=dict)
+    result_path: Optional[str] = None
+    error: Optional[str] = None
+    created_at: str = ""
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE
+
+    @classmethod
+    def from_row(cls, row) -> "JobStatus":
+        (id_, kind, label, status, phase, progress, done_rows, total_rows, report_json,
+         result_path, error, created_at, started_at, finished_at) = row
+        return cls(id_, kind, label, status, phase, progress, done_rows, total_rows,
+                   json.loads(report_json) if report_json else {}, result_path, error,
+                   created_at, started_at, finished_at)
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class JobContext:
+    """Ono što posao vidi: dojava napretka, provjera otkazivanja, upis i čitanje baze."""
+
+    def __init__(self, runner: "JobRunner", status: JobStatus, cancel: threading.Event):
+        self.runner = runner
+        self.status = status
+        self._cancel = cancel
+        self._saved_at = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def phase(self, text: str):
+        self.check()
+        self.status.phase = text
+        self._save()
+
+    def progress(self, done: int, total: Optional[int] = None):
+        """Potpis odgovara progress(...) iz importers.read_workbook i exports."""
+        s = self.status
+        s.done_rows, s.total_rows = int(done), (int(total) if total is not None else s.total_rows)
+        if s.total_rows:
+            s.progress = min(1.0, s.done_rows / s.total_rows)
+        self.check()
+        if time.monotonic() - self._saved_at >= PROGRESS_EVERY:
+            self._save()
+
+    def _save(self):
+        self._saved_at = time.monotonic()
+        self.runner._persist(self.status)
+
+    def connection(self):
+        """Konekcija za čitanje iz bazena: `with ctx.connection() as conn: ...`"""
+        return self.runner.pool.connection()
+
+    def write(self, fn: Callable, *args):
+        """fn(conn, *args) u vlastitoj transakciji – preko pisača ako ga ima. Posljednja točka otkazivanja."""
+        self.check()
+        if self.runner.writer is not None:
+            return self.runner.writer.call(fn, *args).result()
+        with self.runner.pool.connection() as conn:
+            try:
+                out = fn(conn, *args)
+                if conn.in_transaction:
+                    conn.commit()
+                return out
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+
+class JobRunner:
+    """Bazen dretvi za poslove + tablica jobs; jedan po procesu."""
+
+    def __init__(self, pool, writer=None, max_workers: int = JOB_WORKERS):
+        self.pool = pool
+        self.writer = writer
+        self.max_workers = max_workers
+        self._live: Dict[int, JobStatus] = {}
+        self._cancel: Dict[int, threading.Event] = {}
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> "JobRunner":
+        if self._executor is None:
+            # poslovi prekinuti gašenjem procesa nemaju tko dovršiti
+            self._write("""UPDATE jobs SET status='failed', error='prekinuto ponovnim pokretanjem aplikacije',
+                           finished_at=? WHERE status IN ('queued', 'running')""", (_now(),))
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="hk-job")
+        return self
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            for ev in self._cancel.values():
+                ev.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    # --- baza ---
+    def _write(self, sql: str, params: tuple) -> Optional[int]:
+        if self.writer is not None:
+            return self.writer.execute([(sql, params)]).lastrowid
+        with self.pool.connection() as conn:
+            cur = conn.execute(sql, params)
+            conn.commit()
+            return cur.lastrowid
+
+    def _persist(self, s: JobStatus):
+        self._write("""UPDATE jobs SET status=?, phase=?, progress=?, done_rows=?, total_rows=?, report_json=?,
+                       result_path=?, error=?, started_at=?, finished_at=? WHERE id=?""",
+                    (s.status, s.phase, s.progress, s.done_rows, s.total_rows,
+                     json.dumps(s.report, ensure_ascii=False, default=str) if s.report else None,
+                     s.result_path, s.error, s.started_at, s.finished_at, s.id))
+
+    # --- predaja i praćenje ---
+    def submit(self, kind: str, label: str, fn: Callable, *args) -> int:
+        """Upisuje posao (status queued) i stavlja ga u red; vraća id posla."""
+        if self._executor is None:
+            raise RuntimeError("JobRunner nije pokrenut (start())")
+        created = _now()
+        job_id = self._write("INSERT INTO jobs(kind, label, created_at) VALUES(?,?,?)", (kind, label, created))
+        status = JobStatus(job_id, kind, label, created_at=created)
+        with self._lock:
+            self._live[job_id] = status
+            self._cancel[job_id] = threading.Event()
+            self._futures[job_id] = self._executor.submit(self._run, status, fn, args)
+        return job_id
+
+    def _run(self, s: JobStatus, fn: Callable, args: tuple):
+        ctx = JobContext(self, s, self._cancel[s.id])
+        s.status, s.started_at = "running", _now()
+        try:
+            ctx.check()
+            self._persist(s)
+            s.report = fn(ctx, *args) or {}
+            s.status, s.progress = "done", 1.0
+        except JobCancelled:
+            s.status = "cancelled"
+        except Exception as e:
+            s.status, s.error = "failed", f"{type(e).__name__}: {e}"
+        s.finished_at = _now()
+        try:
+            self._persist(s)
+        finally:
+            self._forget()
+
+    def _forget(self):
+        # gotovi poslovi ostaju u memoriji dok ih ne istisnu noviji; stanje je ionako u tablici
+        with self._lock:
+            done = [i for i, s in self._live.items() if not s.active]
+            for i in done[:max(0, len(done) - KEEP_IN_MEMORY)]:
+                self._live.pop(i, None)
+                self._cancel.pop(i, None)
+                self._futures.pop(i, None)
+
+    def cancel(self, job_id: int) -> bool:
+        """Otkazuje posao; False ako je već završen ili ga ovaj proces ne izvršava."""
+        with self._lock:
+            s, ev, fut = self._live.get(job_id), self._cancel.get(job_id), self._futures.get(job_id)
+        if s is None or not s.active:
+            return False
+        ev.set()
+        if fut.cancel():
+            # još nije krenuo – _run se neće ni pozvati
+            s.status, s.finished_at = "cancelled", _now()
+            self._persist(s)
+        return True
+
+    def get(self, job_id: Optional[int]) -> Optional[JobStatus]:
+        if job_id is None:
+            return None
+        with self._lock:
+            s = self._live.get(job_id)
+        if s is not None:
+            return s
+        with self.pool.connection() as conn:
+            row = conn.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id=?", (int(job_id),)).fetchone()
+        return JobStatus.from_row(row) if row else None
+
+    def recent(self, limit: int = 20) -> List[JobStatus]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(f"SELECT {JOB_COLUMNS} FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        out = [JobStatus.from_row(r) for r in rows]
+        with self._lock:
+            return [self._live.get(s.id, s) for s in out]
+
+
+# ==========================
+# POSLOVI
+# ==========================
+def import_members_job(ctx: JobContext, data: bytes) -> dict:
+    ctx.phase("čitanje datoteke")
+    df = read_workbook(data, ctx.progress)
+    ctx.phase("upis u bazu")
+    return asdict(ctx.write(import_members, df))
+
+
+def import_results_job(ctx: JobContext, data: bytes) -> dict:
+    ctx.phase("čitanje datoteke")
+    df = read_workbook(data, ctx.progress)
+    ctx.phase("upis u bazu")
+    return asdict(ctx.write(import_results, df))
+
+
+def export_job(ctx: JobContext, cache, name: str, params: tuple = (), fmt: str = "xlsx") -> dict:
+    """Izvoz kroz ExportCache – gotova datoteka ostaje na disku (ctx.status.result_path)."""
+    ctx.phase("izvoz")
+    ctx.status.result_path = cache.path(name, tuple(params), fmt, progress=ctx.progress)
+    # izvoz iz priručne memorije ne javlja napredak – broj redaka tada nije poznat
+    return {"redaka": ctx.status.done_rows} if ctx.status.total_rows is not None else {}
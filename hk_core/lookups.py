@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Priručna memorija za padajuće izbornike (članovi, treneri, grupe, natjecanja).
+
+Isti popisi grade se na gotovo svakom iscrtavanju odjeljka, a mijenjaju se
+rijetko. LookupCache čuva gotove liste opcija i vraća ih bez upita u bazu
+sve dok se generacija izvornih tablica u bazenu (ConnectionPool.bump, koju
+PooledConnection poziva na svaki commit s INSERT/UPDATE/DELETE) ne promijeni.
+Upisi iz drugih procesa (npr. skripte nad istom bazom) ne mijenjaju
+generaciju, pa unos svejedno istječe nakon `max_age` sekundi.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# ime -> (sql, tablice o kojima ovisi, pretvorba redaka u opcije)
+LOOKUPS: Dict[str, Tuple[str, Tuple[str, ...], Callable[[List[tuple]], Any]]] = {
+    "groups": (
+        "SELECT name FROM groups ORDER BY name",
+        ("groups",),
+        lambda rows: [r[0] for r in rows]),
+    "member_groups": (
+        "SELECT DISTINCT group_name FROM members WHERE group_name IS NOT NULL AND group_name<>'' ORDER BY 1",
+        ("members",),
+        lambda rows: [r[0] for r in rows]),
+    "members": (
+        "SELECT id, first_name || ' ' || last_name FROM members ORDER BY last_name, first_name",
+        ("members",),
+        lambda rows: [f"{i} – {full}" for i, full in rows]),
+    "members_with_group": (
+        "SELECT id, first_name || ' ' || last_name, group_name FROM members ORDER BY last_name, first_name",
+        ("members",),
+        lambda rows: [f"{i} – {full} (trenutno: {g or '-'})" for i, full, g in rows]),
+    "coaches": (
+        "SELECT id, first_name || ' ' || last_name FROM coaches ORDER BY last_name, first_name",
+        ("coaches",),
+        lambda rows: [f"{i} – {full}" for i, full in rows]),
+    "coach_names": (
+        "SELECT first_name || ' ' || last_name FROM coaches ORDER BY 1",
+        ("coaches",),
+        lambda rows: [r[0] for r in rows]),
+    # borbe piše okidač nad results, pa generaciju mijenjaju upisi u results
+    "opponents": (
+        "SELECT DISTINCT opponent_name FROM bouts ORDER BY 1",
+        ("results",),
+        lambda rows: [r[0] for r in rows]),
+    "opponent_clubs": (
+        "SELECT DISTINCT opponent_club FROM bouts WHERE opponent_club<>'' ORDER BY 1",
+        ("results",),
+        lambda rows: [r[0] for r in rows]),
+    "competitions": (
+        "SELECT id, COALESCE(name, kind), date_from FROM competitions ORDER BY date_from DESC",
+        ("competitions",),
+        lambda rows: {f"{i} – {title} ({d})": i for i, title, d in rows}),
+    # ovisi i o današnjem datumu – zastarijeva najkasnije nakon max_age
+    "upcoming_competitions": (
+        """SELECT id, COALESCE(name, kind), date_from FROM competitions
+           WHERE COALESCE(NULLIF(date_to, ''), date_from) >= date('now', 'localtime') ORDER BY date_from""",
+        ("competitions",),
+        lambda rows: {f"{i} – {title} ({d})": i for i, title, d in rows}),
+}
+
+
+class LookupCache:
+    """Opcije izbornika po imenu iz LOOKUPS, poništavane po generaciji tablica."""
+
+    def __init__(self, pool, max_age: float = 300.0):
+        self.pool = pool
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._data: Dict[str, Tuple[tuple, float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _generations(self, tables: Sequence[str]) -> tuple:
+        return tuple(self.pool.generation(t) for t in tables)
+
+    def get(self, name: str, conn):
+        """
+        Vraća opcije za `name`. Vraćene liste/rječnike ne treba mijenjati –
+        dijele ih sve sesije. `conn` je konekcija koju pozivatelj već drži.
+        """
+        sql, tables, build = LOOKUPS[name]
+        # generacija se čita prije upita: ako upis stigne između, sljedeći poziv
+        # vidi noviju generaciju i ponovno čita – nikad obrnuto
+        gen = self._generations(tables)
+        with self._lock:
+            entry = self._data.get(name)
+            if entry and entry[0] == gen and time.monotonic() - entry[1] < self.max_age:
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        value = build(conn.execute(sql).fetchall())
+        with self._lock:
+            self._data[name] = (gen, time.monotonic(), value)
+        return value
+
+    def invalidate(self, *names: str):
+        with self._lock:
+            for n in names or list(self._data):
+                self._data.pop(n, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._data)}
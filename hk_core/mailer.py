@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+Slanje e-mail obavijesti preko reda čekanja (outbox).
+
+queue_message() upisuje poruku u comm_log i po jedan redak po primatelju u
+outbox (migracija 12) i odmah se vraća. OutboxWorker u pozadinskoj dretvi
+uzima primatelje iste poruke u skupinama od `batch_size` adresa, šalje ih
+kao BCC jedne poruke kroz istu SMTP vezu, drži se ograničenja
+`rate_per_minute` primatelja u minuti, a privremene greške (4xx, prekid
+veze) ponavlja s eksponencijalnim čekanjem. Stanje svakog primatelja
+(queued / sending / sent / failed) ostaje u outbox tablici; uz `writer`
+(hk_core.writer) radnik ga upisuje kroz pisača kao i stranice.
+
+Postavke dolaze iz varijabli okruženja HK_SMTP_HOST, HK_SMTP_PORT,
+HK_SMTP_USER, HK_SMTP_PASSWORD, HK_SMTP_SENDER, HK_SMTP_TLS (starttls/ssl/none),
+HK_SMTP_BATCH i HK_SMTP_RATE. Za lokalnu probu bez pravog poslužitelja:
+
+    python -m aiosmtpd -n -l localhost:8025
+    HK_SMTP_HOST=localhost HK_SMTP_PORT=8025 HK_SMTP_TLS=none python -m hk_core.mailer hk_podravka.db
+"""
+
+import json
+import os
+import smtplib
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 30.0
+
+COMM_SUMMARY = """
+    SELECT c.id, c.date AS datum, c.subject AS naslov,
+           COUNT(o.id) AS primatelja,
+           SUM(o.status = 'sent') AS poslano,
+           SUM(o.status IN ('queued', 'sending')) AS u_redu,
+           SUM(o.status = 'failed') AS neuspjelo
+    FROM comm_log c LEFT JOIN outbox o ON o.comm_id = c.id
+    GROUP BY c.id ORDER BY c.id DESC LIMIT ?
+"""
+
+DELIVERY_STATUS = """
+    SELECT o.email, COALESCE(m.first_name || ' ' || m.last_name, '') AS clan, o.status, o.attempts AS pokusaja,
+           o.sent_at AS poslano, o.next_attempt_at AS sljedeci_pokusaj, o.last_error AS greska
+    FROM outbox o LEFT JOIN members m ON m.id = o.member_id
+    WHERE o.comm_id = ? ORDER BY o.status, o.email
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+@dataclass
+class SmtpConfig:
+    host: str = ""
+    port: int = 587
+    user: str = ""
+    password: str = ""
+    sender: str = ""
+    tls: str = "starttls"           # starttls / ssl / none
+    batch_size: int = 50            # BCC adresa po poruci
+    rate_per_minute: int = 120      # primatelja u minuti (ograničenje poslužitelja)
+    timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls, sender: str = "") -> "SmtpConfig":
+        env = os.environ.get
+        return cls(host=env("HK_SMTP_HOST", ""), port=int(env("HK_SMTP_PORT", "587")),
+                   user=env("HK_SMTP_USER", ""), password=env("HK_SMTP_PASSWORD", ""),
+                   sender=env("HK_SMTP_SENDER", sender), tls=env("HK_SMTP_TLS", "starttls").lower(),
+                   batch_size=int(env("HK_SMTP_BATCH", "50")), rate_per_minute=int(env("HK_SMTP_RATE", "120")))
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.host and self.sender)
+
+
+def queue_message(conn, subject: str, body: str, recipients: Iterable[Tuple[Optional[int], str]]) -> Optional[int]:
+    """
+    Sprema poruku i primatelje (member_id, e-mail) u jednoj transakciji;
+    ista adresa dobiva poruku samo jednom. Vraća id u comm_log ili None ako
+    nema nijedne adrese.
+    """
+    rows = {}
+    for member_id, email in recipients:
+        email = (email or "").strip()
+        if "@" in email and email.lower() not in rows:
+            rows[email.lower()] = (member_id, email)
+    if not rows:
+        return None
+    now = _now()
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cur = conn.execute("INSERT INTO comm_log(date, subject, body, recipients_json) VALUES(?,?,?,?)",
+                           (now, subject, body, json.dumps([e for _, e in rows.values()], ensure_ascii=False)))
+        comm_id = cur.lastrowid
+        conn.executemany("""INSERT INTO outbox(comm_id, member_id, email, status, attempts, next_attempt_at)
+                            VALUES(?,?,?,'queued',0,?)""",
+                         [(comm_id, mid, email, now) for mid, email in rows.values()])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return comm_id
+
+
+def comm_summary(conn, limit: int = 20) -> pd.DataFrame:
+    return pd.read_sql_query(COMM_SUMMARY, conn, params=(limit,))
+
+
+def delivery_status(conn, comm_id: int) -> pd.DataFrame:
+    return pd.read_sql_query(DELIVERY_STATUS, conn, params=(comm_id,))
+
+
+def _temporary(code) -> bool:
+    return not isinstance(code, int) or code < 500
+
+
+def _reset_stuck(conn):
+    conn.execute("UPDATE outbox SET status='queued' WHERE status='sending'")
+    conn.commit()
+
+
+def _record(conn, sent: List[tuple], retry: List[tuple], failed: List[tuple]):
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany("UPDATE outbox SET status='sent', sent_at=?, last_error=NULL WHERE id=?", sent)
+        conn.executemany("""UPDATE outbox SET status='queued', attempts=?, next_attempt_at=?, last_error=?
+                            WHERE id=?""", retry)
+        conn.executemany("UPDATE outbox SET status='failed', attempts=?, last_error=? WHERE id=?", failed)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+class OutboxWorker:
+    """Pozadinska dretva koja prazni outbox preko SMTP-a."""
+
+    def __init__(self, pool, config: SmtpConfig, writer=None, max_attempts: int = MAX_ATTEMPTS,
+                 backoff: float = BACKOFF_SECONDS, idle_interval: float = 30.0):
+        self.pool = pool
+        self.writer = writer
+        self.config = config
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.idle_interval = idle_interval
+        self.last_error: Optional[str] = None
+        self.sent = 0
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._next_send = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- dretva ----
+    def start(self) -> "OutboxWorker":
+        if self._thread is None:
+            self._reset_stuck()
+            self._thread = threading.Thread(target=self._run, name="hk-outbox", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def notify(self):
+        """Poziva se nakon queue_message – dretva ne čeka idle_interval."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                while not self._stop.is_set() and self.process_batch():
+                    pass
+            except Exception as e:     # dretva ne smije umrijeti zbog jedne greške
+                self.last_error = str(e)
+            self._close()
+            self._wake.wait(self.idle_interval)
+            self._wake.clear()
+        self._close()
+
+    def _write(self, fn, *args):
+        """fn(conn, *args) – preko pisača ako ga ima, inače na konekciji iz bazena."""
+        if self.writer is not None:
+            return self.writer.call(fn, *args).result()
+        with self.pool.connection() as conn:
+            return fn(conn, *args)
+
+    def _reset_stuck(self):
+        # 'sending' nakon pada procesa: ishod nepoznat, pokušava se ponovno
+        self._write(_reset_stuck)
+
+    # ---- SMTP veza ----
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close()
+        c = self.config
+        if c.tls == "ssl":
+            smtp = smtplib.SMTP_SSL(c.host, c.port, timeout=c.timeout)
+        else:
+            smtp = smtplib.SMTP(c.host, c.port, timeout=c.timeout)
+            if c.tls == "starttls":
+                smtp.starttls()
+        if c.user:
+            smtp.login(c.user, c.password)
+        self._smtp = smtp
+        return smtp
+
+    def _close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def _throttle(self, n: int):
+        wait = self._next_send - time.monotonic()
+        if wait > 0:
+            self._stop.wait(wait)
+        self._next_send = max(self._next_send, time.monotonic()) + n * 60.0 / max(self.config.rate_per_minute, 1)
+
+    # ---- jedna skupina ----
+    def _claim(self, conn) -> Tuple[Optional[tuple], List[tuple]]:
+        now = _now()
+        conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("""SELECT comm_id FROM outbox WHERE status='queued' AND next_attempt_at <= ?
+                                  ORDER BY next_attempt_at, id LIMIT 1""", (now,)).fetchone()
+            if row is None:
+                conn.rollback()
+                return None, []
+            rows = conn.execute("""SELECT id, email, attempts FROM outbox
+                                   WHERE comm_id=? AND status='queued' AND next_attempt_at <= ?
+                                   ORDER BY id LIMIT ?""", (row[0], now, self.config.batch_size)).fetchall()
+            conn.executemany("UPDATE outbox SET status='sending' WHERE id=?", [(r[0],) for r in rows])
+            message = conn.execute("SELECT id, subject, body FROM comm_log WHERE id=?", (row[0],)).fetchone()
+            conn.commit()
+            return message, rows
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _message(self, subject: str, body: str) -> EmailMessage:
+        msg = EmailMessage()
+        msg["From"] = self.config.sender
+        msg["To"] = self.config.sender      # primatelji su samo u BCC-u (omotnica), ne u zaglavlju
+        msg["Subject"] = subject or ""
+        msg.set_content(body or "")
+        return msg
+
+    def process_batch(self) -> bool:
+        """Šalje jednu skupinu; vraća False kad u redu nema ništa za poslati."""
+        message, rows = self._write(self._claim)
+        if not rows:
+            return False
+        self._throttle(len(rows))
+        refused, error = {}, None
+        try:
+            refused = self._connection().send_message(self._message(message[1], message[2]),
+                                                      from_addr=self.config.sender,
+                                                      to_addrs=[r[1] for r in rows])
+        except smtplib.SMTPRecipientsRefused as e:
+            refused = e.recipients
+        except (smtplib.SMTPException, OSError) as e:
+            code = getattr(e, "smtp_code", None)
+            error = (code, str(e))
+            self._close()
+        self._record(rows, refused, error)
+        return True
+
+    def _record(self, rows: List[tuple], refused: dict, error: Optional[tuple]):
+        now = datetime.now()
+        sent, retry, failed = [], [], []
+        for oid, email, attempts in rows:
+            problem = error or refused.get(email)
+            if problem is None:
+                sent.append((now.isoformat(timespec="seconds"), oid))
+                continue
+            code, text = problem
+            text = text.decode("utf-8", "replace") if isinstance(text, bytes) else str(text)
+            attempts += 1
+            if _temporary(code) and attempts < self.max_attempts:
+                delay = timedelta(seconds=self.backoff * 2 ** (attempts - 1))
+                retry.append((attempts, (now + delay).isoformat(timespec="seconds"), f"{code or ''} {text}".strip(), oid))
+            else:
+                failed.append((attempts, f"{code or ''} {text}".strip(), oid))
+        self._write(_record, sent, retry, failed)
+        self.sent += len(sent)
+        self.last_error = error[1] if error else None
+
+
+if __name__ == "__main__":
+    from hk_core.db import ConnectionPool
+    from hk_core.migrations import migrate
+
+    # jednokratno pražnjenje reda (npr. iz crona) umjesto pozadinske dretve
+    path = sys.argv[1] if len(sys.argv) > 1 else "hk_podravka.db"
+    config = SmtpConfig.from_env()
+    if not config.configured:
+        sys.exit("Postavite HK_SMTP_HOST i HK_SMTP_SENDER")
+    pool = ConnectionPool(path)
+    with pool.connection() as c:
+        migrate(c)
+    worker = OutboxWorker(pool, config)
+    worker._reset_stuck()
+    try:
+        while worker.process_batch():
+            pass
+    finally:
+        worker._close()
+        pool.close()
+    print(f"{path}: poslano {worker.sent}" + (f", zadnja greška: {worker.last_error}" if worker.last_error else ""))
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Popis članova po stranicama (keyset paginacija) s filtrima u SQL-u.
+
+Stranica se čita kao "sljedećih N redaka iza zadnjeg prikazanog" po ključu
+(prezime, ime, id), pa je svaka stranica jedna pretraga po indeksu
+idx_members_page (migracija 10) bez obzira koliko je članova ispred nje –
+OFFSET bi ih sve morao preskočiti. Ključ je COALESCE(..., '') jer usporedba
+s NULL-om nikad nije istinita, a stariji zapisi mogu imati prazno ime.
+Broj dana do isteka liječničke potvrde računa SQLite (julianday), pa se u
+Pythonu ne prolazi po svim recima.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+PAGE_SORT = ("COALESCE(last_name, '')", "COALESCE(first_name, '')", "id")
+
+MEMBERS_PAGE = """
+    SELECT id, first_name, last_name, gender, dob, oib,
+           street, city, postal_code,
+           athlete_email, parent_email,
+           active_competitor, veteran, other_flag,
+           pays_fee, fee_amount, group_name, medical_valid_until,
+           CAST(julianday(medical_valid_until) - julianday(date('now', 'localtime')) AS INTEGER) AS dana_do_ljecnicke,
+           row_version
+    FROM members
+    WHERE {where}
+    ORDER BY {order}
+    LIMIT ?
+"""
+
+Cursor = Tuple[str, str, int]
+
+
+@dataclass
+class MemberFilter:
+    """None = bez filtra; medical_within = liječnička istječe za najviše N dana (ili je istekla)."""
+    group: Optional[str] = None
+    active: Optional[bool] = None
+    veteran: Optional[bool] = None
+    pays_fee: Optional[bool] = None
+    medical_within: Optional[int] = None
+
+    def sql(self) -> Tuple[List[str], list]:
+        where, params = [], []
+        if self.group:
+            where.append("group_name = ?")
+            params.append(self.group)
+        for column, value in (("active_competitor", self.active), ("veteran", self.veteran),
+                              ("pays_fee", self.pays_fee)):
+            if value is not None:
+                where.append(f"COALESCE({column}, 0) = ?")
+                params.append(int(value))
+        if self.medical_within is not None:
+            where.append("julianday(medical_valid_until) - julianday(date('now', 'localtime')) <= ?")
+            params.append(int(self.medical_within))
+        return where, params
+
+
+def members_page(conn, filters: MemberFilter = MemberFilter(), after: Optional[Cursor] = None,
+                 limit: int = 50) -> Tuple[pd.DataFrame, Optional[Cursor]]:
+    """
+    Jedna stranica popisa iza ključa `after` (None = prva stranica). Vraća
+    (df, ključ zadnjeg retka) – ključ je None ako iza ove stranice nema više.
+    """
+    where, params = filters.sql()
+    if after is not None:
+        # prvi uvjet je isti kao početak retka ispod, ali samo njega planer
+        # zna pretvoriti u pretragu indeksa po izrazu
+        where.append(f"{PAGE_SORT[0]} >= ?")
+        where.append(f"({', '.join(PAGE_SORT)}) > (?, ?, ?)")
+        params += [after[0], *after]
+    sql = MEMBERS_PAGE.format(where=" AND ".join(where) or "1", order=", ".join(PAGE_SORT))
+    df = pd.read_sql_query(sql, conn, params=(*params, limit + 1))
+    if len(df) <= limit:
+        return df, None
+    df = df.iloc[:limit]
+    last = df.iloc[-1]
+    return df, tuple("" if pd.isna(last[c]) else last[c] for c in ("last_name", "first_name")) + (int(last["id"]),)
+
+
+def count_members(conn, filters: MemberFilter = MemberFilter()) -> int:
+    where, params = filters.sql()
+    return conn.execute(f"SELECT COUNT(*) FROM members WHERE {' AND '.join(where) or 1}", params).fetchone()[0]
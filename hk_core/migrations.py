@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+"""
+Verzionirane migracije sheme.
+
+Svaka migracija ima redni broj i izvršava se točno jednom, unutar vlastite
+transakcije; primijenjene verzije bilježe se u tablici schema_version.
+Stara baza (bilo koje ranije verzije aplikacije, bez schema_version) kreće
+od verzije 0 i u jednom prolazu dolazi do najnovije sheme – zato prva
+migracija koristi CREATE TABLE IF NOT EXISTS.
+
+Ručno pokretanje:
+    python -m hk_core.migrations hk_podravka.db
+"""
+
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = []
+
+DEFAULT_GROUPS = ["Hrvači", "Hrvačice", "Veterani", "Ostalo"]
+
+
+def migration(version: int, name: str):
+    """Dekorator koji registrira migracijski korak."""
+    def deco(fn):
+        MIGRATIONS.append((version, name, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return deco
+
+
+# ==========================
+# KORACI
+# ==========================
+@migration(1, "osnovna shema")
+def _m001_base(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS club_info (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        name TEXT, email TEXT, address TEXT, oib TEXT, web TEXT, iban TEXT,
+        president TEXT, secretary TEXT, board_json TEXT, supervisory_json TEXT,
+        instagram TEXT, facebook TEXT, tiktok TEXT
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS club_docs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT, filename TEXT, path TEXT, uploaded_at TEXT
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS groups (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS members (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT, last_name TEXT, dob TEXT, gender TEXT, oib TEXT UNIQUE,
+        street TEXT, city TEXT, postal_code TEXT,
+        athlete_email TEXT, parent_email TEXT,
+        id_card_number TEXT, id_card_issuer TEXT, id_card_valid_until TEXT,
+        passport_number TEXT, passport_issuer TEXT, passport_valid_until TEXT,
+        active_competitor INTEGER DEFAULT 0, veteran INTEGER DEFAULT 0, other_flag INTEGER DEFAULT 0,
+        pays_fee INTEGER DEFAULT 0, fee_amount REAL DEFAULT 30.0, group_name TEXT,
+        photo_path TEXT, application_path TEXT, consent_path TEXT,
+        medical_path TEXT, medical_valid_until TEXT,
+        consent_checked_date TEXT
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS coaches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT, last_name TEXT, dob TEXT, oib TEXT, email TEXT, iban TEXT,
+        group_name TEXT, contract_path TEXT, other_docs_json TEXT, photo_path TEXT
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS competitions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT, kind_other TEXT, name TEXT,
+        date_from TEXT, date_to TEXT, place TEXT,
+        style TEXT, age_cat TEXT,
+        country TEXT, country_iso3 TEXT,
+        team_rank INTEGER, club_competitors INTEGER, total_competitors INTEGER,
+        clubs_count INTEGER, countries_count INTEGER,
+        coaches_json TEXT, notes TEXT, bulletin_url TEXT, gallery_paths_json TEXT, website_link TEXT
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        competition_id INTEGER REFERENCES competitions(id) ON DELETE CASCADE,
+        member_id INTEGER REFERENCES members(id) ON DELETE SET NULL,
+        category TEXT, style TEXT,
+        fights_total INTEGER, wins INTEGER, losses INTEGER, placement INTEGER,
+        wins_detail_json TEXT, losses_detail_json TEXT, note TEXT
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS attendance_coaches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        coach_id INTEGER REFERENCES coaches(id) ON DELETE SET NULL,
+        group_name TEXT, start_time TEXT, end_time TEXT, place TEXT, minutes INTEGER
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS attendance_members (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        member_id INTEGER REFERENCES members(id) ON DELETE CASCADE,
+        date TEXT, group_name TEXT, present INTEGER DEFAULT 0, minutes INTEGER DEFAULT 0,
+        note TEXT, camp_flag INTEGER DEFAULT 0, camp_where TEXT, camp_coach TEXT
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS comm_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT, subject TEXT, body TEXT, recipients_json TEXT
+    )""")
+
+
+@migration(2, "zadane grupe")
+def _m002_default_groups(conn):
+    conn.executemany("INSERT OR IGNORE INTO groups(name) VALUES(?)", [(g,) for g in DEFAULT_GROUPS])
+
+
+@migration(3, "indeksi i competitions.year")
+def _m003_indexes(conn):
+    # substr(date_from,1,4) ne može koristiti indeks – godina je generirani stupac
+    conn.execute("""ALTER TABLE competitions ADD COLUMN year INTEGER
+                    GENERATED ALWAYS AS (CAST(substr(date_from,1,4) AS INTEGER)) VIRTUAL""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_competitions_year ON competitions(year, date_from)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_competitions_date ON competitions(date_from)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_results_competition ON results(competition_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_results_member ON results(member_id, competition_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_att_members_member_date ON attendance_members(member_id, date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_att_members_group_date ON attendance_members(group_name, date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_att_coaches_coach ON attendance_coaches(coach_id, start_time)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_members_group ON members(group_name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_members_veteran ON members(veteran)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_members_name ON members(last_name, first_name)")
+
+
+@migration(4, "row_version za optimističko zaključavanje")
+def _m004_row_version(conn):
+    # svaka izmjena retka (iz bilo kojeg dijela aplikacije) povećava row_version,
+    # pa spremanje iz tablice može prepoznati da je netko drugi u međuvremenu mijenjao redak
+    for table in ("members", "coaches"):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN row_version INTEGER NOT NULL DEFAULT 0")
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_row_version AFTER UPDATE ON {table}
+        WHEN NEW.row_version = OLD.row_version
+        BEGIN
+            UPDATE {table} SET row_version = OLD.row_version + 1 WHERE id = NEW.id;
+        END""")
+
+
+@migration(5, "jedinstveno prisustvo po članu, datumu i grupi")
+def _m005_attendance_unique(conn):
+    # NULL grupe ne bi se sudarale u jedinstvenom indeksu – svodimo ih na ''
+    conn.execute("UPDATE attendance_members SET group_name='' WHERE group_name IS NULL")
+    # od ranijih višestrukih unosa istog dana zadržava se posljednji
+    conn.execute("""
+    DELETE FROM attendance_members
+    WHERE member_id IS NOT NULL AND id NOT IN (
+        SELECT MAX(id) FROM attendance_members GROUP BY member_id, date, group_name)""")
+    conn.execute("""CREATE UNIQUE INDEX IF NOT EXISTS ux_att_members_member_date_group
+                    ON attendance_members(member_id, date, group_name)""")
+    # (member_id, date) je prefiks novog indeksa
+    conn.execute("DROP INDEX IF EXISTS idx_att_members_member_date")
+
+
+_ROLLUP_SUMS = ("starts", "fights", "wins", "losses", "gold", "silver", "bronze")
+
+
+def _rollup_delta(table: str, keys: str, key_values: str, row: str, sign: str, source: str) -> str:
+    # upsert koji pribraja (sign='+') ili oduzima (sign='-') jedan redak rezultata
+    values = (f"{sign}1, {sign}COALESCE({row}.fights_total,0), {sign}COALESCE({row}.wins,0), "
+              f"{sign}COALESCE({row}.losses,0), {sign}COALESCE({row}.placement=1,0), "
+              f"{sign}COALESCE({row}.placement=2,0), {sign}COALESCE({row}.placement=3,0)")
+    sets = ", ".join(f"{c}={c}+excluded.{c}" for c in _ROLLUP_SUMS)
+    return (f"INSERT INTO {table}({keys}, {', '.join(_ROLLUP_SUMS)}) "
+            f"SELECT {key_values}, {values} {source} "
+            f"ON CONFLICT({keys}) DO UPDATE SET {sets};")
+
+
+def _rollup_triggers(conn):
+    stats_keys = "year, kind, age_cat, style"
+    member_keys = "member_id, year"
+
+    def stats(row, sign):
+        return _rollup_delta(
+            "stats_rollup", stats_keys,
+            f"COALESCE(c.year,0), COALESCE(c.kind,''), COALESCE(c.age_cat,''), COALESCE({row}.style,'')",
+            row, sign, f"FROM competitions c WHERE c.id={row}.competition_id")
+
+    def member(row, sign):
+        return _rollup_delta(
+            "member_stats_rollup", member_keys, f"{row}.member_id, COALESCE(c.year,0)",
+            row, sign, f"FROM competitions c WHERE c.id={row}.competition_id AND {row}.member_id IS NOT NULL")
+
+    def comp(table, keys, key_values, comp_row, sign, group_by):
+        # cijelo natjecanje odjednom (promjena godine/vrste/uzrasta, brisanje)
+        sums = (f"{sign}COUNT(*), {sign}SUM(COALESCE(r.fights_total,0)), {sign}SUM(COALESCE(r.wins,0)), "
+                f"{sign}SUM(COALESCE(r.losses,0)), {sign}SUM(COALESCE(r.placement=1,0)), "
+                f"{sign}SUM(COALESCE(r.placement=2,0)), {sign}SUM(COALESCE(r.placement=3,0))")
+        sets = ", ".join(f"{c}={c}+excluded.{c}" for c in _ROLLUP_SUMS)
+        return (f"INSERT INTO {table}({keys}, {', '.join(_ROLLUP_SUMS)}) "
+                f"SELECT {key_values}, {sums} FROM results r WHERE r.competition_id={comp_row}.id{group_by} "
+                f"ON CONFLICT({keys}) DO UPDATE SET {sets};")
+
+    def comp_stats(row, sign):
+        return comp("stats_rollup", stats_keys,
+                    f"COALESCE({row}.year,0), COALESCE({row}.kind,''), COALESCE({row}.age_cat,''), COALESCE(r.style,'')",
+                    row, sign, " GROUP BY COALESCE(r.style,'')")
+
+    def comp_member(row, sign):
+        return comp("member_stats_rollup", member_keys, f"r.member_id, COALESCE({row}.year,0)",
+                    row, sign, " AND r.member_id IS NOT NULL GROUP BY r.member_id")
+
+    cleanup = ("DELETE FROM stats_rollup WHERE starts=0; "
+               "DELETE FROM member_stats_rollup WHERE starts=0;")
+    triggers = {
+        "trg_results_rollup_insert": ("AFTER INSERT ON results", stats("NEW", "+") + member("NEW", "+")),
+        "trg_results_rollup_delete": ("AFTER DELETE ON results",
+                                      stats("OLD", "-") + member("OLD", "-") + cleanup),
+        "trg_results_rollup_update": ("AFTER UPDATE ON results",
+                                      stats("OLD", "-") + member("OLD", "-") +
+                                      stats("NEW", "+") + member("NEW", "+") + cleanup),
+        "trg_competitions_rollup_update": (
+            "AFTER UPDATE OF kind, age_cat, date_from ON competitions "
+            "WHEN OLD.kind IS NOT NEW.kind OR OLD.age_cat IS NOT NEW.age_cat OR OLD.year IS NOT NEW.year",
+            comp_stats("OLD", "-") + comp_member("OLD", "-") +
+            comp_stats("NEW", "+") + comp_member("NEW", "+") + cleanup),
+        # rezultati se brišu kaskadno tek nakon natjecanja, kad ga JOIN u njihovom
+        # okidaču više ne vidi – zato se natjecanje oduzima ovdje, unaprijed
+        "trg_competitions_rollup_delete": ("BEFORE DELETE ON competitions",
+                                           comp_stats("OLD", "-") + comp_member("OLD", "-") + cleanup),
+    }
+    for name, (when, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {when} BEGIN {body} END")
+
+
+@migration(6, "sažeci statistike (rollup)")
+def _m006_stats_rollup(conn):
+    from hk_core.rollups import rebuild
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS stats_rollup (
+        year INTEGER NOT NULL, kind TEXT NOT NULL, age_cat TEXT NOT NULL, style TEXT NOT NULL,
+        starts INTEGER NOT NULL DEFAULT 0, fights INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0, losses INTEGER NOT NULL DEFAULT 0,
+        gold INTEGER NOT NULL DEFAULT 0, silver INTEGER NOT NULL DEFAULT 0, bronze INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (year, kind, age_cat, style)
+    ) WITHOUT ROWID""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS member_stats_rollup (
+        member_id INTEGER NOT NULL, year INTEGER NOT NULL,
+        starts INTEGER NOT NULL DEFAULT 0, fights INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0, losses INTEGER NOT NULL DEFAULT 0,
+        gold INTEGER NOT NULL DEFAULT 0, silver INTEGER NOT NULL DEFAULT 0, bronze INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (member_id, year)
+    ) WITHOUT ROWID""")
+    _rollup_triggers(conn)
+    rebuild(conn)
+
+
+@migration(7, "spremište datoteka (files)")
+def _m007_files(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS files (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sha256 TEXT NOT NULL, size INTEGER NOT NULL, mime TEXT,
+        original_name TEXT NOT NULL DEFAULT '', kind TEXT NOT NULL DEFAULT '',
+        uploaded_at TEXT
+    )""")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_files_sha_name_kind ON files(sha256, original_name, kind)")
+
+
+def _bouts_select(result_id: str, column: str, outcome: str, source: str = "") -> str:
+    # 'ime;klub' iz JSON liste (ili objekta iz pd.Series.to_json) -> redci tablice bouts
+    return f"""
+    INSERT INTO bouts(result_id, opponent_name, opponent_club, outcome)
+    SELECT {result_id},
+           trim(CASE WHEN instr(j.value, ';') THEN substr(j.value, 1, instr(j.value, ';') - 1) ELSE j.value END),
+           trim(CASE WHEN instr(j.value, ';') THEN substr(j.value, instr(j.value, ';') + 1) ELSE '' END),
+           '{outcome}'
+    FROM {source}json_each(CASE WHEN json_valid({column}) THEN {column} ELSE '[]' END) j
+    WHERE j.type = 'text' AND trim(j.value) <> ''"""
+
+
+@migration(8, "borbe (bouts) iz wins/losses_detail_json")
+def _m008_bouts(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS bouts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        result_id INTEGER NOT NULL REFERENCES results(id) ON DELETE CASCADE,
+        opponent_name TEXT COLLATE NOCASE NOT NULL,
+        opponent_club TEXT COLLATE NOCASE NOT NULL DEFAULT '',
+        outcome TEXT NOT NULL CHECK (outcome IN ('W', 'L'))
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bouts_result ON bouts(result_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bouts_opponent ON bouts(opponent_name, outcome)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bouts_club ON bouts(opponent_club, outcome)")
+
+    conn.execute(_bouts_select("r.id", "r.wins_detail_json", "W", source="results r, "))
+    conn.execute(_bouts_select("r.id", "r.losses_detail_json", "L", source="results r, "))
+
+    # ručni unos, Excel uvoz i sve druge putanje pišu results – borbe prate okidači
+    new_rows = (_bouts_select("NEW.id", "NEW.wins_detail_json", "W") + ";" +
+                _bouts_select("NEW.id", "NEW.losses_detail_json", "L") + ";")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_results_bouts_insert AFTER INSERT ON results BEGIN {new_rows} END")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_results_bouts_update
+                     AFTER UPDATE OF wins_detail_json, losses_detail_json ON results
+                     BEGIN DELETE FROM bouts WHERE result_id = NEW.id; {new_rows} END""")
+
+
+@migration(9, "globalna pretraga (FTS5)")
+def _m009_search(conn):
+    from hk_core.search import install, rebuild
+
+    install(conn)
+    rebuild(conn)
+
+
+@migration(10, "indeks za straničenje popisa članova")
+def _m010_members_page(conn):
+    # izrazi moraju biti isti kao hk_core.members.PAGE_SORT
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_members_page
+                    ON members(COALESCE(last_name, ''), COALESCE(first_name, ''), id)""")
+
+
+@migration(11, "istek dokumenata (indeksi i tablica expiring_documents)")
+def _m011_document_expiry(conn):
+    from hk_core.expiry import DOCS
+
+    for doc, (_, column) in DOCS.items():
+        # (datum, grupa) + rowid: upit po rasponu datuma ne čita retke tablice members
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_members_{doc}_until ON members({column}, group_name)")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS expiring_documents (
+        doc TEXT NOT NULL,
+        member_id INTEGER NOT NULL REFERENCES members(id) ON DELETE CASCADE,
+        valid_until TEXT NOT NULL,
+        group_name TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (doc, member_id)
+    ) WITHOUT ROWID""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_expiring_until ON expiring_documents(valid_until)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_expiring_member ON expiring_documents(member_id)")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS expiry_refresh (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        day TEXT, refreshed_at TEXT, horizon_days INTEGER, rows INTEGER
+    )""")
+
+
+@migration(12, "red slanja e-maila (outbox)")
+def _m012_outbox(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        comm_id INTEGER NOT NULL REFERENCES comm_log(id) ON DELETE CASCADE,
+        member_id INTEGER REFERENCES members(id) ON DELETE SET NULL,
+        email TEXT NOT NULL COLLATE NOCASE,
+        status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'sending', 'sent', 'failed')),
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at TEXT NOT NULL,
+        sent_at TEXT, last_error TEXT,
+        UNIQUE (comm_id, email)
+    )""")
+    # radnik traži sljedeće za slanje; sažetak i prikaz idu po poruci (UNIQUE indeks)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt_at)")
+
+
+@migration(13, "spremljeni segmenti primatelja")
+def _m013_segments(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS segments (
+        name TEXT PRIMARY KEY,
+        definition_json TEXT NOT NULL CHECK (json_valid(definition_json)),
+        updated_at TEXT
+    )""")
+    # zadani segmenti umjesto starih kvačica "samo aktivni" / "samo veterani"
+    conn.executemany("INSERT OR IGNORE INTO segments(name, definition_json) VALUES(?,?)", [
+        ("Aktivni natjecatelji", '{"active": true}'),
+        ("Veterani", '{"veteran": true}'),
+        ("Roditelji U15 natjecatelja", '{"age_cats": ["U15"], "active": true, "audience": "parent"}'),
+    ])
+
+
+@migration(14, "pozadinski poslovi (uvoz/izvoz)")
+def _m014_jobs(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        label TEXT NOT NULL DEFAULT '',
+        status TEXT NOT NULL DEFAULT 'queued'
+            CHECK (status IN ('queued', 'running', 'done', 'failed', 'cancelled')),
+        phase TEXT NOT NULL DEFAULT '',
+        progress REAL NOT NULL DEFAULT 0,
+        done_rows INTEGER NOT NULL DEFAULT 0,
+        total_rows INTEGER,
+        report_json TEXT CHECK (report_json IS NULL OR json_valid(report_json)),
+        result_path TEXT,
+        error TEXT,
+        created_at TEXT NOT NULL,
+        started_at TEXT, finished_at TEXT
+    )""")
+    # popis zadnjih poslova i oporavak nedovršenih nakon ponovnog pokretanja
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id)")
+
+
+@migration(15, "treneri: zamijenjeni contract_path i other_docs_json")
+def _m015_coach_docs(conn):
+    # obrazac za trenere upisivao je JSON popis dokumenata u contract_path, a ugovor u other_docs_json
+    conn.execute("""
+    UPDATE coaches SET contract_path = other_docs_json, other_docs_json = contract_path
+    WHERE contract_path LIKE '[%' AND (other_docs_json IS NULL OR other_docs_json NOT LIKE '[%')""")
+
+
+@migration(16, "pretraga: preimenovanje člana/natjecanja osvježava rezultate i prisustvo")
+def _m016_search_rename(conn):
+    from hk_core.search import install, rebuild
+
+    install(conn)
+    # naslovi koji su već zastarjeli
+    rebuild(conn)
+
+
+# ==========================
+# POKRETANJE
+# ==========================
+def _ensure_version_table(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT, applied_at TEXT
+    )""")
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def schema_version(conn) -> int:
+    _ensure_version_table(conn)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def _seed_club(conn, club: Dict[str, str]):
+    if conn.execute("SELECT 1 FROM club_info WHERE id=1").fetchone() is None:
+        conn.execute("""INSERT INTO club_info
+            (id, name, email, address, oib, web, iban, president, secretary, board_json, supervisory_json, instagram, facebook, tiktok)
+            VALUES (1,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
+            (club.get("name", ""), club.get("email", ""), club.get("address", ""), club.get("oib", ""),
+             club.get("web", ""), club.get("iban", ""), "", "", "[]", "[]", "", "", ""))
+        conn.commit()
+
+
+def migrate(conn, club: Optional[Dict[str, str]] = None) -> List[int]:
+    """
+    Dovodi bazu na najnoviju verziju sheme i vraća listu primijenjenih verzija.
+    Ako je zadan `club` (name, email, address, oib, web, iban), a redak
+    club_info još ne postoji, upisuje osnovne podatke kluba.
+    """
+    _ensure_version_table(conn)
+    conn.commit()
+    done = {r[0] for r in conn.execute("SELECT version FROM schema_version")}
+    applied = []
+    for version, name, step in MIGRATIONS:
+        if version in done:
+            continue
+        # BEGIN IMMEDIATE: dva procesa ne smiju istu migraciju pokrenuti dvaput
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM schema_version WHERE version=?", (version,)).fetchone():
+                conn.rollback()
+                continue
+            step(conn)
+            conn.execute("INSERT INTO schema_version(version, name, applied_at) VALUES(?,?,?)",
+                         (version, name, datetime.now().isoformat(timespec="seconds")))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    if club:
+        _seed_club(conn, club)
+    return applied
+
+
+if __name__ == "__main__":
+    from hk_core.db import open_connection
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "hk_podravka.db"
+    c = open_connection(path)
+    try:
+        done = migrate(c)
+        print(f"{path}: verzija sheme {schema_version(c)} (primijenjeno: {done or 'ništa'})")
+    finally:
+        c.close()
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Profiliranje: kamo odlazi vrijeme jednog reruna.
+
+    with span("sidebar"): ...            # mjeri blok
+    @timed(kind="section")               # mjeri funkciju (npr. section_members)
+
+Dok je profiliranje uključeno, PooledConnection (hk_core.db) vraća
+ProfiledCursor koji mjeri execute i dohvat redaka (i kad upit čita
+pd.read_sql_query), pa svaki upit ulazi u otvoreni blok s tekstom,
+parametrima, brojem redaka i trajanjem. Upiti sporiji od `slow_ms` idu u
+dnevnik sporih upita (i logger hk_core.profiling, ali bez parametara – to
+su OIB-i, e-mailovi i imena; vide se samo na stranici Performanse, koja
+traži administratora). Za svaki blok i upit
+čuva se zadnjih `window` trajanja (percentili), a za zadnjih nekoliko
+rerunova cijelo stablo blokova.
+
+Kad je isključeno (zadano), blokovi, dekorator i konekcija rade samo jednu
+provjeru zastavice. Uključuje se s HK_PROFILE=1 ili PROFILER.configure();
+prag sporog upita je HK_SLOW_QUERY_MS (zadano 200 ms).
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import wraps
+from typing import Deque, Dict, List, Optional, Tuple
+
+SLOW_QUERY_MS = 200.0
+WINDOW = 500
+MAX_KEYS = 500
+SLOW_LOG_SIZE = 200
+TRACES = 20
+PARAMS_CHARS = 200
+
+_log = logging.getLogger("hk_core.profiling")
+
+
+def _normalize(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+@dataclass
+class QueryRecord:
+    sql: str
+    params: str
+    rows: int
+    ms: float
+    span: str = ""
+    at: str = ""
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    ms: float = 0.0
+    at: str = ""
+    children: List["Span"] = field(default_factory=list)
+    queries: List[QueryRecord] = field(default_factory=list)
+
+    @property
+    def sql_ms(self) -> float:
+        return sum(q.ms for q in self.queries)
+
+    @property
+    def self_ms(self) -> float:
+        """Vrijeme izvan upita i podblokova (pandas, Excel, iscrtavanje widgeta)."""
+        return self.ms - self.sql_ms - sum(c.ms for c in self.children)
+
+    def flatten(self, depth: int = 0) -> List[dict]:
+        out = [{"blok": "  " * depth + self.name, "vrsta": self.kind, "ukupno_ms": round(self.ms, 1),
+                "sql_ms": round(self.sql_ms, 1), "upita": len(self.queries), "ostalo_ms": round(self.self_ms, 1)}]
+        for c in self.children:
+            out += c.flatten(depth + 1)
+        return out
+
+    def all_queries(self) -> List[QueryRecord]:
+        out = list(self.queries)
+        for c in self.children:
+            out += c.all_queries()
+        return out
+
+
+class _SpanContext:
+    __slots__ = ("profiler", "name", "kind", "span", "t0")
+
+    def __init__(self, profiler: "Profiler", name: str, kind: str):
+        self.profiler, self.name, self.kind, self.span = profiler, name, kind, None
+
+    def __enter__(self) -> Optional[Span]:
+        p = self.profiler
+        if not p.enabled:
+            return None
+        stack = p._stack()
+        self.span = Span(self.name, self.kind, at=datetime.now().isoformat(timespec="seconds"))
+        if stack:
+            stack[-1].children.append(self.span)
+        stack.append(self.span)
+        self.t0 = time.perf_counter()
+        return self.span
+
+    def __exit__(self, *exc):
+        span = self.span
+        if span is None:
+            return False
+        span.ms = (time.perf_counter() - self.t0) * 1000
+        p = self.profiler
+        stack = p._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        p._sample(span.kind, span.name, span.ms)
+        if not stack:
+            with p._lock:
+                p.traces.append(span)
+        return False
+
+
+class Profiler:
+    """Jedan po procesu (PROFILER); dijele ga sve sesije i dretve."""
+
+    def __init__(self, enabled: bool = False, slow_ms: float = SLOW_QUERY_MS, window: int = WINDOW):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.window = window
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self.slow: Deque[QueryRecord] = deque(maxlen=SLOW_LOG_SIZE)
+        self.traces: Deque[Span] = deque(maxlen=TRACES)
+
+    @classmethod
+    def from_env(cls) -> "Profiler":
+        enabled = os.environ.get("HK_PROFILE", "").lower() in ("1", "true", "yes", "da")
+        return cls(enabled, float(os.environ.get("HK_SLOW_QUERY_MS", SLOW_QUERY_MS)))
+
+    def configure(self, enabled: Optional[bool] = None, slow_ms: Optional[float] = None):
+        if enabled is not None:
+            self.enabled = bool(enabled)
+        if slow_ms is not None:
+            self.slow_ms = float(slow_ms)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self.slow.clear()
+            self.traces.clear()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _sample(self, kind: str, name: str, ms: float):
+        key = (kind, name)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                if len(self._samples) >= MAX_KEYS:
+                    # najstariji ključ van – dinamički SQL ne smije rasti bez granice
+                    self._samples.pop(next(iter(self._samples)))
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(ms)
+
+    # ---------- mjerenje ----------
+    def span(self, name: str, kind: str = "span") -> _SpanContext:
+        return _SpanContext(self, name, kind)
+
+    def timed(self, name: Optional[str] = None, kind: str = "span"):
+        def deco(fn):
+            label = name or fn.__name__
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _SpanContext(self, label, kind):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    def record_query(self, sql: str, params, rows: int, ms: float):
+        stack = self._stack()
+        text = _normalize(sql)
+        rec = QueryRecord(text, repr(params)[:PARAMS_CHARS] if params else "", rows, ms,
+                          stack[-1].name if stack else "")
+        if stack:
+            stack[-1].queries.append(rec)
+        self._sample("query", text, ms)
+        if ms >= self.slow_ms:
+            rec.at = datetime.now().isoformat(timespec="seconds")
+            with self._lock:
+                self.slow.append(rec)
+            _log.warning("spor upit %.1f ms (%d redaka) u %s: %s", ms, rows, rec.span or "-", text)
+
+    # ---------- pregled ----------
+    def stats(self, kind: Optional[str] = None) -> List[dict]:
+        """Percentili zadnjih `window` mjerenja po bloku/upitu, najveće ukupno vrijeme prvo."""
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._samples.items() if kind is None or k[0] == kind]
+        out = []
+        for (k, name), xs in items:
+            xs.sort()
+            n = len(xs)
+            out.append({"vrsta": k, "ime": name, "n": n, "p50_ms": round(xs[(n - 1) // 2], 1),
+                        "p95_ms": round(xs[min(n - 1, int(n * 0.95))], 1), "max_ms": round(xs[-1], 1),
+                        "ukupno_ms": round(sum(xs), 1)})
+        out.sort(key=lambda r: r["ukupno_ms"], reverse=True)
+        return out
+
+    def recent_traces(self) -> List[Span]:
+        with self._lock:
+            return list(reversed(self.traces))
+
+
+PROFILER = Profiler.from_env()
+
+
+def span(name: str, kind: str = "span") -> _SpanContext:
+    return PROFILER.span(name, kind)
+
+
+def timed(name: Optional[str] = None, kind: str = "span"):
+    return PROFILER.timed(name, kind)
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    Kursor koji zbraja vrijeme execute i dohvata redaka. Upit se bilježi kad
+    je pročitan do kraja, na idući execute/close ili kad kursor nestane.
+    """
+
+    _query: Optional[list] = None
+
+    def _finish(self):
+        q = self._query
+        if q is not None:
+            self._query = None
+            PROFILER.record_query(q[0], q[1], q[3], q[2])
+
+    def _fetched(self, t0: float, n: int, done: bool):
+        q = self._query
+        if q is not None:
+            q[2] += (time.perf_counter() - t0) * 1000
+            q[3] += n
+            if done:
+                self._finish()
+
+    def execute(self, sql, params=()):
+        self._finish()
+        t0 = time.perf_counter()
+        super().execute(sql, params)
+        # [sql, parametri, ms, redaka]
+        self._query = [sql, params, (time.perf_counter() - t0) * 1000, 0]
+        if self.description is None:
+            self._query[3] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._finish()
+        t0 = time.perf_counter()
+        super().executemany(sql, seq_of_params)
+        PROFILER.record_query(sql, "executemany", max(self.rowcount, 0), (time.perf_counter() - t0) * 1000)
+        return self
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(t0, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        t0 = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(t0, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        t0 = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(t0, len(rows), True)
+        return rows
+
+    def __next__(self):
+        t0 = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(t0, 0, True)
+            raise
+        self._fetched(t0, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+"Vruće" SQL upite koje aplikacija izvršava na svakom iscrtavanju i provjera
+da svaki od njih koristi indeks (EXPLAIN QUERY PLAN).
+
+    python -m hk_core.queries hk_podravka.db
+
+ispisuje plan svakog upita i vraća izlazni kod 1 ako neki upit radi puni
+prolaz (SCAN) kroz tablicu koju filtrira.
+"""
+
+import sys
+from typing import Dict, List, Tuple
+
+from hk_core import expiry
+
+# sažeci se održavaju okidačima (hk_core.rollups) – čitanje je pretraga po ključu
+STATS_BY_YEAR = """
+    SELECT kind, age_cat, style, starts AS startova, fights AS borbi, wins AS pobjede, losses AS porazi,
+           gold AS zlato, silver AS srebro, bronze AS bronca
+    FROM stats_rollup WHERE year=?
+    ORDER BY kind, age_cat, style
+"""
+
+MEMBER_STATS_BY_YEAR = """
+    SELECT starts, fights, wins, losses, gold, silver, bronze
+    FROM member_stats_rollup WHERE member_id=? AND year=?
+"""
+
+MEMBER_RESULTS_BY_YEAR = """
+    SELECT c.date_from, c.kind, c.name, r.category, r.style, r.fights_total, r.wins, r.losses, r.placement
+    FROM results r JOIN competitions c ON r.competition_id=c.id
+    WHERE r.member_id=? AND c.year=?
+    ORDER BY c.date_from DESC
+"""
+
+MEMBER_RESULTS = """
+    SELECT c.date_from AS datum, COALESCE(c.name, c.kind) AS natjecanje, r.category, r.style,
+           r.fights_total AS borbi, r.wins AS pobjeda, r.losses AS poraza, r.placement AS plasman
+    FROM results r JOIN competitions c ON r.competition_id=c.id
+    WHERE r.member_id=? ORDER BY c.date_from DESC
+"""
+
+RESULTS_BY_YEAR = """
+    SELECT c.date_from, c.kind, c.name, c.place, c.style, c.age_cat, r.member_id,
+           (SELECT first_name || ' ' || last_name FROM members m WHERE m.id=r.member_id) AS sportas,
+           r.category, r.fights_total, r.wins, r.losses, r.placement
+    FROM results r JOIN competitions c ON r.competition_id=c.id
+    WHERE c.year=? ORDER BY c.date_from DESC
+"""
+
+VETERANS = """
+    SELECT id, first_name || ' ' || last_name AS full, athlete_email, parent_email
+    FROM members WHERE veteran=1 ORDER BY full
+"""
+
+ATTENDANCE_BY_MEMBER = """
+    SELECT date, group_name, present, minutes, note FROM attendance_members
+    WHERE member_id=? AND date BETWEEN ? AND ? ORDER BY date
+"""
+
+ATTENDANCE_SHEET = """
+    SELECT m.id, m.first_name || ' ' || m.last_name AS full,
+           COALESCE(a.present, 0) AS present, COALESCE(a.minutes, 60) AS minutes, COALESCE(a.note, '') AS note
+    FROM members m
+    LEFT JOIN attendance_members a ON a.member_id=m.id AND a.date=? AND a.group_name=?
+    WHERE m.group_name=? ORDER BY full
+"""
+
+# borbe protiv jednog protivnika / kluba, po našem sportašu (indeks na bouts)
+HEAD_TO_HEAD = """
+    SELECT m.first_name || ' ' || m.last_name AS sportas, b.opponent_name AS protivnik, b.opponent_club AS klub,
+           COUNT(*) AS borbi, SUM(b.outcome='W') AS pobjede, SUM(b.outcome='L') AS porazi,
+           MAX(c.date_from) AS zadnja_borba
+    FROM bouts b
+    JOIN results r ON r.id=b.result_id
+    LEFT JOIN members m ON m.id=r.member_id
+    LEFT JOIN competitions c ON c.id=r.competition_id
+    WHERE b.opponent_name=?
+    GROUP BY r.member_id, b.opponent_name, b.opponent_club
+    ORDER BY borbi DESC
+"""
+
+CLUB_VS_CLUB = """
+    SELECT m.first_name || ' ' || m.last_name AS sportas,
+           COUNT(*) AS borbi, SUM(b.outcome='W') AS pobjede, SUM(b.outcome='L') AS porazi,
+           COUNT(DISTINCT b.opponent_name) AS protivnika, MAX(c.date_from) AS zadnja_borba
+    FROM bouts b
+    JOIN results r ON r.id=b.result_id
+    LEFT JOIN members m ON m.id=r.member_id
+    LEFT JOIN competitions c ON c.id=r.competition_id
+    WHERE b.opponent_club=?
+    GROUP BY r.member_id
+    ORDER BY borbi DESC
+"""
+
+# ime -> (sql, primjer parametara, tablice koje se ne smiju skenirati)
+HOT_QUERIES: Dict[str, Tuple[str, tuple, Tuple[str, ...]]] = {
+    "stats_by_year": (STATS_BY_YEAR, (2024,), ("stats_rollup",)),
+    "member_stats_by_year": (MEMBER_STATS_BY_YEAR, (1, 2024), ("member_stats_rollup",)),
+    "member_results_by_year": (MEMBER_RESULTS_BY_YEAR, (1, 2024), ("competitions", "results")),
+    "member_results": (MEMBER_RESULTS, (1,), ("results",)),
+    "results_by_year": (RESULTS_BY_YEAR, (2024,), ("competitions", "results")),
+    "veterans": (VETERANS, (), ("members",)),
+    "attendance_by_member": (ATTENDANCE_BY_MEMBER, (1, "2024-01-01", "2024-12-31"), ("attendance_members",)),
+    "head_to_head": (HEAD_TO_HEAD, ("Ivan Horvat",), ("bouts", "results", "members", "competitions")),
+    "club_vs_club": (CLUB_VS_CLUB, ("HK Zagreb",), ("bouts", "results", "members", "competitions")),
+    "expiring_window": (expiry.EXPIRING_WINDOW, ("2024-01-01", "2024-12-31", None), ("members",)),
+    "expiring_soon": (expiry.EXPIRING_SOON, ("2024-12-31", None, None), ("expiring_documents", "members")),
+    "attendance_sheet": (ATTENDANCE_SHEET, ("2024-01-01", "Hrvači", "Hrvači"), ("members", "attendance_members")),
+}
+
+
+def explain(conn, sql: str, params=()) -> List[str]:
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+
+
+def _table_aliases(sql: str, tables) -> Dict[str, str]:
+    # plan ispisuje alias (npr. "SCAN r"), pa mapiramo alias -> tablica
+    tokens = sql.replace(",", " ").replace("\n", " ").split()
+    aliases = {}
+    for i, tok in enumerate(tokens):
+        if tok in tables:
+            aliases[tok] = tok
+            if i + 1 < len(tokens) and tokens[i + 1].isidentifier() and tokens[i + 1].upper() not in (
+                    "JOIN", "WHERE", "ON", "ORDER", "GROUP", "LEFT", "INNER", "AS"):
+                aliases[tokens[i + 1]] = tok
+    return aliases
+
+
+def check_indexes(conn) -> List[Tuple[str, List[str], bool]]:
+    """Vraća (ime, plan, ok) za svaki vrući upit; ok=False znači puni SCAN."""
+    report = []
+    for name, (sql, params, tables) in HOT_QUERIES.items():
+        plan = explain(conn, sql, params)
+        aliases = _table_aliases(sql, tables)
+        ok = True
+        for step in plan:
+            parts = step.split()
+            if len(parts) >= 2 and parts[0] == "SCAN" and parts[1] in aliases:
+                ok = False
+        report.append((name, plan, ok))
+    return report
+
+
+if __name__ == "__main__":
+    from hk_core.db import open_connection
+    from hk_core.migrations import migrate
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "hk_podravka.db"
+    c = open_connection(path)
+    try:
+        migrate(c)
+        failed = 0
+        for name, plan, ok in check_indexes(c):
+            print(f"[{'OK ' if ok else 'SCAN'}] {name}")
+            for step in plan:
+                print(f"       {step}")
+            failed += not ok
+        sys.exit(1 if failed else 0)
+    finally:
+        c.close()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Sažeci statistike (materijalizirani rollup).
+
+    stats_rollup         – po godini, vrsti natjecanja, uzrastu i stilu
+    member_stats_rollup  – po sportašu i godini
+
+Okidači iz migracije 6 održavaju ih inkrementalno pri svakom upisu, izmjeni
+ili brisanju rezultata i natjecanja (bez obzira na to koji dio aplikacije
+piše), pa stranica statistike samo čita gotove retke. Potpuna obnova:
+
+    python -m hk_core.rollups hk_podravka.db           # obnovi
+    python -m hk_core.rollups hk_podravka.db --check   # usporedi s izvornim podacima
+"""
+
+import sys
+from typing import List, Tuple
+
+_SUMS = """
+    COUNT(*), SUM(COALESCE(r.fights_total,0)), SUM(COALESCE(r.wins,0)), SUM(COALESCE(r.losses,0)),
+    SUM(COALESCE(r.placement=1,0)), SUM(COALESCE(r.placement=2,0)), SUM(COALESCE(r.placement=3,0))
+"""
+
+STATS_SOURCE = f"""
+    SELECT COALESCE(c.year,0), COALESCE(c.kind,''), COALESCE(c.age_cat,''), COALESCE(r.style,''), {_SUMS}
+    FROM results r JOIN competitions c ON c.id=r.competition_id
+    GROUP BY 1, 2, 3, 4
+"""
+
+MEMBER_SOURCE = f"""
+    SELECT r.member_id, COALESCE(c.year,0), {_SUMS}
+    FROM results r JOIN competitions c ON c.id=r.competition_id
+    WHERE r.member_id IS NOT NULL
+    GROUP BY 1, 2
+"""
+
+_COLUMNS = "starts, fights, wins, losses, gold, silver, bronze"
+
+
+def rebuild(conn) -> Tuple[int, int]:
+    """Puni oba sažetka iz početka. Ne radi commit – poziva se unutar transakcije."""
+    conn.execute("DELETE FROM stats_rollup")
+    conn.execute("DELETE FROM member_stats_rollup")
+    conn.execute(f"INSERT INTO stats_rollup(year, kind, age_cat, style, {_COLUMNS}) {STATS_SOURCE}")
+    conn.execute(f"INSERT INTO member_stats_rollup(member_id, year, {_COLUMNS}) {MEMBER_SOURCE}")
+    return (conn.execute("SELECT COUNT(*) FROM stats_rollup").fetchone()[0],
+            conn.execute("SELECT COUNT(*) FROM member_stats_rollup").fetchone()[0])
+
+
+def check(conn) -> List[str]:
+    """Razlike između sažetaka i izvornih podataka (prazna lista = sve u redu)."""
+    problems = []
+    for table, keys, source in (("stats_rollup", "year, kind, age_cat, style", STATS_SOURCE),
+                                ("member_stats_rollup", "member_id, year", MEMBER_SOURCE)):
+        stored = f"SELECT {keys}, {_COLUMNS} FROM {table}"
+        for label, a, b in (("višak", stored, source), ("nedostaje", source, stored)):
+            for row in conn.execute(f"{a} EXCEPT {b}").fetchall():
+                problems.append(f"{table} {label}: {row}")
+    return problems
+
+
+if __name__ == "__main__":
+    from hk_core.db import open_connection
+    from hk_core.migrations import migrate
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "hk_podravka.db"
+    c = open_connection(path)
+    try:
+        migrate(c)
+        if "--check" in sys.argv:
+            diff = check(c)
+            print("\n".join(diff) or f"{path}: sažeci odgovaraju rezultatima")
+            sys.exit(1 if diff else 0)
+        c.execute("BEGIN IMMEDIATE")
+        n_stats, n_members = rebuild(c)
+        c.commit()
+        print(f"{path}: stats_rollup {n_stats} redaka, member_stats_rollup {n_members} redaka")
+    finally:
+        c.close()
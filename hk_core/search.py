@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Globalna pretraga (SQLite FTS5) po članovima, trenerima, natjecanjima i
+bilješkama (rezultati, prisustvo).
+
+Sve je u jednoj virtualnoj tablici search_index; rowid = id * 8 + vrsta, pa
+okidači (migracija 9) održavaju točno jedan redak po izvoru. Naslovi
+rezultata i prisustva sadrže ime člana i natjecanja, pa preimenovanje člana
+ili natjecanja ponovno indeksira te retke (DEPENDENTS, migracija 16). Tokenizer
+unicode61 s remove_diacritics 2 izjednačava č/ć/š/ž s c/s/z. Slovo đ nema
+Unicode rastav, pa stupac alt za tekstove s đ sadrži i oblike "dj" i "d"
+(Đurđević -> Djurdjevic, Durdevic); upit se normalizira na "dj".
+
+    python -m hk_core.search hk_podravka.db "horvat"
+    python -m hk_core.search hk_podravka.db --rebuild
+"""
+
+import re
+import sys
+from typing import Dict, List, Tuple
+
+# vrsta -> (oznaka, tablica, naslov, tekst, uvjet); {r} je alias retka (NEW ili tablica)
+SOURCES: Dict[int, Tuple[str, str, Tuple[str, ...], Tuple[str, ...], str]] = {
+    1: ("Član", "members",
+        ("{r}.first_name", "{r}.last_name"),
+        ("{r}.oib", "{r}.athlete_email", "{r}.parent_email", "{r}.city", "{r}.group_name"), ""),
+    2: ("Trener", "coaches",
+        ("{r}.first_name", "{r}.last_name"),
+        ("{r}.oib", "{r}.email", "{r}.group_name"), ""),
+    3: ("Natjecanje", "competitions",
+        ("{r}.name",),
+        ("{r}.kind", "{r}.kind_other", "{r}.place", "{r}.country", "{r}.date_from", "{r}.notes"), ""),
+    4: ("Rezultat", "results",
+        ("(SELECT first_name || ' ' || last_name FROM members WHERE id={r}.member_id)",
+         "'–'", "(SELECT COALESCE(name, kind) FROM competitions WHERE id={r}.competition_id)"),
+        ("{r}.category", "{r}.note"), "COALESCE({r}.note, '') <> ''"),
+    5: ("Prisustvo", "attendance_members",
+        ("(SELECT first_name || ' ' || last_name FROM members WHERE id={r}.member_id)", "{r}.date"),
+        ("{r}.group_name", "{r}.note", "{r}.camp_where"), "COALESCE({r}.note, '') <> ''"),
+}
+
+# (tablica, stupci imena) -> vrste čiji naslov ih prepisuje i stupac veze
+DEPENDENTS: Dict[Tuple[str, Tuple[str, ...]], Tuple[Tuple[int, str], ...]] = {
+    ("members", ("first_name", "last_name")): ((4, "member_id"), (5, "member_id")),
+    ("competitions", ("name", "kind")): ((4, "competition_id"),),
+}
+
+KIND_SLOTS = 8
+
+
+def _join(exprs, r: str) -> str:
+    return " || ' ' || ".join(f"COALESCE({e.format(r=r)}, '')" for e in exprs)
+
+
+def _fold_dj(text: str) -> str:
+    both = f"({text})"
+    return (f"CASE WHEN instr({both}, 'đ') OR instr({both}, 'Đ') "
+            f"THEN replace(replace({both}, 'đ', 'dj'), 'Đ', 'Dj') || ' ' || replace(replace({both}, 'đ', 'd'), 'Đ', 'D') "
+            f"ELSE '' END")
+
+
+def _insert_sql(kind: int, r: str, source: str = "", extra: str = "") -> str:
+    _, table, title, body, where = SOURCES[kind]
+    t, b = _join(title, r), _join(body, r)
+    alt = _fold_dj(f"{t} || ' ' || {b}")
+    cond = " AND ".join(c for c in (where.format(r=r), extra) if c) or "1"
+    return (f"INSERT INTO search_index(rowid, kind, ref_id, title, body, alt) "
+            f"SELECT {r}.id * {KIND_SLOTS} + {kind}, {kind}, {r}.id, {t}, {b}, {alt} "
+            f"{source} WHERE {cond}")
+
+
+def install(conn):
+    """Virtualna tablica i okidači (poziva migracija 9)."""
+    conn.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                        kind UNINDEXED, ref_id UNINDEXED, title, body, alt,
+                        tokenize = 'unicode61 remove_diacritics 2')""")
+    for kind, (_, table, _, _, _) in SOURCES.items():
+        delete = f"DELETE FROM search_index WHERE rowid = OLD.id * {KIND_SLOTS} + {kind};"
+        insert = _insert_sql(kind, "NEW") + ";"
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_insert AFTER INSERT ON {table} BEGIN {insert} END")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_update AFTER UPDATE ON {table} BEGIN {delete} {insert} END")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_delete AFTER DELETE ON {table} BEGIN {delete} END")
+    for (table, columns), deps in DEPENDENTS.items():
+        steps = []
+        for kind, fk in deps:
+            dep = SOURCES[kind][1]
+            steps.append(f"DELETE FROM search_index WHERE rowid IN "
+                         f"(SELECT id * {KIND_SLOTS} + {kind} FROM {dep} WHERE {fk} = NEW.id);")
+            steps.append(_insert_sql(kind, "s", source=f"FROM {dep} s", extra=f"s.{fk} = NEW.id") + ";")
+        # uvoz (upsert) prepisuje ime istom vrijednošću – tada nema što osvježiti
+        changed = " OR ".join(f"NEW.{c} IS NOT OLD.{c}" for c in columns)
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_search_rename
+                         AFTER UPDATE OF {", ".join(columns)} ON {table} WHEN {changed}
+                         BEGIN {" ".join(steps)} END""")
+
+
+def rebuild(conn) -> int:
+    """Puni indeks iz početka. Ne radi commit."""
+    conn.execute("DELETE FROM search_index")
+    for kind, (_, table, _, _, _) in SOURCES.items():
+        conn.execute(_insert_sql(kind, "s", source=f"FROM {table} s"))
+    return conn.execute("SELECT COUNT(*) FROM search_index").fetchone()[0]
+
+
+def fts_query(text: str) -> str:
+    """Korisnički upit -> FTS5 izraz: svaka riječ kao prefiks, sve riječi obavezne."""
+    text = text.replace("đ", "dj").replace("Đ", "Dj")
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{w}"*' for w in words)
+
+
+SEARCH_SQL = """
+    SELECT kind, ref_id, title,
+           snippet(search_index, 3, '**', '**', '…', 10) AS snippet
+    FROM search_index WHERE search_index MATCH ?
+    ORDER BY bm25(search_index, 0, 0, 10.0, 1.0, 5.0)
+    LIMIT ? OFFSET ?
+"""
+
+
+def search(conn, text: str, limit: int = 10, offset: int = 0) -> Tuple[List[dict], bool]:
+    """Rangirani rezultati za stranicu; drugi element kaže ima li još rezultata."""
+    q = fts_query(text)
+    if not q:
+        return [], False
+    rows = conn.execute(SEARCH_SQL, (q, limit + 1, offset)).fetchall()
+    hits = [{"vrsta": SOURCES[k][0], "kind": k, "id": i, "naslov": t, "isječak": s}
+            for k, i, t, s in rows[:limit]]
+    return hits, len(rows) > limit
+
+
+if __name__ == "__main__":
+    from hk_core.db import open_connection
+    from hk_core.migrations import migrate
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "hk_podravka.db"
+    c = open_connection(path)
+    try:
+        migrate(c)
+        if "--rebuild" in sys.argv:
+            c.execute("BEGIN IMMEDIATE")
+            n = rebuild(c)
+            c.commit()
+            print(f"{path}: search_index {n} redaka")
+        else:
+            for hit in search(c, " ".join(sys.argv[2:]), limit=20)[0]:
+                print(f"{hit['vrsta']:<11} {hit['id']:>6}  {hit['naslov']}  | {hit['isječak']}")
+    finally:
+        c.close()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Publika za obavijesti (segmenti): tko sve dobiva poruku.
+
+Segment opisuje članove uvjetima (grupe, uzrast iz datuma rođenja,
+aktivni/veteran, članarina, valjana liječnička, nastup u godini X, ručno
+odabrani članovi) i kome se piše (sportašu, roditelju ili obojici).
+recipients() ga prevodi u jedan SQL upit koji vraća popis adresa bez
+duplikata – isti upit za deset ili deset tisuća članova. Segmenti se
+spremaju pod imenom u tablicu segments (migracija 13) kao JSON.
+"""
+
+import json
+from dataclasses import asdict, dataclass, field, fields
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# uzrast = godina sezone − godina rođenja, kao kod prijava na natjecanja
+AGE_CATS: Dict[str, Tuple[int, int]] = {
+    "POČETNICI": (0, 8),
+    "U11": (9, 10),
+    "U13": (11, 12),
+    "U15": (13, 14),
+    "U17": (15, 16),
+    "U20": (17, 19),
+    "U23": (18, 22),
+    "SENIORI": (18, 34),
+    "VETERANI": (35, 120),
+}
+
+AUDIENCES: Dict[str, Tuple[str, ...]] = {
+    "both": ("athlete_email", "parent_email"),
+    "athlete": ("athlete_email",),
+    "parent": ("parent_email",),
+}
+
+# MIN(member_id) uz "gole" stupce: SQLite uzima ime i adresu iz istog retka
+_RECIPIENTS = """
+    WITH m AS (SELECT id, trim(COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')) AS clan, {columns}
+               FROM members WHERE {where}),
+    e AS ({emails})
+    SELECT MIN(member_id) AS member_id, clan, email
+    FROM e
+    WHERE email LIKE '%_@_%'
+    GROUP BY lower(email)
+    ORDER BY lower(email)
+"""
+
+
+@dataclass
+class Segment:
+    """Prazan popis / None = bez tog uvjeta; samo member_ids: None = svi, [] = nitko."""
+    groups: List[str] = field(default_factory=list)
+    age_cats: List[str] = field(default_factory=list)
+    active: Optional[bool] = None
+    veteran: Optional[bool] = None
+    pays_fee: Optional[bool] = None
+    medical_valid: Optional[bool] = None
+    competed_in: Optional[int] = None
+    member_ids: Optional[List[int]] = None
+    audience: str = "both"
+
+    def sql(self, today: Optional[date] = None) -> Tuple[List[str], list]:
+        today = today or date.today()
+        where, params = [], []
+        if self.groups:
+            where.append("group_name IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(self.groups, ensure_ascii=False))
+        if self.age_cats:
+            ranges = [AGE_CATS[a] for a in self.age_cats]
+            where.append("(" + " OR ".join("(? - CAST(substr(dob, 1, 4) AS INTEGER)) BETWEEN ? AND ?"
+                                           for _ in ranges) + ")")
+            for lo, hi in ranges:
+                params += [today.year, lo, hi]
+        for column, value in (("active_competitor", self.active), ("veteran", self.veteran),
+                              ("pays_fee", self.pays_fee)):
+            if value is not None:
+                where.append(f"COALESCE({column}, 0) = ?")
+                params.append(int(value))
+        if self.medical_valid is not None:
+            where.append("COALESCE(medical_valid_until, '') " + (">= ?" if self.medical_valid else "< ?"))
+            params.append(today.isoformat())
+        if self.competed_in:
+            where.append("id IN (SELECT member_id FROM member_stats_rollup WHERE year = ? AND starts > 0)")
+            params.append(int(self.competed_in))
+        if self.member_ids is not None:
+            where.append("id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps([int(i) for i in self.member_ids]))
+        return where, params
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> "Segment":
+        data = json.loads(text)
+        # stari spremljeni segmenti mogu imati manje (ili više) polja
+        if data.get("member_ids") == []:
+            # prije je prazan popis značio "bez filtra"
+            data["member_ids"] = None
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+
+def recipients_sql(segment: Segment, today: Optional[date] = None) -> Tuple[str, list]:
+    where, params = segment.sql(today)
+    columns = AUDIENCES[segment.audience]
+    emails = " UNION ALL ".join(f"SELECT id AS member_id, clan, trim({c}) AS email FROM m" for c in columns)
+    sql = _RECIPIENTS.format(columns=", ".join(columns), where=" AND ".join(where) or "1", emails=emails)
+    return sql, params
+
+
+def recipients(conn, segment: Segment) -> pd.DataFrame:
+    """Adrese segmenta bez duplikata (member_id, clan, email)."""
+    sql, params = recipients_sql(segment)
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def save_segment(conn, name: str, segment: Segment):
+    conn.execute("""INSERT INTO segments(name, definition_json, updated_at) VALUES(?,?,?)
+                    ON CONFLICT(name) DO UPDATE SET definition_json=excluded.definition_json,
+                        updated_at=excluded.updated_at""",
+                 (name, segment.to_json(), datetime.now().isoformat(timespec="seconds")))
+    conn.commit()
+
+
+def delete_segment(conn, name: str):
+    conn.execute("DELETE FROM segments WHERE name=?", (name,))
+    conn.commit()
+
+
+def load_segments(conn) -> Dict[str, Segment]:
+    return {name: Segment.from_json(d)
+            for name, d in conn.execute("SELECT name, definition_json FROM segments ORDER BY name")}
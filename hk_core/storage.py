@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Spremište učitanih datoteka adresirano sadržajem.
+
+Datoteka se čita u komadima, istodobno se računa SHA-256 i piše u privremenu
+datoteku; sadržaj se zatim sprema jednom, pod svojim hashom:
+
+    uploads/blobs/ab/ab12...ef
+
+Isti PDF učitan dvaput zauzima mjesto samo jednom, a dvije različite
+datoteke istog imena više se ne mogu prepisati. Tablica files (migracija 7)
+pamti izvorno ime, vrstu, MIME i hash; stupci *_path, club_docs.path i
+gallery_paths_json čuvaju referencu "file:<id>" koju resolve() pretvara u
+putanju na disku. Stare vrijednosti (obične putanje) resolve() vraća
+nepromijenjene.
+
+put() radi oboje na istoj konekciji. Aplikacija s pisačem (hk_core.writer)
+ih razdvaja: write_blob() (hashiranje i pisanje na disk) ide u dretvi
+sesije, a pisaču se predaje samo add() – upis retka u files. Ako upis ne
+uspije, discard() briše blob koji je tek nastao.
+"""
+
+import hashlib
+import os
+import tempfile
+from datetime import datetime
+from typing import Optional
+
+CHUNK_BYTES = 1 << 20
+REF_PREFIX = "file:"
+
+
+class FileStore:
+    def __init__(self, root: str = "uploads"):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, sha256[:2], sha256)
+
+    def write_blob(self, fileobj) -> tuple:
+        """Sprema sadržaj na disk; vraća (sha256, veličina, nastao) – nastao=False ako je blob već postojao."""
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        h = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=self.blob_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = fileobj.read(CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    h.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            sha = h.hexdigest()
+            path = self.blob_path(sha)
+            if os.path.exists(path):
+                os.remove(tmp)
+                return sha, size, False
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp, path)
+            return sha, size, True
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def put(self, conn, fileobj, name: str, kind: str = "", mime: Optional[str] = None) -> str:
+        """
+        Sprema sadržaj `fileobj` (bilo koji objekt s .read()) i vraća referencu
+        "file:<id>". Commit je na pozivatelju, zajedno s upisom reference.
+        """
+        sha, size, created = self.write_blob(fileobj)
+        try:
+            return self.add(conn, sha, size, name, kind, mime)
+        except Exception:
+            if created:
+                self.discard(conn, sha)
+            raise
+
+    def add(self, conn, sha: str, size: int, name: str, kind: str = "", mime: Optional[str] = None) -> str:
+        """Zapis u files za blob iz write_blob(); vraća referencu "file:<id>"."""
+        # isti sadržaj pod istim imenom i vrstom = isti zapis
+        conn.execute("""INSERT INTO files(sha256, size, mime, original_name, kind, uploaded_at)
+                        VALUES(?,?,?,?,?,?) ON CONFLICT(sha256, original_name, kind) DO NOTHING""",
+                     (sha, size, mime, name, kind, datetime.now().isoformat(timespec="seconds")))
+        row = conn.execute("SELECT id FROM files WHERE sha256=? AND original_name=? AND kind=?",
+                           (sha, name, kind)).fetchone()
+        return f"{REF_PREFIX}{row[0]}"
+
+    def discard(self, conn, sha: str):
+        """Briše blob na koji ne upućuje nijedan zapis u files (neuspio upis)."""
+        if conn.execute("SELECT 1 FROM files WHERE sha256=? LIMIT 1", (sha,)).fetchone() is None:
+            try:
+                os.remove(self.blob_path(sha))
+            except OSError:
+                pass
+
+    def resolve(self, conn, ref: Optional[str]) -> Optional[str]:
+        """Putanja na disku za referencu ili staru putanju; None ako datoteke nema."""
+        if not ref:
+            return None
+        if not ref.startswith(REF_PREFIX):
+            return ref if os.path.exists(ref) else None
+        row = conn.execute("SELECT sha256 FROM files WHERE id=?", (int(ref[len(REF_PREFIX):]),)).fetchone()
+        if row is None:
+            return None
+        path = self.blob_path(row[0])
+        return path if os.path.exists(path) else None
+
+    def info(self, conn, ref: Optional[str]) -> Optional[dict]:
+        if not ref or not ref.startswith(REF_PREFIX):
+            return None
+        row = conn.execute("SELECT id, sha256, size, mime, original_name, kind, uploaded_at FROM files WHERE id=?",
+                           (int(ref[len(REF_PREFIX):]),)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("id", "sha256", "size", "mime", "original_name", "kind", "uploaded_at"), row))
+
+    def stats(self, conn) -> dict:
+        files, blobs, referenced, on_disk = conn.execute(
+            """SELECT COUNT(*), COUNT(DISTINCT sha256), COALESCE(SUM(size),0),
+                      (SELECT COALESCE(SUM(size),0) FROM (SELECT DISTINCT sha256, size FROM files))
+               FROM files""").fetchone()
+        return {"files": files, "blobs": blobs, "bytes_referenced": referenced, "bytes_on_disk": on_disk}
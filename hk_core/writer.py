@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Jedan pisač po procesu: svi upisi sesija idu kroz jednu dretvu.
+
+Sesije su dosad radile conn.execute(...) + conn.commit() iz vlastitih
+dretvi, pa su se istodobna spremanja (rezultati, prisustvo, članovi)
+natjecala za zaključavanje baze i povremeno padala s "database is locked".
+DbWriter drži ograničeni red poslova; sesija preda paket naredbi i dobije
+concurrent.futures.Future:
+
+    fut = writer.submit([("UPDATE members SET group_name=? WHERE id=?", (g, mid)),
+                         many("INSERT INTO groups(name) VALUES(?)", [(g,) for g in nove])])
+    fut.result().lastrowids
+
+Dretva pisača uzme sve pakete koji čekaju (do `max_group`) i izvrši ih u
+jednoj transakciji (BEGIN IMMEDIATE ... COMMIT) – pod WAL-om je jedan
+commit s deset paketa bitno jeftiniji od deset commitova. Svaki paket ima
+svoj SAVEPOINT: paket koji padne (npr. IntegrityError) vraća se i dobije
+iznimku, ostali iz iste grupe se spremaju.
+
+Funkcije koje same vode transakciju (hk_core.attendance.save_attendance,
+importers, grid, mailer...) predaju se s call(fn, *args): izvršava ih ista
+dretva, ali svaku zasebno, s njezinim BEGIN/COMMIT. Čitanja i dalje idu
+izravno preko bazena konekcija.
+
+Pisač ima vlastitu konekciju, izvan bazena: stranice drže konekciju iz
+bazena dok se iscrtavaju, pa bi pisač koji posuđuje iz istog bazena pri
+nekoliko istodobnih spremanja ostao bez konekcije (PoolTimeout) i srušio
+cijelu grupu. Konekcija je ipak vezana uz bazen (conn.pool), pa commit
+pisača povećava generacije tablica kao i svaki drugi.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from hk_core.db import PooledConnection, open_connection
+
+MAX_QUEUE = 256
+MAX_GROUP = 64
+SUBMIT_TIMEOUT = 10.0
+
+Statement = Tuple  # (sql, params) ili (sql, [params, ...], True) – vidi many()
+
+
+class WriterBusy(RuntimeError):
+    """Red pisača je pun i nije se oslobodio unutar zadanog vremena."""
+
+
+def many(sql: str, rows: Iterable[Sequence]) -> Statement:
+    """Naredba za executemany unutar paketa."""
+    return (sql, list(rows), True)
+
+
+@dataclass
+class WriteResult:
+    """Ishod paketa: rowcount i lastrowid po naredbi (redom)."""
+    rowcounts: List[int] = field(default_factory=list)
+    lastrowids: List[Optional[int]] = field(default_factory=list)
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self.lastrowids[-1] if self.lastrowids else None
+
+
+@dataclass
+class _Job:
+    future: Future
+    statements: Optional[List[Statement]] = None
+    fn: Optional[Callable] = None
+    args: tuple = ()
+
+    def run_batch(self, conn) -> WriteResult:
+        res = WriteResult()
+        for stmt in self.statements:
+            sql, params = stmt[0], stmt[1] if len(stmt) > 1 else ()
+            cur = conn.executemany(sql, params) if len(stmt) > 2 and stmt[2] else conn.execute(sql, params)
+            res.rowcounts.append(cur.rowcount)
+            res.lastrowids.append(cur.lastrowid)
+        return res
+
+
+class DbWriter:
+    """Dretva pisača s ograničenim redom i grupnim commitom."""
+
+    def __init__(self, pool, max_queue: int = MAX_QUEUE, max_group: int = MAX_GROUP,
+                 submit_timeout: float = SUBMIT_TIMEOUT):
+        self.pool = pool
+        self.max_group = max_group
+        self.submit_timeout = submit_timeout
+        self.last_error: Optional[str] = None
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "calls": 0, "commits": 0, "failed": 0, "max_group": 0}
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[PooledConnection] = None
+
+    def start(self) -> "DbWriter":
+        if self._thread is None:
+            self._conn = open_connection(self.pool.path, self.pool.busy_timeout_ms)
+            self._conn.pool = self.pool  # generacije tablica i lock_retries idu u bazen
+            self._thread = threading.Thread(target=self._run, name="hk-db-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Izvrši ono što je već u redu i zaustavi dretvu."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+            self._conn.close()
+            self._conn = None
+
+    # --- predaja poslova (iz dretvi sesija) ---
+    def _put(self, job: _Job) -> Future:
+        if self._thread is None:
+            raise RuntimeError("DbWriter nije pokrenut (start())")
+        try:
+            self._queue.put(job, timeout=self.submit_timeout)
+        except queue.Full:
+            raise WriterBusy(f"Red upisa je pun ({self._queue.maxsize}) – pokušajte ponovno") from None
+        return job.future
+
+    def submit(self, statements: Iterable[Statement]) -> Future:
+        """Paket naredbi koje se spremaju zajedno (sve ili ništa); Future -> WriteResult."""
+        return self._put(_Job(Future(), statements=list(statements)))
+
+    def call(self, fn: Callable, *args) -> Future:
+        """fn(conn, *args) u dretvi pisača, u vlastitoj transakciji; Future -> povratna vrijednost."""
+        return self._put(_Job(Future(), fn=fn, args=args))
+
+    def execute(self, statements: Iterable[Statement], timeout: Optional[float] = None) -> WriteResult:
+        """submit() i čekanje na ishod – iznimka paketa diže se pozivatelju."""
+        return self.submit(statements).result(timeout)
+
+    # --- dretva pisača ---
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            group, stop = [job], False
+            # uzima samo ono što već čeka – ne čeka umjetno da se grupa napuni
+            while len(group) < self.max_group:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                group.append(nxt)
+            batches = []
+            for j in group:
+                if not j.future.set_running_or_notify_cancel():
+                    continue
+                if j.fn is not None:
+                    # redoslijed upisa se čuva: paketi prije ovog poziva commitaju se prvi
+                    self._commit_group(batches)
+                    batches = []
+                    self._run_call(j)
+                else:
+                    batches.append(j)
+            self._commit_group(batches)
+            if stop:
+                return
+
+    def _run_call(self, job: _Job):
+        self._count("calls")
+        conn = self._conn
+        try:
+            try:
+                out = job.fn(conn, *job.args)
+                if conn.in_transaction:
+                    conn.commit()
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+        except Exception as e:
+            self._count("failed")
+            job.future.set_exception(e)
+        else:
+            self._count("commits")
+            job.future.set_result(out)
+
+    def _commit_group(self, jobs: List[_Job]):
+        if not jobs:
+            return
+        self._count("batches", len(jobs))
+        with self._lock:
+            self._stats["max_group"] = max(self._stats["max_group"], len(jobs))
+        done: List[Tuple[_Job, WriteResult]] = []
+        conn = self._conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for j in jobs:
+                    conn.execute("SAVEPOINT hk_batch")
+                    try:
+                        res = j.run_batch(conn)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO hk_batch")
+                        conn.execute("RELEASE hk_batch")
+                        self._count("failed")
+                        j.future.set_exception(e)
+                    else:
+                        conn.execute("RELEASE hk_batch")
+                        done.append((j, res))
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        except Exception as e:
+            # BEGIN ili commit grupe nije uspio – nijedan paket iz nje nije spremljen
+            self.last_error = str(e)
+            for j in jobs:
+                if not j.future.done():
+                    self._count("failed")
+                    j.future.set_exception(e)
+            return
+        self._count("commits")
+        self.last_error = None
+        for j, res in done:
+            j.future.set_result(res)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+        s["queued"] = self._queue.qsize()
+        return s
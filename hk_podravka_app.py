@@ -10,20 +10,25 @@ st.set_page_config(page_title="HK Podravka App", page_icon="🤼", layout="cente
 
 st.title("HK Podravka – administracija")
 
-# ---------- Helpers ----------
-def load_coaches(path: str = "coaches.csv"):
-    """
-    Učitava trenere iz CSV-a (očekuje stupce 'id' i 'name').
-    Vraća listu opcija za selectbox i DataFrame (ako je pandas dostupan).
-    Sigurno rukuje svim greškama i praznim stanjem.
-    """
-    # Ako pandas nije dostupan, vratimo prazno stanje
-    if pd is None:
-        return ["-"], None
+COACHES_CSV = "coaches.csv"
+# "sqlite" = treneri iz tablice coaches iste baze koju koristi puna aplikacija (hk_podravka_full_app.py)
+COACHES_SOURCE = os.environ.get("HK_COACHES_SOURCE", "csv").lower()
+DB_PATH = os.environ.get("HK_DB", "hk_podravka.db")
 
-    if not os.path.exists(path):
-        return ["-"], pd.DataFrame(columns=["id", "name"])
+# ---------- Helpers ----------
+def _file_key(path: str):
+    """(putanja, mtime, veličina) – promjena datoteke poništava priručnu memoriju."""
+    try:
+        s = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (path, s.st_mtime_ns, s.st_size)
 
+# Učitani popis dijele sve sesije i rerunovi (samo za čitanje) – CSV se ponovno
+# parsira tek kad se datoteka promijeni, ne na svaki klik.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _coaches_from_csv(key):
+    path = key[0]
     try:
         df = pd.read_csv(path)
         # Normalizacija naziva stupaca
@@ -50,19 +55,59 @@ def load_coaches(path: str = "coaches.csv"):
         df["id"] = df["id"].astype(str)
         df["name"] = df["name"].astype(str)
 
-        options = ["-"] + [f"{r['id']} – {r['name']}" for _, r in df.iterrows()]
+        options = ["-"] + (df["id"] + " – " + df["name"]).tolist()
         return options, df
     except Exception:
         # Ako dođe do bilo koje greške pri čitanju, vrati prazno
         empty = pd.DataFrame(columns=["id", "name"])
         return ["-"], empty
 
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _coaches_from_db(key):
+    import sqlite3
+    from hk_core.lookups import LOOKUPS
+
+    # isti upit i isti format opcija kao izbornik trenera u punoj aplikaciji
+    sql, _, build = LOOKUPS["coaches"]
+    try:
+        conn = sqlite3.connect(f"file:{key[0]}?mode=ro", uri=True)
+        try:
+            rows = conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        # nema baze ili tablice coaches (baza još nije migrirana)
+        return ["-"], pd.DataFrame(columns=["id", "name"])
+    df = pd.DataFrame(rows, columns=["id", "name"]).astype(str)
+    return ["-"] + build(rows), df
+
+def load_coaches(path: str = COACHES_CSV, source: str = COACHES_SOURCE):
+    """
+    Učitava trenere iz CSV-a (očekuje stupce 'id' i 'name') ili, uz
+    source="sqlite" (HK_COACHES_SOURCE=sqlite), iz tablice coaches baze DB_PATH.
+    Vraća listu opcija za selectbox i DataFrame (ako je pandas dostupan).
+    Sigurno rukuje svim greškama i praznim stanjem.
+    """
+    # Ako pandas nije dostupan, vratimo prazno stanje
+    if pd is None:
+        return ["-"], None
+
+    if source == "sqlite":
+        # pod WAL-om upis najprije mijenja -wal datoteku, a glavnu tek checkpoint
+        return _coaches_from_db(_file_key(DB_PATH) + _file_key(DB_PATH + "-wal"))
+
+    if not os.path.exists(path):
+        return ["-"], pd.DataFrame(columns=["id", "name"])
+    return _coaches_from_csv(_file_key(path))
+
 # ---------- UI ----------
 st.subheader("Odabir trenera")
 
 options, coaches_df = load_coaches()
 
-c_label = st.selectbox("Trener", options, index=0, help="Učitaj 'coaches.csv' u istu mapu kao aplikaciju.")
+source_help = (f"Treneri iz baze {DB_PATH} (tablica coaches)." if COACHES_SOURCE == "sqlite"
+               else "Učitaj 'coaches.csv' u istu mapu kao aplikaciju.")
+c_label = st.selectbox("Trener", options, index=0, help=source_help)
 
 # Parsiranje odabira: očekujemo format 'id – name'
 selected_id = None
@@ -86,6 +131,8 @@ with col2:
 # Informativne poruke
 if pd is None:
     st.warning("Pandas nije instaliran. Instaliraj paket 'pandas' kako bi se učitali podaci o trenerima.")
+elif (coaches_df is None or coaches_df.empty) and COACHES_SOURCE == "sqlite":
+    st.info(f"U bazi {DB_PATH} nema trenera (ili baza ne postoji). Treneri se unose u punoj aplikaciji.")
 elif coaches_df is None or coaches_df.empty:
     st.info("Nije pronađen 'coaches.csv' ili je prazan. Dodaj datoteku sa stupcima 'id' i 'name'.")
 
@@ -11,6 +11,12 @@ from typing import Optional
 import pandas as pd
 import streamlit as st
 
+from hk_core import queries
+from hk_core.exports import export_bytes
+from hk_core.importers import import_members
+from hk_core.migrations import migrate, schema_version
+from hk_core.storage import FileStore
+
 # ---- Stil (boje kluba) ----
 PRIMARY_RED = "#c1121f"
 GOLD = "#d4af37"
@@ -34,61 +40,16 @@ def get_conn():
     conn.execute("PRAGMA foreign_keys = ON")
     return conn
 
-def init_db():
+@st.cache_resource
+def init_db() -> int:
+    """Migracije sheme – jednom po procesu (hk_core.migrations)."""
     c = get_conn()
-    cur = c.cursor()
-    cur.execute("""CREATE TABLE IF NOT EXISTS club_info (
-        id INTEGER PRIMARY KEY CHECK (id=1),
-        name TEXT, email TEXT, address TEXT, oib TEXT, web TEXT, iban TEXT,
-        president TEXT, secretary TEXT, board_json TEXT, supervisory_json TEXT,
-        instagram TEXT, facebook TEXT, tiktok TEXT
-    )""")
-    cur.execute("""CREATE TABLE IF NOT EXISTS club_docs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT, filename TEXT, path TEXT, uploaded_at TEXT
-    )""")
-    cur.execute("""CREATE TABLE IF NOT EXISTS members (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        first_name TEXT, last_name TEXT, dob TEXT, gender TEXT, oib TEXT UNIQUE,
-        street TEXT, city TEXT, postal_code TEXT,
-        athlete_email TEXT, parent_email TEXT,
-        id_card_number TEXT, id_card_issuer TEXT, id_card_valid_until TEXT,
-        passport_number TEXT, passport_issuer TEXT, passport_valid_until TEXT,
-        active_competitor INTEGER DEFAULT 0, veteran INTEGER DEFAULT 0, other_flag INTEGER DEFAULT 0,
-        pays_fee INTEGER DEFAULT 0, fee_amount REAL DEFAULT 30.0,
-        group_name TEXT,
-        photo_path TEXT, application_path TEXT, consent_path TEXT,
-        medical_path TEXT, medical_valid_until TEXT, consent_checked_date TEXT
-    )""")
-    cur.execute("""CREATE TABLE IF NOT EXISTS coaches (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        first_name TEXT, last_name TEXT, dob TEXT, oib TEXT, email TEXT, iban TEXT,
-        group_name TEXT, contract_path TEXT, other_docs_json TEXT, photo_path TEXT
-    )""")
-    cur.execute("""CREATE TABLE IF NOT EXISTS competitions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        kind TEXT, kind_other TEXT, name TEXT,
-        date_from TEXT, date_to TEXT, place TEXT,
-        style TEXT, age_cat TEXT,
-        country TEXT, country_iso3 TEXT,
-        team_rank INTEGER, club_competitors INTEGER, total_competitors INTEGER,
-        clubs_count INTEGER, countries_count INTEGER,
-        coaches_json TEXT, notes TEXT, bulletin_url TEXT, website_link TEXT, gallery_paths_json TEXT
-    )""")
-    cur.execute("""CREATE TABLE IF NOT EXISTS results (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        competition_id INTEGER REFERENCES competitions(id) ON DELETE CASCADE,
-        member_id INTEGER REFERENCES members(id) ON DELETE SET NULL,
-        category TEXT, style TEXT,
-        fights_total INTEGER, wins INTEGER, losses INTEGER, placement INTEGER,
-        wins_detail_json TEXT, losses_detail_json TEXT, note TEXT
-    )""")
-    # seed club row
-    cur.execute("SELECT 1 FROM club_info WHERE id=1")
-    if cur.fetchone() is None:
-        cur.execute("""INSERT INTO club_info (id,name,email,address,oib,web,iban,president,secretary,board_json,supervisory_json,instagram,facebook,tiktok)
-                       VALUES (1,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-                    (KLUB_NAZIV, KLUB_EMAIL, KLUB_ADRESA, KLUB_OIB, KLUB_WEB, KLUB_IBAN, "", "", "[]", "[]", "", "", ""))
-    c.commit(); c.close()
+    try:
+        migrate(c, club=dict(name=KLUB_NAZIV, email=KLUB_EMAIL, address=KLUB_ADRESA,
+                             oib=KLUB_OIB, web=KLUB_WEB, iban=KLUB_IBAN))
+        return schema_version(c)
+    finally:
+        c.close()
 
 def css_style():
     st.markdown(f"""
@@ -101,13 +62,32 @@ def css_style():
 def page_header(title, subtitle=None):
     st.markdown(f"<div class='app-header'><h2 style='margin:0'>{title}</h2>{('<div>'+subtitle+'</div>') if subtitle else ''}</div>", unsafe_allow_html=True)
 
-def save_uploaded_file(uploaded, subdir):
+def save_uploaded_file(uploaded, subdir, conn=None):
+    """
+    Sprema upload u spremište (hk_core.storage) i vraća referencu "file:<id>".
+    Uz `conn` zapis u files ide u transakciju pozivatelja (commit je njegov) –
+    druga konekcija bi čekala na zaključavanje koje pozivatelj već drži.
+    """
     if not uploaded: return ""
-    fn = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uploaded.name}"
-    path = os.path.join(UPLOAD_DIR, subdir); os.makedirs(path, exist_ok=True)
-    full = os.path.join(path, fn)
-    with open(full, "wb") as f: f.write(uploaded.getbuffer())
-    return full
+    if conn is not None:
+        return FileStore(UPLOAD_DIR).put(conn, uploaded, uploaded.name, kind=subdir, mime=uploaded.type)
+    c = get_conn()
+    try:
+        ref = FileStore(UPLOAD_DIR).put(c, uploaded, uploaded.name, kind=subdir, mime=uploaded.type)
+        c.commit()
+        return ref
+    finally:
+        c.close()
+
+def deferred_export(name: str, params: tuple = ()):
+    """Excel izvoz (hk_core.exports) koji se generira tek kad korisnik klikne gumb."""
+    def build() -> bytes:
+        c = get_conn()
+        try:
+            return export_bytes(c, name, params)
+        finally:
+            c.close()
+    return build
 
 def excel_bytes_from_df(df: pd.DataFrame, sheet_name="Sheet1") -> bytes:
     out = io.BytesIO()
@@ -175,9 +155,9 @@ def section_club():
                       (superv if isinstance(superv,pd.DataFrame) else pd.DataFrame(superv)).to_json(),
                       instagram,facebook,tiktok))
         if up_statut:
-            p = save_uploaded_file(up_statut,"club_docs"); conn.execute("INSERT INTO club_docs(kind,filename,path,uploaded_at) VALUES (?,?,?,?)", ("statut", up_statut.name, p, datetime.now().isoformat()))
+            p = save_uploaded_file(up_statut,"club_docs", conn); conn.execute("INSERT INTO club_docs(kind,filename,path,uploaded_at) VALUES (?,?,?,?)", ("statut", up_statut.name, p, datetime.now().isoformat()))
         if up_other:
-            p = save_uploaded_file(up_other,"club_docs"); conn.execute("INSERT INTO club_docs(kind,filename,path,uploaded_at) VALUES (?,?,?,?)", ("ostalo", up_other.name, p, datetime.now().isoformat()))
+            p = save_uploaded_file(up_other,"club_docs", conn); conn.execute("INSERT INTO club_docs(kind,filename,path,uploaded_at) VALUES (?,?,?,?)", ("ostalo", up_other.name, p, datetime.now().isoformat()))
         conn.commit(); st.success("Podaci kluba spremljeni.")
 
     docs = pd.read_sql_query("SELECT id, kind, filename, uploaded_at FROM club_docs ORDER BY uploaded_at DESC", conn)
@@ -200,65 +180,27 @@ def section_members():
     page_header("Članovi", "Uvoz/izvoz Excel, svi podaci, dokumenti")
     conn = get_conn()
 
-    st.download_button("Skini predložak (Excel)", data=excel_bytes_from_df(members_template_df(),"ClanoviPredlozak"), file_name="predlozak_clanovi.xlsx")
+    st.download_button("Skini predložak (Excel)", data=lambda: excel_bytes_from_df(members_template_df(),"ClanoviPredlozak"), file_name="predlozak_clanovi.xlsx")
 
-    export_df = pd.read_sql_query("""SELECT first_name AS ime, last_name AS prezime, dob AS datum_rodenja, gender AS spol, oib,
-        street AS ulica_i_broj, city AS grad, postal_code AS postanski_broj,
-        athlete_email AS email_sportasa, parent_email AS email_roditelja,
-        id_card_number AS br_osobne, id_card_valid_until AS osobna_vrijedi_do, id_card_issuer AS osobna_izdavatelj,
-        passport_number AS br_putovnice, passport_valid_until AS putovnica_vrijedi_do, passport_issuer AS putovnica_izdavatelj,
-        active_competitor AS aktivni_natjecatelj, veteran, other_flag AS ostalo,
-        pays_fee AS placa_clanarinu, fee_amount AS iznos_clanarine, group_name AS grupa
-        FROM members ORDER BY last_name, first_name""", conn)
-    st.download_button("Skini članove (Excel)", data=excel_bytes_from_df(export_df,"Clanovi"), file_name="clanovi_export.xlsx", disabled=export_df.empty)
+    has_members = conn.execute("SELECT EXISTS(SELECT 1 FROM members)").fetchone()[0]
+    st.download_button("Skini članove (Excel)", data=deferred_export("members"), file_name="clanovi_export.xlsx", disabled=not has_members)
 
     st.markdown("#### Učitaj članove iz Excel tablice")
     up_excel = st.file_uploader("Upload Excel (po predlošku)", type=["xlsx"], key="members_excel_v63")
     if up_excel is not None:
-        try:
-            df_up = pd.read_excel(up_excel)
-            for _, r in df_up.iterrows():
-                first_name = str(r.get("ime","") or "").strip()
-                last_name  = str(r.get("prezime","") or "").strip()
-                dob        = str(r.get("datum_rodenja(YYYY-MM-DD)","") or "")[:10]
-                gender     = str(r.get("spol(M/Ž)","") or "").strip()
-                oib        = str(r.get("oib","") or "").strip()
-                street     = str(r.get("ulica_i_broj","") or "").strip()
-                city       = str(r.get("grad","") or "").strip()
-                postal     = str(r.get("postanski_broj","") or "").strip()
-                email_s    = str(r.get("email_sportasa","") or "").strip()
-                email_p    = str(r.get("email_roditelja","") or "").strip()
-                id_no      = str(r.get("br_osobne","") or "").strip()
-                id_until   = str(r.get("osobna_vrijedi_do(YYYY-MM-DD)","") or "")[:10]
-                id_issuer  = str(r.get("osobna_izdavatelj","") or "").strip()
-                pass_no    = str(r.get("br_putovnice","") or "").strip()
-                pass_until = str(r.get("putovnica_vrijedi_do(YYYY-MM-DD)","") or "")[:10]
-                pass_issuer= str(r.get("putovnica_izdavatelj","") or "").strip()
-                active     = int(r.get("aktivni_natjecatelj(0/1)", 0) or 0)
-                veteran    = int(r.get("veteran(0/1)", 0) or 0)
-                other      = int(r.get("ostalo(0/1)", 0) or 0)
-                pays       = int(r.get("placa_clanarinu(0/1)", 0) or 0)
-                fee        = float(r.get("iznos_clanarine(EUR)", 30) or 30.0)
-                group      = str(r.get("grupa","") or "").strip()
-                conn.execute("""
-                    INSERT INTO members(first_name,last_name,dob,gender,oib,street,city,postal_code,
-                        athlete_email,parent_email,id_card_number,id_card_issuer,id_card_valid_until,
-                        passport_number,passport_issuer,passport_valid_until,
-                        active_competitor,veteran,other_flag,pays_fee,fee_amount,group_name)
-                    VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-                    ON CONFLICT(oib) DO UPDATE SET
-                        first_name=excluded.first_name, last_name=excluded.last_name, dob=excluded.dob, gender=excluded.gender,
-                        street=excluded.street, city=excluded.city, postal_code=excluded.postal_code,
-                        athlete_email=excluded.athlete_email, parent_email=excluded.parent_email,
-                        id_card_number=excluded.id_card_number, id_card_issuer=excluded.id_card_issuer, id_card_valid_until=excluded.id_card_valid_until,
-                        passport_number=excluded.passport_number, passport_issuer=excluded.passport_issuer, passport_valid_until=excluded.passport_valid_until,
-                        active_competitor=excluded.active_competitor, veteran=excluded.veteran, other_flag=excluded.other_flag,
-                        pays_fee=excluded.pays_fee, fee_amount=excluded.fee_amount, group_name=excluded.group_name
-                """, (first_name,last_name,dob,gender,oib,street,city,postal,email_s,email_p,id_no,id_issuer,id_until,
-                      pass_no,pass_issuer,pass_until,active,veteran,other,pays,fee,group))
-            conn.commit(); st.success("Članovi uvezeni/ažurirani iz Excela.")
-        except Exception as e:
-            st.error(f"Greška pri uvozu: {e}")
+        # file_uploader zadržava datoteku na svakom rerunu – uvozimo samo jednom po datoteci
+        if st.session_state.get("members_excel_v63_done") != up_excel.file_id:
+            st.session_state.pop("members_excel_v63_report", None)
+            try:
+                st.session_state["members_excel_v63_report"] = import_members(conn, pd.read_excel(up_excel))
+                st.session_state["members_excel_v63_done"] = up_excel.file_id
+            except Exception as e:
+                st.error(f"Greška pri uvozu: {e}")
+        rep = st.session_state.get("members_excel_v63_report")
+        if rep is not None:
+            st.success(f"Članovi uvezeni/ažurirani: {rep.inserted} novih, {rep.updated} ažuriranih, {len(rep.rejected)} odbijenih.")
+            if rep.rejected:
+                st.dataframe(rep.rejected_df(), use_container_width=True)
 
     st.markdown("---"); st.markdown("### Unos novog člana")
     with st.form("member_form_v63"):
@@ -410,9 +352,9 @@ def competitions_template_df():
 def section_competitions():
     page_header("Natjecanja i rezultati", "Unos natjecanja + rezultata")
     conn = get_conn()
-    st.download_button("Predložak (Excel)", data=excel_bytes_from_df(competitions_template_df(),"NatjecanjaPredlozak"), file_name="predlozak_natjecanja.xlsx")
-    export_df = pd.read_sql_query("""SELECT id, kind, kind_other, name, date_from, date_to, place, style, age_cat, country, country_iso3, team_rank, club_competitors, total_competitors, clubs_count, countries_count, notes, bulletin_url, website_link FROM competitions ORDER BY date_from DESC""", conn)
-    st.download_button("Skini natjecanja (Excel)", data=excel_bytes_from_df(export_df,"Natjecanja"), file_name="natjecanja_export.xlsx", disabled=export_df.empty)
+    st.download_button("Predložak (Excel)", data=lambda: excel_bytes_from_df(competitions_template_df(),"NatjecanjaPredlozak"), file_name="predlozak_natjecanja.xlsx")
+    has_comps = conn.execute("SELECT EXISTS(SELECT 1 FROM competitions)").fetchone()[0]
+    st.download_button("Skini natjecanja (Excel)", data=deferred_export("competitions"), file_name="natjecanja_export.xlsx", disabled=not has_comps)
 
     st.markdown("### Unos natjecanja")
     kind = st.selectbox("Vrsta", ["PRVENSTVO HRVATSKE","MEĐUNARODNI TURNIR","REPREZENTATIVNI NASTUP","HRVAČKA LIGA ZA SENIORE","MEĐUNARODNA HRVAČKA LIGA ZA KADETE","REGIONALNO PRVENSTVO","LIGA ZA DJEVOJČICE","OSTALO"])
@@ -486,9 +428,9 @@ def section_competitions():
     df = pd.read_sql_query("""SELECT c.date_from, c.kind, c.name, c.place, c.style, c.age_cat, r.member_id,
            (SELECT first_name || ' ' || last_name FROM members m WHERE m.id=r.member_id) AS sportas,
            r.category, r.fights_total, r.wins, r.losses, r.placement
-        FROM results r JOIN competitions c ON r.competition_id=c.id WHERE substr(c.date_from,1,4)=? ORDER BY c.date_from DESC""", conn, params=(str(year),))
+        FROM results r JOIN competitions c ON r.competition_id=c.id WHERE c.year=? ORDER BY c.date_from DESC""", conn, params=(int(year),))
     st.dataframe(df, use_container_width=True)
-    st.download_button("Skini rezultate (Excel)", data=excel_bytes_from_df(df,"Rezultati"), file_name=f"rezultati_{year}.xlsx", disabled=df.empty)
+    st.download_button("Skini rezultate (Excel)", data=deferred_export("results_by_year", (int(year),)), file_name=f"rezultati_{year}.xlsx", disabled=df.empty)
     conn.close()
 
 # ---- 5) STATISTIKA ----
@@ -496,9 +438,7 @@ def section_stats():
     page_header("Statistika", "Po godini, natjecanju, sportašu, kategoriji")
     conn = get_conn()
     year = st.number_input("Godina", min_value=2000, max_value=2100, value=datetime.now().year, step=1, key="stat_year_v63")
-    df = pd.read_sql_query("""SELECT c.kind, c.age_cat, r.style, SUM(r.fights_total) AS borbi, SUM(r.wins) AS pobjede, SUM(r.losses) AS porazi,
-        SUM(CASE WHEN r.placement=1 THEN 1 ELSE 0 END) AS zlato, SUM(CASE WHEN r.placement=2 THEN 1 ELSE 0 END) AS srebro, SUM(CASE WHEN r.placement=3 THEN 1 ELSE 0 END) AS bronca
-        FROM competitions c JOIN results r ON r.competition_id = c.id WHERE substr(c.date_from,1,4)=? GROUP BY c.kind, c.age_cat, r.style ORDER BY c.kind, c.age_cat""", conn, params=(str(year),))
+    df = pd.read_sql_query(queries.STATS_BY_YEAR, conn, params=(int(year),))
     st.dataframe(df, use_container_width=True)
     mems = pd.read_sql_query("SELECT id, first_name || ' ' || last_name AS full FROM members ORDER BY last_name, first_name", conn)
     sel = st.selectbox("Sportaš/ica", options=["-"] + [f"{r.id} – {r.full}" for r in mems.itertuples()], key="stat_member_v63")
@@ -506,7 +446,7 @@ def section_stats():
         mid = int(sel.split(" – ")[0])
         d2 = pd.read_sql_query("""SELECT c.date_from, c.kind, c.name, r.category, r.style, r.fights_total, r.wins, r.losses, r.placement
                                   FROM results r JOIN competitions c ON r.competition_id=c.id
-                                  WHERE r.member_id=? AND substr(c.date_from,1,4)=? ORDER BY c.date_from DESC""", conn, params=(mid,str(year)))
+                                  WHERE r.member_id=? AND c.year=? ORDER BY c.date_from DESC""", conn, params=(mid,int(year)))
         st.dataframe(d2, use_container_width=True)
     conn.close()
 
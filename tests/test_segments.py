@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Segment.member_ids: None je bez filtra, prazan popis ne odgovara nikome."""
+
+import sqlite3
+
+import pytest
+
+from hk_core.migrations import migrate
+from hk_core.segments import Segment, recipients
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    migrate(c)
+    c.executemany("INSERT INTO members(id, first_name, last_name, athlete_email, veteran) VALUES(?,?,?,?,1)",
+                  [(1, "Ivan", "Horvat", "ivan@example.com"), (2, "Marko", "Kovač", "marko@example.com")])
+    c.commit()
+    yield c
+    c.close()
+
+
+def test_member_ids_none_is_no_filter(conn):
+    assert len(recipients(conn, Segment(veteran=True))) == 2
+
+
+def test_member_ids_empty_matches_nobody(conn):
+    assert recipients(conn, Segment(veteran=True, member_ids=[])).empty
+
+
+def test_member_ids_selects_members(conn):
+    assert recipients(conn, Segment(veteran=True, member_ids=[2]))["email"].tolist() == ["marko@example.com"]
+
+
+def test_saved_empty_member_ids_stays_unfiltered():
+    # segmenti spremljeni prije ove promjene pamte [] kao "bez filtra"
+    assert Segment.from_json('{"veteran": true, "member_ids": []}').member_ids is None
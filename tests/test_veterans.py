@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Stranica Veterani: slanje bez odabranih veterana ne smije ići svima."""
+
+import os
+import sqlite3
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from hk_core.migrations import migrate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VETERANS_PAGE = os.path.join(ROOT, "hk_app", "sections", "veterans.py")
+
+
+def _page(path):
+    import runpy
+    from hk_app.common import init_db
+    init_db()
+    runpy.run_path(path)
+
+
+def _app(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(ROOT)
+    # bazen, pisač i init_db su po procesu – svaki test ima svoju bazu
+    st.cache_resource.clear()
+    conn = sqlite3.connect("hk_podravka.db")
+    migrate(conn)
+    conn.executemany("INSERT INTO members(first_name, last_name, athlete_email, veteran) VALUES(?,?,?,1)",
+                     [("Ivan", "Horvat", "ivan@example.com"), ("Marko", "Kovač", "marko@example.com")])
+    conn.commit()
+    conn.close()
+    return AppTest.from_function(_page, args=(VETERANS_PAGE,), default_timeout=30).run()
+
+
+def _queued(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "hk_podravka.db"))
+    try:
+        return [r[0] for r in conn.execute("SELECT email FROM outbox ORDER BY email")]
+    finally:
+        conn.close()
+
+
+def test_send_without_selection_queues_nothing(tmp_path, monkeypatch):
+    at = _app(tmp_path, monkeypatch)
+    at.text_input(key="vet_subject_v6").set_value("Trening")
+    at.button(key="vet_mail_v6").click().run()
+    assert not at.exception
+    assert [w.value for w in at.warning] == ["Nema e-mail adresa za odabrane."]
+    assert _queued(tmp_path) == []
+    # pregled poslanih poruka ostaje na stranici
+    assert [e.label for e in at.expander] == ["Poslane poruke i stanje isporuke"]
+
+
+def test_send_to_selected_veteran_only(tmp_path, monkeypatch):
+    at = _app(tmp_path, monkeypatch)
+    ms = at.multiselect(key="vet_sel_v6")
+    ms.select(next(o for o in ms.options if "Horvat" in o))
+    at.button(key="vet_mail_v6").click().run()
+    assert not at.exception
+    assert _queued(tmp_path) == ["ivan@example.com"]